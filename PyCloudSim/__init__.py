@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import logging
 from ipaddress import ip_address
-from math import inf
-from typing import TYPE_CHECKING, List
+from array import array
+from bisect import bisect_right
+from random import randbytes
+from math import floor, inf
+from typing import TYPE_CHECKING, Callable, Dict, KeysView, List, Tuple
 
-from Akatosh import Entity, EntityList, Mundus
+from Akatosh import Entity, EntityList, InstantEvent, Mundus, Resource, instant_event
 
 if TYPE_CHECKING:
     from .entity import (
@@ -14,14 +17,18 @@ if TYPE_CHECKING:
         vHardwareEntity,
         vMicroservice,
         vSwitch,
+        vRouter,
         vGateway,
         vVolume,
         vAPICall,
+        vFlow,
+        vPort,
     )
     from .scheduler import ContainerScheduler, VolumeScheduler
 
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
 from Akatosh import EntityList
 from bitmath import MiB
 from networkx.drawing.layout import spring_layout
@@ -32,18 +39,96 @@ from networkx.drawing.nx_pylab import (draw_networkx_edges,
 
 class vNetwork:
     def __init__(self) -> None:
-        self._topology = nx.DiGraph()
+        # the nodes are numbered, the ids of the removed nodes are reused
+        self._node_ids: Dict[vHardwareEntity, int] = dict()
+        self._id_nodes: List[vHardwareEntity | None] = list()
+        self._free_ids: List[int] = list()
+        # directed links between node ids and their bandwidth, in the order they are added
+        self._links: Dict[Tuple[int, int], int] = dict()
+        # incoming links of each node in compressed sparse row form, rebuilt on demand after the topology changes
+        self._in_offsets = np.zeros(1, dtype=np.int64)
+        self._in_sources = np.zeros(0, dtype=np.int64)
+        self._adjacency_version = 0
+        # networkx view of the topology, only built for export and plotting
+        self._topology: nx.DiGraph | None = None
+        self._topology_version = 0
         self._nodes: List[vHardwareEntity] = EntityList()
+        # live registries of the nodes by type, dicts are used as ordered sets
+        self._registries: Dict[str, Dict[vHardwareEntity, None]] = {
+            "vHost": dict(),
+            "vSwitch": dict(),
+            "vRouter": dict(),
+            "vGateway": dict(),
+        }
+        # shortest paths between nodes, valid for the current topology version
+        self._version = 0
+        self._routes: Dict[Tuple[vHardwareEntity, vHardwareEntity], List] = dict()
+        self._routes_version = 0
+        # next hop of each node towards a destination, filled for a destination on its first lookup
+        self._forwarding_tables: Dict[
+            vHardwareEntity, Dict[vHardwareEntity, vHardwareEntity]
+        ] = dict()
+        # the next hop ids and the hop counts of the search that filled each destination
+        self._forwarding_destinations: Dict[
+            vHardwareEntity, Tuple[np.ndarray, np.ndarray]
+        ] = dict()
+
+    def _registry(self, node: vHardwareEntity) -> Dict[vHardwareEntity, None] | None:
+        """Returns the registry of the node type, subclasses are registered with their base type."""
+        for cls in node.__class__.__mro__:
+            if cls.__name__ in self._registries:
+                return self._registries[cls.__name__]
+        return None
+
+    def _add_id(self, node: vHardwareEntity) -> int:
+        """Returns the id of the node, a new id is given to a node that is not in the topology."""
+        node_id = self._node_ids.get(node)
+        if node_id is None:
+            if len(self._free_ids) > 0:
+                node_id = self._free_ids.pop()
+                self._id_nodes[node_id] = node
+            else:
+                node_id = len(self._id_nodes)
+                self._id_nodes.append(node)
+            self._node_ids[node] = node_id
+        return node_id
 
     def add_node(self, node: vHardwareEntity) -> None:
         """Adds a node to the network."""
-        self.topology.add_node(node)
+        self._add_id(node)
+        self._version += 1
         self.nodes.append(node)
+        registry = self._registry(node)
+        if registry is not None:
+            registry[node] = None
 
     def del_node(self, node: vHardwareEntity) -> None:
-        """Removes a node from the network."""
-        self.topology.remove_node(node)
-        self.nodes.remove(node)
+        """Removes a node and its links from the network."""
+        node_id = self._node_ids.pop(node, None)
+        if node_id is None:
+            raise nx.NetworkXError(f"The node {node} is not in the network.")
+        # only the nodes forwarding through the node are rerouted
+        self._drop_forwarding(node)
+        for s_id, d_id in [link for link in self._links if link[1] == node_id]:
+            self._invalidate_forwarding(s_id, d_id, added=False)
+        self._forwarding_tables.pop(node, None)
+        for next_hops, hop_counts in self._forwarding_destinations.values():
+            if node_id < next_hops.size:
+                next_hops[node_id] = hop_counts[node_id] = -1
+        self._links = {
+            link: bandwidth
+            for link, bandwidth in self._links.items()
+            if node_id not in link
+        }
+        self._id_nodes[node_id] = None
+        self._free_ids.append(node_id)
+        self._version += 1
+        # a terminated node is already removed from the node list
+        if node in self.nodes:
+            self.nodes.remove(node)
+        registry = self._registry(node)
+        if registry is not None:
+            registry.pop(node, None)
 
     def add_link(
         self,
@@ -57,9 +142,12 @@ class vNetwork:
         if s.__class__.__name__ == "vHost" and d.__class__.__name__ == "vHost":
             raise ValueError("Cannot add a link between two hosts.")
 
-        self.topology.add_weighted_edges_from(
-            [(s, d, MiB(bandwidth).bytes), (d, s, MiB(bandwidth).bytes)]
-        )
+        s_id, d_id = self._add_id(s), self._add_id(d)
+        self._links[(s_id, d_id)] = MiB(bandwidth).bytes
+        self._links[(d_id, s_id)] = MiB(bandwidth).bytes
+        self._version += 1
+        self._invalidate_forwarding(s_id, d_id, added=True)
+        self._invalidate_forwarding(d_id, s_id, added=True)
         if s.__class__.__name__ != "vSwitch":
             ip_address = d.available_ip_addresses.pop(0)  # type: ignore
             s.NIC.add_port(d, bandwidth, ip_address, at)
@@ -76,8 +164,14 @@ class vNetwork:
         self, s: vHardwareEntity, d: vHardwareEntity, at: int | float = 0
     ) -> None:
         """Removes a link between two nodes."""
-        self.topology.remove_edge(s, d)
-        self.topology.remove_edge(d, s)
+        s_id, d_id = self._node_ids.get(s), self._node_ids.get(d)
+        if (s_id, d_id) not in self._links or (d_id, s_id) not in self._links:
+            raise nx.NetworkXError(f"The link between {s} and {d} is not in the network.")
+        del self._links[(s_id, d_id)]
+        del self._links[(d_id, s_id)]
+        self._version += 1
+        self._invalidate_forwarding(s_id, d_id, added=False)
+        self._invalidate_forwarding(d_id, s_id, added=False)
         s.NIC.remove_port(d, at)
         d.NIC.remove_port(s, at)
 
@@ -108,13 +202,133 @@ class vNetwork:
         draw_networkx_labels(self.topology, pos, labels=label_mapping, ax=ax)
         fig.savefig(file_name)
 
+    def _refresh_adjacency(self) -> None:
+        """Rebuild the compressed incoming links if the topology has changed since they were built. The sources of each node keep the order the links were added in."""
+        if self._adjacency_version == self._version:
+            return
+        num_nodes = len(self._id_nodes)
+        if len(self._links) > 0:
+            links = np.array(list(self._links), dtype=np.int64)
+            order = np.argsort(links[:, 1], kind="stable")
+            self._in_sources = links[order, 0]
+            counts = np.bincount(links[:, 1], minlength=num_nodes)
+        else:
+            self._in_sources = np.zeros(0, dtype=np.int64)
+            counts = np.zeros(num_nodes, dtype=np.int64)
+        self._in_offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._in_offsets[1:])
+        self._adjacency_version = self._version
+
+    def _search(self, dst_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Breadth-first search from the destination along the incoming links. Returns the next hop id and the hop count of every node towards the destination, -1 if it is unreachable."""
+        self._refresh_adjacency()
+        next_hops = np.full(len(self._id_nodes), -1, dtype=np.int64)
+        next_hops[dst_id] = dst_id
+        hop_counts = np.full(len(self._id_nodes), -1, dtype=np.int64)
+        hop_counts[dst_id] = 0
+        frontier = np.array([dst_id], dtype=np.int64)
+        hop_count = 0
+        while frontier.size > 0:
+            hop_count += 1
+            starts = self._in_offsets[frontier]
+            counts = self._in_offsets[frontier + 1] - starts
+            total = counts.sum()
+            if total == 0:
+                break
+            # gather the sources of the frontier in order, the first node to reach a source wins
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            sources = self._in_sources[positions]
+            hops = np.repeat(frontier, counts)
+            unvisited = next_hops[sources] == -1
+            sources, hops = sources[unvisited], hops[unvisited]
+            sources, first = np.unique(sources, return_index=True)
+            order = np.argsort(first)
+            sources, first = sources[order], first[order]
+            next_hops[sources] = hops[first]
+            hop_counts[sources] = hop_count
+            frontier = sources
+        return next_hops, hop_counts
+
     def route(self, src: vHost | vGateway, dst: vHost | vGateway):
-        """Returns a list of nodes the packet will traverse."""
-        return nx.shortest_path(self.topology, src, dst)
+        """Returns a list of nodes the packet will traverse, following the forwarding tables. The list is cached and shared until the topology changes, it must not be modified."""
+        if self._routes_version != self._version:
+            self._routes.clear()
+            self._routes_version = self._version
+        path = self._routes.get((src, dst))
+        if path is None:
+            for node in (src, dst):
+                if node not in self._node_ids:
+                    raise nx.NodeNotFound(f"{node} is not in the network.")
+            path = [src]
+            while path[-1] is not dst:
+                hop = self.next_hop(path[-1], dst)
+                if hop is None:
+                    raise nx.NetworkXNoPath(f"No path between {src} and {dst}.")
+                path.append(hop)
+            self._routes[(src, dst)] = path
+        return path
+
+    def _invalidate_forwarding(self, s_id: int, d_id: int, added: bool) -> None:
+        """Drop the next hops towards the destinations whose search result the link from s to d changes, the others are kept. A removed link changes the destinations it is the next hop towards. An added link changes the destinations it is a path as short as the current one to, it may win the tie."""
+        for dst, (next_hops, hop_counts) in list(self._forwarding_destinations.items()):
+            # the ids added since the search are unreachable
+            s_hops = hop_counts[s_id] if s_id < hop_counts.size else -1
+            d_hops = hop_counts[d_id] if d_id < hop_counts.size else -1
+            if added:
+                changed = d_hops >= 0 and (s_hops < 0 or d_hops + 1 <= s_hops)
+            else:
+                changed = s_hops > 0 and next_hops[s_id] == d_id
+            if changed:
+                self._drop_forwarding(dst)
+
+    def _drop_forwarding(self, dst: vHardwareEntity) -> None:
+        """Drop the next hops of all the nodes towards the destination."""
+        search = self._forwarding_destinations.pop(dst, None)
+        if search is None:
+            return
+        for node_id in np.flatnonzero(search[0] >= 0).tolist():
+            self._forwarding_tables[self._id_nodes[node_id]].pop(dst, None)  # type: ignore
+
+    def _fill_forwarding(self, dst: vHardwareEntity) -> None:
+        """Fill the next hops of all the nodes towards the destination with a breadth-first search from it."""
+        next_hops, hop_counts = self._search(self._node_ids[dst])
+        for node_id in np.flatnonzero(next_hops >= 0).tolist():
+            self._forwarding_tables.setdefault(self._id_nodes[node_id], dict())[  # type: ignore
+                dst
+            ] = self._id_nodes[next_hops[node_id]]  # type: ignore
+        self._forwarding_destinations[dst] = (next_hops, hop_counts)
+
+    def build_forwarding_tables(self) -> None:
+        """Fill the forwarding tables towards all the hosts and gateways in bulk, otherwise they are filled on demand."""
+        for dst in list(self.hosts) + list(self.gateways):
+            if dst not in self._forwarding_destinations:
+                self._fill_forwarding(dst)
+
+    def next_hop(self, node: vHardwareEntity, dst: vHardwareEntity):
+        """Returns the neighbour the node forwards packets for the destination to, None if the destination is unreachable."""
+        if dst not in self._forwarding_destinations:
+            if dst not in self._node_ids:
+                return None
+            self._fill_forwarding(dst)
+        return self._forwarding_tables.get(node, dict()).get(dst)
+
+    def forwarding_table(self, node: vHardwareEntity):
+        """Returns the forwarding table of the node, mapping the destinations filled so far to their next hops. A topology change only drops the next hops towards the destinations it reroutes."""
+        return self._forwarding_tables.setdefault(node, dict())
 
     @property
     def topology(self):
-        "Returns the network topology as a networkx directional graph."
+        "Returns the network topology as a networkx directional graph. The graph is an export view built from the compact topology when it has changed, it is not used for routing."
+        if self._topology is None or self._topology_version != self._version:
+            self._topology = nx.DiGraph()
+            self._topology.add_nodes_from(
+                node for node in self._id_nodes if node is not None
+            )
+            self._topology.add_weighted_edges_from(
+                (self._id_nodes[s], self._id_nodes[d], bandwidth)
+                for (s, d), bandwidth in self._links.items()
+            )
+            self._topology_version = self._version
         return self._topology
 
     @property
@@ -122,6 +336,301 @@ class vNetwork:
         """Returns a list of all hosts in the network."""
         return self._nodes
 
+    @property
+    def version(self) -> int:
+        """Returns the topology version, increased whenever a node or a link is added or removed."""
+        return self._version
+
+    @property
+    def hosts(self) -> KeysView[vHost]:
+        """Returns a live view of the hosts in the network."""
+        return self._registries["vHost"].keys()  # type: ignore
+
+    @property
+    def switches(self) -> KeysView[vSwitch]:
+        """Returns a live view of the switches in the network."""
+        return self._registries["vSwitch"].keys()  # type: ignore
+
+    @property
+    def routers(self) -> KeysView[vRouter]:
+        """Returns a live view of the routers in the network."""
+        return self._registries["vRouter"].keys()  # type: ignore
+
+    @property
+    def gateways(self) -> KeysView[vGateway]:
+        """Returns a live view of the gateways in the network."""
+        return self._registries["vGateway"].keys()  # type: ignore
+
+
+class FlowModel:
+    """Fluid model of the flows in the network. The port bandwidth is shared max-min fairly among the flows, the rates are recomputed when a flow starts or finishes, and when packets return bandwidth the flows were short of. A share of every port, the flow headroom, is left to the packets."""
+
+    def __init__(self) -> None:
+        self._flows: Dict[vFlow, None] = dict()
+        self._updated_at: int | float = 0
+        self._completion: InstantEvent | None = None
+        # ports whose flows got less than their limit because packets held the bandwidth
+        self._constrained: Dict[vPort, None] = dict()
+        self._wake_up: InstantEvent | None = None
+
+    def add(self, flow: vFlow) -> None:
+        """Start transferring the flow."""
+        self._advance()
+        self._flows[flow] = None
+        self._reallocate()
+
+    def remove(self, flow: vFlow) -> None:
+        """Stop transferring the flow, called when the flow is terminated."""
+        if flow not in self._flows:
+            return
+        self._advance()
+        self._release(flow)
+        del self._flows[flow]
+        self._reallocate()
+
+    def notify(self, port: vPort) -> None:
+        """Reallocate the flows at the current simulation time if the port was short of bandwidth for them, called when packets return the bandwidth of the port."""
+        if port not in self._constrained or self._wake_up is not None:
+            return
+
+        @instant_event(at=simulation.now, label="Flow Reallocation")
+        def _wake_up():
+            self._wake_up = None
+            self._advance()
+            self._reallocate()
+
+        self._wake_up = _wake_up
+
+    def _advance(self) -> None:
+        """Transfer the flows at their current rates up to now."""
+        elapsed = simulation.now - self._updated_at
+        if elapsed > 0:
+            for flow in self._flows:
+                flow._remaining = max(0, flow.remaining - flow.rate * elapsed)
+        self._updated_at = simulation.now
+
+    def _release(self, flow: vFlow) -> None:
+        """Return the bandwidth held by the flow and wake up the NICs on both ends of its ports."""
+        if not (flow.terminated or flow.destroied):
+            for port, amount in flow._holdings.items():
+                flow.put(port.bandwidth, amount)
+        for port in flow._holdings:
+            port.nic.trigger.notify()
+            port.endpoint.NIC.trigger.notify()
+        flow._holdings.clear()
+        flow._rate = 0.0
+
+    def _reallocate(self) -> None:
+        """Share the available bandwidth of the ports max-min fairly with progressive filling, then schedule the next completion. The flows on a port never take the flow headroom of its capacity."""
+        for flow in self._flows:
+            self._release(flow)
+        self._constrained.clear()
+        capacity: Dict[vPort, float] = dict()
+        unfrozen: Dict[vPort, List[vFlow]] = dict()
+        for flow in self._flows:
+            for port in flow.ports:
+                if port not in capacity:
+                    limit = port.bandwidth.capacity * (1 - simulation.flow_headroom)
+                    capacity[port] = min(port.bandwidth.amount, limit)
+                    if port.bandwidth.amount < limit:
+                        self._constrained[port] = None
+                unfrozen.setdefault(port, list()).append(flow)
+        rates: Dict[vFlow, float] = dict()
+        while len(unfrozen) > 0:
+            # the port with the smallest fair share is the bottleneck of its flows
+            bottleneck = min(
+                unfrozen, key=lambda port: capacity[port] / len(unfrozen[port])
+            )
+            share = max(0, capacity[bottleneck] / len(unfrozen[bottleneck]))
+            for flow in unfrozen[bottleneck][:]:
+                rates[flow] = share
+                for port in flow.ports:
+                    capacity[port] -= share
+                    unfrozen[port].remove(flow)
+                    if len(unfrozen[port]) == 0:
+                        del unfrozen[port]
+        for flow, rate in rates.items():
+            flow._rate = rate
+            for port in flow.ports:
+                # guard against rounding errors of the shares
+                amount = min(rate, port.bandwidth.amount)
+                if amount > 0:
+                    flow.get(port.bandwidth, amount)
+                    flow._holdings[port] = amount
+        self._schedule_completion()
+
+    def _schedule_completion(self) -> None:
+        """Schedule the completion of the flow that finishes first."""
+        if self._completion is not None:
+            self._completion.cancel()
+            self._completion = None
+        remaining_times = [
+            flow.remaining / flow.rate for flow in self._flows if flow.rate > 0
+        ]
+        if len(remaining_times) == 0:
+            return
+
+        @instant_event(
+            at=simulation.now + max(min(remaining_times), simulation.min_time_unit),
+            label="Flow Completion",
+        )
+        def _complete():
+            self._completion = None
+            self._advance()
+            # the flows that finish within the time resolution are completed
+            finished = [
+                flow
+                for flow in self._flows
+                if flow.remaining <= flow.rate * simulation.min_time_unit
+            ]
+            for flow in finished:
+                self._release(flow)
+                del self._flows[flow]
+                flow._remaining = 0
+                flow.success(simulation.now)
+            self._reallocate()
+
+        self._completion = _complete
+
+    @property
+    def flows(self) -> List[vFlow]:
+        """Return the flows in transfer."""
+        return list(self._flows)
+
+
+class HostCapacityIndex:
+    """Segment tree over the available CPU, RAM and ROM of the hosts, used by the schedulers to find a host.
+
+    Updating a host costs O(log n). The searches skip the subtrees whose component-wise maximum capacity can not fit the demand. The maxima of a subtree may come from different hosts, so a subtree that passes the check does not always hold a host that fits, and a search visits O(n) nodes in the worst case. It is O(log n) when the demand is only bound by one resource. A logarithmic search bound by all three resources would need a dominance query structure over the hosts, which the index does not keep.
+    """
+
+    def __init__(self) -> None:
+        self._hosts: List[vHost] = list()
+        self._slots: Dict[vHost, int] = dict()
+        self._available: List[bool] = list()
+        self._size = 1
+        self._build()
+
+    def _leaf(self, slot: int):
+        """Return the capacity, the best fit key and the worst fit key of a slot."""
+        if slot >= len(self._hosts) or not self._available[slot]:
+            return (-inf, -inf, -inf), (inf,), (-inf,)
+        host = self._hosts[slot]
+        capacity = (
+            host.cpu_reservoir.amount,
+            host.ram_reservoir.amount,
+            host.rom_reservoir.amount,
+        )
+        # ties go to the host registered first
+        return capacity, capacity + (slot,), capacity + (-slot,)
+
+    def _pull(self, node: int) -> None:
+        left, right = 2 * node, 2 * node + 1
+        self._capacity[node] = tuple(
+            max(a, b) for a, b in zip(self._capacity[left], self._capacity[right])
+        )
+        self._min_key[node] = min(self._min_key[left], self._min_key[right])
+        self._max_key[node] = max(self._max_key[left], self._max_key[right])
+
+    def _build(self) -> None:
+        while self._size < len(self._hosts):
+            self._size *= 2
+        self._capacity: List[tuple] = [(-inf, -inf, -inf)] * (2 * self._size)
+        self._min_key: List[tuple] = [(inf,)] * (2 * self._size)
+        self._max_key: List[tuple] = [(-inf,)] * (2 * self._size)
+        for slot in range(len(self._hosts)):
+            node = self._size + slot
+            self._capacity[node], self._min_key[node], self._max_key[node] = self._leaf(
+                slot
+            )
+        for node in range(self._size - 1, 0, -1):
+            self._pull(node)
+
+    def update(self, host: vHost, available: bool | None = None) -> None:
+        """Refresh the capacity of the host, called whenever its reservoirs change. The availability is changed when the host is powered on or off."""
+        if host not in self._slots:
+            self._slots[host] = len(self._hosts)
+            self._hosts.append(host)
+            self._available.append(False)
+            if len(self._hosts) > self._size:
+                self._build()
+        slot = self._slots[host]
+        if available is not None:
+            self._available[slot] = available
+        node = self._size + slot
+        self._capacity[node], self._min_key[node], self._max_key[node] = self._leaf(
+            slot
+        )
+        node //= 2
+        while node >= 1:
+            self._pull(node)
+            node //= 2
+
+    def _fits(self, node: int, demand: tuple) -> bool:
+        return all(a >= b for a, b in zip(self._capacity[node], demand))
+
+    def _first(self, node: int, demand: tuple) -> int | None:
+        if not self._fits(node, demand):
+            return None
+        if node >= self._size:
+            return node - self._size
+        slot = self._first(2 * node, demand)
+        if slot is None:
+            slot = self._first(2 * node + 1, demand)
+        return slot
+
+    def _best(self, node: int, demand: tuple, best: tuple | None) -> tuple | None:
+        if not self._fits(node, demand):
+            return best
+        if best is not None and self._min_key[node] >= best:
+            return best
+        if node >= self._size:
+            return self._min_key[node]
+        children = sorted((2 * node, 2 * node + 1), key=lambda n: self._min_key[n])
+        for child in children:
+            best = self._best(child, demand, best)
+        return best
+
+    def _worst(self, node: int, demand: tuple, worst: tuple | None) -> tuple | None:
+        if not self._fits(node, demand):
+            return worst
+        if worst is not None and self._max_key[node] <= worst:
+            return worst
+        if node >= self._size:
+            return self._max_key[node]
+        children = sorted(
+            (2 * node, 2 * node + 1), key=lambda n: self._max_key[n], reverse=True
+        )
+        for child in children:
+            worst = self._worst(child, demand, worst)
+        return worst
+
+    def first_fit(self, cpu: int | float, ram: int | float, rom: int | float):
+        """Return the first registered host that has the requested capacity."""
+        slot = self._first(1, (cpu, ram, rom))
+        if slot is None:
+            return None
+        return self._hosts[slot]
+
+    def best_fit(self, cpu: int | float, ram: int | float, rom: int | float):
+        """Return the host that has the requested capacity with the least available CPU, then RAM, then ROM."""
+        key = self._best(1, (cpu, ram, rom), None)
+        if key is None:
+            return None
+        return self._hosts[key[3]]
+
+    def worst_fit(self, cpu: int | float, ram: int | float, rom: int | float):
+        """Return the host that has the requested capacity with the most available CPU, then RAM, then ROM."""
+        key = self._worst(1, (cpu, ram, rom), None)
+        if key is None:
+            return None
+        return self._hosts[-key[3]]
+
+    @property
+    def hosts(self):
+        """Return the hosts registered to the index."""
+        return self._hosts
+
 
 logger = logging.getLogger("PyCloudSim")
 logger.setLevel(logging.DEBUG)
@@ -138,39 +647,243 @@ file_handler.setFormatter(formatter)
 logger.addHandler(file_handler)
 
 
+class Trigger:
+    """Wakes up the control loop of an entity when its inputs change.
+
+    Instead of polling every min_time_unit, entities call notify() to mark the loop as dirty. The action is then performed once at the current simulation time, no matter how many notifications were received at that time, and the clock is free to jump to the next event in between.
+    """
+
+    def __init__(
+        self,
+        entity: Entity,
+        action: Callable[[], None],
+        label: str,
+        priority: int | float = 0,
+        enabled: bool = True,
+    ) -> None:
+        """Create a trigger.
+
+        Args:
+            entity (Entity): the entity that owns the control loop, notifications are ignored once it is terminated.
+            action (Callable[[], None]): the control loop to be performed.
+            label (str): short description of the wake-up events.
+            priority (int | float, optional): the priority of the wake-up events. Defaults to 0.
+            enabled (bool, optional): whether the trigger accepts notifications from the start. Defaults to True.
+        """
+        self._entity = entity
+        self._action = action
+        self._label = label
+        self._priority = priority
+        self._enabled = enabled
+        self._pending: InstantEvent | None = None
+
+    def notify(self) -> None:
+        """Mark the control loop as dirty, the action will be performed at the current simulation time."""
+        if not self.enabled or self._pending is not None:
+            return
+        if self._entity.terminated or self._entity.destroied:
+            return
+
+        @instant_event(at=simulation.now, priority=self._priority, label=self._label)
+        def _wake():
+            self._pending = None
+            if self._entity.terminated or self._entity.destroied:
+                return
+            self._action()
+
+        self._pending = _wake
+
+    def enable(self) -> None:
+        """Accept notifications."""
+        self._enabled = True
+
+    def disable(self) -> None:
+        """Ignore notifications and cancel the pending wake-up, if any."""
+        self._enabled = False
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the trigger accepts notifications."""
+        return self._enabled
+
+    @property
+    def pending(self) -> bool:
+        """Return True if a wake-up is scheduled."""
+        return self._pending is not None
+
+
+class UsageTracker:
+    """Running integral of the occupied amount of a resource, with the records of a bounded history to answer windowed queries.
+
+    Every record stores the integral up to its time, so the average occupied amount over a window within the history is exact and costs two binary searches. Records at the same time are merged and the records that fall out of the history are dropped, so a record costs amortized O(1) and an idle resource keeps a single record. The history is the longer of simulation.usage_history and the longest window queried so far. A window reaching further back than the oldest record kept is cut there.
+    """
+
+    def __init__(self, capacity: int | float, occupied: int | float = 0) -> None:
+        """Create a usage tracker.
+
+        Args:
+            capacity (int | float): the capacity of the tracked resource.
+            occupied (int | float, optional): the occupied amount at the start. Defaults to 0.
+        """
+        self._capacity = capacity
+        # the time, the integral up to the time and the occupied amount after it of each record, the records before the head are dropped
+        self._times = array("d", [max(simulation.now, 0)])
+        self._integrals = array("d", [0.0])
+        self._occupied = array("d", [occupied])
+        self._head = 0
+        self._longest_window: int | float = 0
+        self._listeners: List[Callable[[int | float, int | float], None]] = list()
+
+    def __len__(self) -> int:
+        """Return the number of records kept."""
+        return len(self._times) - self._head
+
+    def add_listener(self, listener: Callable[[int | float, int | float], None]) -> None:
+        """Call the listener with the time and the change of the occupied amount on every record."""
+        self._listeners.append(listener)
+
+    def append(self, record: Tuple[int | float, int | float]) -> None:
+        """Take a (time, available amount) record, as the resource would keep in its usage records."""
+        time, amount = record
+        occupied = self._capacity - amount
+        change = occupied - self._occupied[-1]
+        if time == self._times[-1]:
+            self._occupied[-1] = occupied
+        else:
+            self._integrals.append(
+                self._integrals[-1] + self._occupied[-1] * (time - self._times[-1])
+            )
+            self._times.append(time)
+            self._occupied.append(occupied)
+            self._drop(time)
+        for listener in self._listeners:
+            listener(time, change)
+
+    def _drop(self, now: int | float) -> None:
+        """Drop the records before the one the history starts in."""
+        start = now - max(simulation.usage_history, self._longest_window)
+        while self._head + 1 < len(self._times) and self._times[self._head + 1] <= start:
+            self._head += 1
+        # compact the columns once most of them are dropped
+        if self._head > 64 and 2 * self._head > len(self._times):
+            del self._times[: self._head]
+            del self._integrals[: self._head]
+            del self._occupied[: self._head]
+            self._head = 0
+
+    def _integral_at(self, time: int | float) -> float:
+        """Return the integral of the occupied amount up to the time, which must not be before the oldest record kept."""
+        index = bisect_right(self._times, time, self._head) - 1
+        if index < self._head:
+            # nothing is occupied before the resource is created
+            return self._integrals[self._head]
+        return self._integrals[index] + self._occupied[index] * (
+            time - self._times[index]
+        )
+
+    def usage(self, duration: int | float) -> float:
+        """Return the average occupied amount over the last duration."""
+        now = simulation.now
+        self._longest_window = max(self._longest_window, duration)
+        after = max(now - duration, 0)
+        if self._head > 0 and after < self._times[self._head]:
+            # the older records are dropped, cut the window at the oldest one
+            after = self._times[self._head]
+            duration = now - after
+        if duration <= 0:
+            return self.occupied
+        return (self._integral_at(now) - self._integral_at(after)) / duration
+
+    @property
+    def occupied(self) -> int | float:
+        """Return the occupied amount since the last record."""
+        return self._occupied[-1]
+
+
+class TrackedResource(Resource):
+    """A resource whose usage history is a UsageTracker bounded in time instead of a list of every get and put, so the windowed utilization costs O(log n) in the records of the history and the memory stays bounded."""
+
+    def __init__(
+        self,
+        capacity: int | float | Callable,
+        initial_amount: int | float | Callable | None = None,
+        label: str | None = None,
+    ) -> None:
+        super().__init__(capacity, initial_amount, label)
+        self._usage_records = UsageTracker(self.capacity, self.occupied)  # type: ignore
+
+    def add_listener(
+        self, listener: Callable[[int | float, int | float, int | float], None]
+    ) -> None:
+        """Call the listener with the time, the change of the occupied amount and the capacity whenever the resource is used or returned. The listener is called with the current occupied amount right away."""
+        capacity = self.capacity
+        self.usage_records.add_listener(  # type: ignore
+            lambda time, change: listener(time, change, capacity)
+        )
+        listener(simulation.now, self.occupied, capacity)
+
+    def utilization(self, duration: int | float | Callable | None = None):
+        """Return the utilization ( occupied amount / capacity ) of the resource in the duration."""
+        if self.capacity == inf:
+            return 0.0
+        if duration:
+            if callable(duration):
+                duration = duration()
+            return self.usage_records.usage(duration) / self.capacity  # type: ignore
+        return 1 - (self.amount / self.capacity)
+
+
 class APICallScheduler(Entity):
     """Base for all container schedulers."""
 
     def __init__(self) -> None:
         super().__init__(label="Volume Scheduler", create_at=0, precursor=None)
+        self._trigger = Trigger(
+            self, self.scheduling, label="Scheduling API Calls", priority=inf
+        )
+        self._arrivals: List[vAPICall] = list()
+        self._pending: Dict[vMicroservice, List[vAPICall]] = dict()
 
     def on_creation(self):
         super().on_creation()
+        self.trigger.notify()
 
-        @self.continuous_event(
-            at=simulation.now,
-            interval=simulation.min_time_unit,
-            duration=inf,
-            label="Scheduling API Calls",
-            priority=inf,
-        )
-        def scheduling():
-            uninitiated_api_calls = [
-                api_call
-                for api_call in simulation.api_calls
-                if not api_call.initiated and api_call.created
-            ]
-            for api_call in uninitiated_api_calls:
-                src_ready = True
-                if api_call.src.__class__.__name__ == "vMicroservice":
-                    src_ready = api_call.src.ready  # type: ignore
+    def submit(self, api_call: vAPICall):
+        """Queue a created API call for scheduling."""
+        self._arrivals.append(api_call)
+        self.trigger.notify()
 
-                dst_ready = True
-                if api_call.dst.__class__.__name__ == "vMicroservice":
-                    dst_ready = api_call.dst.ready  # type: ignore
+    def release(self, microservice: vMicroservice):
+        """Requeue the API calls that wait on the microservice, called when the microservice becomes ready."""
+        api_calls = self._pending.pop(microservice, None)
+        if api_calls:
+            self._arrivals.extend(api_calls)
+            self.trigger.notify()
 
-                if src_ready and dst_ready:
-                    api_call.initiate(simulation.now)
+    def scheduling(self):
+        """Initiate the queued API calls whose source and destination are ready, the others wait on the first endpoint that is not ready."""
+        arrivals, self._arrivals = self._arrivals, list()
+        for api_call in arrivals:
+            if api_call.initiated or api_call.terminated or api_call.destroied:
+                continue
+            blocking_endpoint = None
+            for endpoint in (api_call.src, api_call.dst):
+                # the microservices are subclasses of the abstract vMicroservice
+                if any(
+                    cls.__name__ == "vMicroservice"
+                    for cls in endpoint.__class__.__mro__
+                ):
+                    if not endpoint.ready:  # type: ignore
+                        blocking_endpoint = endpoint
+                        break
+
+            if blocking_endpoint is None:
+                api_call.initiate(simulation.now)
+            else:
+                self._pending.setdefault(blocking_endpoint, list()).append(api_call)  # type: ignore
 
     def on_termination(self):
         return super().on_termination()
@@ -178,6 +891,16 @@ class APICallScheduler(Entity):
     def on_destruction(self):
         return super().on_destruction()
 
+    @property
+    def trigger(self):
+        """Return the trigger that wakes up the scheduling."""
+        return self._trigger
+
+    @property
+    def pending(self):
+        """Return the API calls that wait on a microservice, keyed by the microservice."""
+        return self._pending
+
 
 class Simulation:
     def __init__(self) -> None:
@@ -190,8 +913,16 @@ class Simulation:
         self._container_scheduler: ContainerScheduler = None  # type: ignore
         self._volume_scheduler: VolumeScheduler = None  # type: ignore
         self._api_call_scheduler: APICallScheduler = APICallScheduler()
+        self._host_index = HostCapacityIndex()
+        self._flow_model = FlowModel()
 
         self._resolution = 4
+        self._batch_window: int | float | None = None
+        self._packet_payload = False
+        self._analytic_decoding = False
+        self._flow_headroom = 0.1
+        self._usage_history: int | float = 0.1
+        self._payload_buffer = bytearray()
         Mundus.resolution = self.resolution
 
     def simulate(self, until: int | float | None = None):
@@ -203,15 +934,55 @@ class Simulation:
         else:
             logger.setLevel(logging.INFO)
 
+    def notify_schedulers(self):
+        """Wake up the container and volume schedulers, called whenever the pending work or the capacity of the hosts changes."""
+        if self._container_scheduler is not None:
+            self._container_scheduler.trigger.notify()
+        if self._volume_scheduler is not None:
+            self._volume_scheduler.trigger.notify()
+
     def set_resolution(self, resolution: int):
         self._resolution = resolution
         Mundus.resolution = self.resolution
 
+    def set_batch_window(self, window: int | float | None):
+        """Set the batch window of the CPU cores. A CPU core retires all the leading instructions of a process that it can execute within the window in one event, which is much faster for CPU-heavy simulations but holds the resources of a batch until its end. None (the default) only batches the instructions that are retired within the same minimum time unit."""
+        if window is not None and window <= 0:
+            raise ValueError("Batch window must be greater than 0.")
+        self._batch_window = window
+
+    def set_packet_payload(self, enable: bool = True):
+        """Give the packets byte content. By default packets are size-only, which is enough for the RAM and bandwidth accounting. The content of a packet is a zero-copy slice of one shared buffer of random bytes."""
+        self._packet_payload = enable
+
+    def set_analytic_decoding(self, enable: bool = True):
+        """Decode the received packets analytically. A node then reserves computational power of one CPU core and decodes the packet with one event, the delay follows from the instructions queued on the core. By default every packet is decoded with a vDecoder process scheduled on the CPU, the packet trains are always decoded analytically."""
+        self._analytic_decoding = enable
+
+    def set_flow_headroom(self, headroom: int | float):
+        """Set the share of the bandwidth of every port that the flows leave to the packets, so the packets sent on the same ports as flows are not starved. Defaults to 0.1."""
+        if headroom < 0 or headroom >= 1:
+            raise ValueError("Flow headroom must be at least 0 and less than 1.")
+        self._flow_headroom = headroom
+
+    def set_usage_history(self, duration: int | float):
+        """Set how far back the resources keep their usage records, the utilization over a window within it is exact. A resource also keeps the longest window that it has been queried for. The monitors extend it to their sample period. Defaults to 0.1."""
+        if duration <= 0:
+            raise ValueError("Usage history must be greater than 0.")
+        self._usage_history = duration
+
+    def payload(self, size: int) -> memoryview:
+        """Return a slice of the shared payload buffer, the buffer grows to fit the largest packet."""
+        if size > len(self._payload_buffer):
+            self._payload_buffer = bytearray(
+                randbytes(max(size, 2 * len(self._payload_buffer)))
+            )
+        return memoryview(self._payload_buffer)[:size]
+
     @property
     def hosts(self) -> List[vHost]:
-        return [
-            host for host in self.topology.nodes if host.__class__.__name__ == "vHost"
-        ]
+        """Returns a new list of the hosts in the network, simulation.network.hosts is a live view of them."""
+        return list(self.network.hosts)
 
     @property
     def network(self):
@@ -257,9 +1028,43 @@ class Simulation:
             raise ValueError("Volume scheduler is not set")
         return self._volume_scheduler
 
+    @property
+    def api_call_scheduler(self):
+        return self._api_call_scheduler
+
+    @property
+    def host_index(self):
+        return self._host_index
+
+    @property
+    def flow_model(self):
+        return self._flow_model
+
     @property
     def min_time_unit(self):
         return round(1 / pow(10, self.resolution), self.resolution)
 
+    @property
+    def packet_payload(self):
+        return self._packet_payload
+
+    @property
+    def analytic_decoding(self):
+        return self._analytic_decoding
+
+    @property
+    def flow_headroom(self):
+        return self._flow_headroom
+
+    @property
+    def usage_history(self):
+        return self._usage_history
+
+    @property
+    def batch_window(self):
+        if self._batch_window is None:
+            return self.min_time_unit
+        return self._batch_window
+
 
 simulation = Simulation()
@@ -2,6 +2,7 @@ from .v_apicall import vAPICall
 from .v_container import vContainer
 from .v_cpu import vCPU
 from .v_cpu_core import vCPUCore
+from .v_flow import vFlow
 from .v_gateway import vGateway
 from .v_hardware_component import vHardwareComponent
 from .v_hardware_entity import vHardwareEntity
@@ -20,3 +20,6 @@ class Constants(str, Enum):
     LIST = "LIST"
     DEL = "DEL"
     PUT = "PUT"
+    PACKET = "Packet"
+    TRAIN = "Train"
+    FLOW = "Flow"
@@ -3,18 +3,23 @@ from math import inf
 from multiprocessing import process
 from struct import pack
 
-from typing import Callable, List
+from typing import TYPE_CHECKING, Callable, List
 
 from Akatosh import Entity, EntityList
 
 from PyCloudSim import logger, simulation
 
+from .constants import Constants
+from .v_flow import vFlow
 from .v_microservice import vMicroservice
 from .v_packet import vPacket
 from .v_process import vContainerProcess
 from .v_sofware_entity import vSoftwareEntity
 from .v_user import vUser
 
+if TYPE_CHECKING:
+    from .v_container import vContainer
+
 
 class vAPICall(vSoftwareEntity):
     """A vAPICall is a software entity that represents an API call."""
@@ -45,6 +50,7 @@ class vAPICall(vSoftwareEntity):
         | Callable[..., float]
         | None = None,
         precursor: Entity | List[Entity] | None = None,
+        network_mode: str = Constants.PACKET,
     ) -> None:
         """Create a new vAPICall.
 
@@ -65,6 +71,7 @@ class vAPICall(vSoftwareEntity):
             create_at (int | float | Callable[..., int] | Callable[..., float] | None, optional): when this vAPICall should be created. Defaults to None.
             terminate_at (int | float | Callable[..., int] | Callable[..., float] | None, optional): when this vAPICall shoudl be terminated. Defaults to None.
             precursor (Entity | List[Entity] | None, optional): the precursor of this vAPICall. Defaults to None.
+            network_mode (str, optional): Constants.PACKET to send the data as packets decoded hop by hop, Constants.TRAIN to send the packets of each leg as a single packet train, Constants.FLOW to send each leg of the call as a single flow sharing the bandwidth fairly. Defaults to Constants.PACKET.
         """
         super().__init__(label, create_at, terminate_at, precursor)
         self._src = src
@@ -113,10 +120,16 @@ class vAPICall(vSoftwareEntity):
 
         self._packets: List[vPacket] = [] # EntityList(label=f"{self} Packets")
         self._processes: List[vContainerProcess] = [] # EntityList(label=f"{self} Processes")
+        self._flows: List[vFlow] = []
+        if network_mode not in (Constants.PACKET, Constants.TRAIN, Constants.FLOW):
+            raise ValueError(f"{network_mode} is an unknown network mode.")
+        self._network_mode = network_mode
+        self._outstanding_children = 0
         simulation.api_calls.append(self)
 
     def on_creation(self):
         super().on_creation()
+        simulation.api_call_scheduler.submit(self)
 
     def on_initiate(self) -> None:
         """Initiate the vAPICall.
@@ -143,46 +156,25 @@ class vAPICall(vSoftwareEntity):
                 self.terminate(simulation.now)
                 return
 
-            src_packets: List[Entity] = list()
-            for i in range(self.num_src_packets):
-                src_packet = vPacket(
-                    src=self.src,
-                    dst=self.dst,
-                    size=self.src_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-SRC-{i}",
-                )
-                self.packets.append(src_packet)
-                src_packets.append(src_packet)
-
-            ret_packets: List[Entity] = list()
-            for i in range(self.num_ret_packets):
-                ret_packet = vPacket(
-                    src=self.dst,
-                    dst=self.src,
-                    size=self.ret_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-RET-{i}",
-                    precursor=src_packets,
-                )
-                self.packets.append(ret_packet)
-                ret_packets.append(ret_packet)
-
-            ack_packets: List[Entity] = list()
-            for i in range(self.num_ack_packets):
-                ack_packet = vPacket(
-                    src=self.src,
-                    dst=self.dst,
-                    size=self.ack_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-ACK-{i}",
-                    precursor=ret_packets,
-                )
-                self.packets.append(ack_packet)
-                ack_packets.append(ack_packet)
+            src_packets = self._transfer(
+                self.src, self.dst, self.num_src_packets, self.src_packet_size, "SRC"
+            )
+            ret_packets = self._transfer(
+                self.dst,
+                self.src,
+                self.num_ret_packets,
+                self.ret_packet_size,
+                "RET",
+                precursor=src_packets,
+            )
+            self._transfer(
+                self.src,
+                self.dst,
+                self.num_ack_packets,
+                self.ack_packet_size,
+                "ACK",
+                precursor=ret_packets,
+            )
 
         elif isinstance(self.src, vUser) and not isinstance(self.dst, vUser):
             if self.src_process_length > 0:
@@ -203,18 +195,9 @@ class vAPICall(vSoftwareEntity):
 
             dst_container = self.dst.getContainer()
             
-            src_packets: List[Entity] = list()
-            for i in range(self.num_src_packets):
-                src_packet = vPacket(
-                    src=self.src,
-                    dst=dst_container,
-                    size=self.src_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-SRC-{i}",
-                )
-                self.packets.append(src_packet)
-                src_packets.append(src_packet)
+            src_packets = self._transfer(
+                self.src, dst_container, self.num_src_packets, self.src_packet_size, "SRC"
+            )
 
             dst_process = vContainerProcess(
                 container=self.dst.getContainer(),
@@ -225,31 +208,23 @@ class vAPICall(vSoftwareEntity):
                 label=f"{self}-DST",
             )
 
-            ret_packets: List[Entity] = list()
-            for i in range(self.num_ret_packets):
-                ret_packet = vPacket(
-                    src=dst_container,
-                    dst=self.src,
-                    size=self.ret_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-RET-{i}",
-                    precursor=dst_process,
-                )
-                self.packets.append(ret_packet)
-                ret_packets.append(ret_packet)
-
-            for i in range(self.num_ack_packets):
-                ack_packet = vPacket(
-                    src=self.src,
-                    dst=dst_container,
-                    size=self.ack_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-ACK-{i}",
-                    precursor=ret_packets,
-                )
-                self.packets.append(ack_packet)
+            ret_packets = self._transfer(
+                dst_container,
+                self.src,
+                self.num_ret_packets,
+                self.ret_packet_size,
+                "RET",
+                precursor=dst_process,
+            )
+
+            self._transfer(
+                self.src,
+                dst_container,
+                self.num_ack_packets,
+                self.ack_packet_size,
+                "ACK",
+                precursor=ret_packets,
+            )
 
         elif not isinstance(self.src, vUser) and isinstance(self.dst, vUser):
             if self.dst_process_length > 0:
@@ -268,33 +243,23 @@ class vAPICall(vSoftwareEntity):
             )
             self.processes.append(src_process)
 
-            src_packets: List[Entity] = list()
-            for i in range(self.num_ack_packets):
-                src_packet = vPacket(
-                    src=src_container,
-                    dst=self.dst,
-                    size=self.src_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-SRC-{i}",
-                    precursor=src_process,
-                )
-                self.packets.append(src_packet)
-                src_packets.append(src_packet)
-
-            ret_packets: List[Entity] = list()
-            for i in range(self.num_ret_packets):
-                ret_packet = vPacket(
-                    src=self.dst,
-                    dst=src_container,
-                    size=self.ret_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-RET-{i}",
-                    precursor=src_packets,
-                )
-                self.packets.append(ret_packet)
-                ret_packets.append(ret_packet)
+            src_packets = self._transfer(
+                src_container,
+                self.dst,
+                self.num_src_packets,
+                self.src_packet_size,
+                "SRC",
+                precursor=src_process,
+            )
+
+            ret_packets = self._transfer(
+                self.dst,
+                src_container,
+                self.num_ret_packets,
+                self.ret_packet_size,
+                "RET",
+                precursor=src_packets,
+            )
 
             ack_process = vContainerProcess(
                 container=src_container,
@@ -306,17 +271,14 @@ class vAPICall(vSoftwareEntity):
             )
             self.processes.append(ack_process)
 
-            for i in range(self.num_ack_packets):
-                ack_packet = vPacket(
-                    src=src_container,
-                    dst=self.dst,
-                    size=self.ack_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-ACK-{i}",
-                    precursor=ack_process,
-                )
-                self.packets.append(ack_packet)
+            self._transfer(
+                src_container,
+                self.dst,
+                self.num_ack_packets,
+                self.ack_packet_size,
+                "ACK",
+                precursor=ack_process,
+            )
 
         elif not isinstance(self.src, vUser) and not isinstance(self.dst, vUser):
             
@@ -332,19 +294,14 @@ class vAPICall(vSoftwareEntity):
             )
             self.processes.append(src_process)
 
-            src_packets: List[Entity] = list()
-            for i in range(self.num_src_packets):
-                src_packet = vPacket(
-                    src=src_container,
-                    dst=dst_container,
-                    size=self.src_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-SRC-{i}",
-                    precursor=src_process,
-                )
-                self.packets.append(src_packet)
-                src_packets.append(src_packet)
+            src_packets = self._transfer(
+                src_container,
+                dst_container,
+                self.num_src_packets,
+                self.src_packet_size,
+                "SRC",
+                precursor=src_process,
+            )
 
             dst_process = vContainerProcess(
                 container=dst_container,
@@ -356,19 +313,14 @@ class vAPICall(vSoftwareEntity):
             )
             self.processes.append(dst_process)
 
-            ret_packets: List[Entity] = list()
-            for i in range(self.num_ret_packets):
-                ret_packet = vPacket(
-                    src=dst_container,
-                    dst=src_container,
-                    size=self.ret_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-RET-{i}",
-                    precursor=dst_process,
-                )
-                self.packets.append(ret_packet)
-                ret_packets.append(ret_packet)
+            ret_packets = self._transfer(
+                dst_container,
+                src_container,
+                self.num_ret_packets,
+                self.ret_packet_size,
+                "RET",
+                precursor=dst_process,
+            )
 
             ack_process = vContainerProcess(
                 container=src_container,
@@ -380,41 +332,96 @@ class vAPICall(vSoftwareEntity):
             )
             self.processes.append(ack_process)
 
-            for i in range(self.num_ack_packets):
-                ack_packet = vPacket(
-                    src=src_container,
-                    dst=dst_container,
-                    size=self.ack_packet_size,
-                    priority=self.priority,
-                    create_at=simulation.now,
-                    label=f"{self}-ACK-{i}",
-                    precursor=ack_process,
-                )
-                self.packets.append(ack_packet)
+            self._transfer(
+                src_container,
+                dst_container,
+                self.num_ack_packets,
+                self.ack_packet_size,
+                "ACK",
+                precursor=ack_process,
+            )
 
-        @self.continuous_event(
-            at=simulation.now,
-            interval=simulation.min_time_unit,
-            duration=inf,
-            label=f"{self}-Monitor",
-        )
-        def monitoring():
-            if any([process.failed for process in self.processes]) or any(
-                [packet.failed for packet in self.packets]
-            ):
-                self.fail(simulation.now)
-                return
+        for child in self.processes + self.packets + self.flows:
+            self.add_child(child)
+        if self.outstanding_children == 0:
+            self.success(simulation.now)
 
-            if all([process.succeed for process in self.processes]) and all(
-                [packet.succeed for packet in self.packets]
-            ):
-                self.success(simulation.now)
-                return
-            
         logger.info(
             f"{simulation.now}:\t{self} is initiated {self} between {self.src} and {self.dst}."
         )
 
+    def _transfer(
+        self,
+        src: vContainer | vUser,
+        dst: vContainer | vUser,
+        num_packets: int,
+        packet_size: int,
+        leg: str,
+        precursor: Entity | List[Entity] | None = None,
+    ) -> List[Entity]:
+        """Create the packets of one leg of the API call, a single packet train in train mode, or a single flow of the same size in flow mode. Return the created entities, which are the precursors of the next step."""
+        if self.network_mode == Constants.FLOW:
+            if num_packets <= 0:
+                return list()
+            flow = vFlow(
+                src=src,
+                dst=dst,
+                size=num_packets * packet_size,
+                create_at=simulation.now,
+                label=f"{self}-{leg}",
+                precursor=precursor,
+            )
+            self.flows.append(flow)
+            return [flow]
+        if self.network_mode == Constants.TRAIN:
+            if num_packets <= 0:
+                return list()
+            train = vPacket(
+                src=src,
+                dst=dst,
+                size=packet_size,
+                count=num_packets,
+                priority=self.priority,
+                create_at=simulation.now,
+                label=f"{self}-{leg}",
+                precursor=precursor,
+            )
+            self.packets.append(train)
+            return [train]
+        packets: List[Entity] = list()
+        for i in range(num_packets):
+            packet = vPacket(
+                src=src,
+                dst=dst,
+                size=packet_size,
+                priority=self.priority,
+                create_at=simulation.now,
+                label=f"{self}-{leg}-{i}",
+                precursor=precursor,
+            )
+            self.packets.append(packet)
+            packets.append(packet)
+        return packets
+
+    def add_child(self, child: vSoftwareEntity) -> None:
+        """Track the process, packet or flow as an outstanding child of the API call."""
+        super().add_child(child)
+        self._outstanding_children += 1
+
+    def on_child_success(self, child: vSoftwareEntity) -> None:
+        """Succeed once all the processes, packets and flows succeeded."""
+        self._outstanding_children -= 1
+        if self.terminated or self.destroied:
+            return
+        if self.outstanding_children == 0:
+            self.success(simulation.now)
+
+    def on_child_fail(self, child: vSoftwareEntity) -> None:
+        """Fail as soon as one of the processes, packets or flows failed."""
+        if self.terminated or self.destroied:
+            return
+        self.fail(simulation.now)
+
     def on_termination(self):
         super().on_termination()
         for process in self.processes:
@@ -449,11 +456,26 @@ class vAPICall(vSoftwareEntity):
         """Return the priority of the API call."""
         return self._priority
 
+    @property
+    def outstanding_children(self) -> int:
+        """Return the number of processes, packets and flows of the API call that have not succeeded."""
+        return self._outstanding_children
+
     @property
     def packets(self) -> List[vPacket]:
         """Return the packets of the API call."""
         return self._packets
 
+    @property
+    def flows(self) -> List[vFlow]:
+        """Return the flows of the API call, only used in flow mode."""
+        return self._flows
+
+    @property
+    def network_mode(self) -> str:
+        """Return the network mode of the API call, packet, train or flow."""
+        return self._network_mode
+
     @property
     def processes(self) -> List[vContainerProcess]:
         """Return the processes of the API call."""
@@ -124,6 +124,8 @@ class vContainer(vSoftwareEntity):
             )
             self.volumes.append(volume)
 
+        if simulation._container_scheduler is not None:
+            simulation._container_scheduler.submit(self)
         logger.info(f"{simulation.now}:\t{self} is created.")
 
     def on_termination(self):
@@ -131,6 +133,12 @@ class vContainer(vSoftwareEntity):
             process.fail(simulation.now)
         for volume in self.volumes:
             volume.terminate(simulation.now)
+        if simulation._container_scheduler is not None:
+            simulation._container_scheduler.withdraw(self)
+        if self._host is not None:
+            simulation.host_index.update(self._host)
+        self.notify_observers()
+        simulation.notify_schedulers()
         logger.info(f"{simulation.now}:\t{self} is terminated.")
 
     def on_destruction(self):
@@ -138,6 +146,12 @@ class vContainer(vSoftwareEntity):
             process.fail(simulation.now)
         for volume in self.volumes:
             volume.destroy(simulation.now)
+        if simulation._container_scheduler is not None:
+            simulation._container_scheduler.withdraw(self)
+        if self._host is not None:
+            simulation.host_index.update(self._host)
+        self.notify_observers()
+        simulation.notify_schedulers()
         logger.info(f"{simulation.now}:\t{self} is failed.")
 
     def on_success(self) -> None:
@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Callable, List
 from Akatosh import Entity, EntityList, Resource
 from Akatosh.entity import Entity
 
-from PyCloudSim import logger, simulation
+from PyCloudSim import TrackedResource, Trigger, logger, simulation
 
 from .v_cpu_core import vCPUCore
 from .v_hardware_component import vHardwareComponent
@@ -79,23 +79,31 @@ class vCPU(vHardwareComponent):
 
         self._process_queue: List[vProcess | vContainerProcess | vDeamon | vDecoder] = EntityList(label=f"{self}-Process Queue")
         self._cores: List[vCPUCore] = EntityList(label=f"vCPU {self}_Cores")
-        self._computational_power_reservoir = Resource(
+        self._computational_power_reservoir = TrackedResource(
             capacity=1000 * self.num_cores,
             label=f"{self}-Computational Power Reservoir",
         )
         self._host = host
+        self._usage_listeners: List[Callable[[int | float, int | float, int | float], None]] = list()
+        self._trigger = Trigger(
+            self,
+            self._schedule_process,
+            label=f"{self} Scheduling process",
+            enabled=False,
+        )
 
     def on_creation(self):
         # create cores
         for i in range(self._num_cores):
-            self.cores.append(
-                vCPUCore(
-                    self._ipc,
-                    self._frequency,
-                    label=f"{self.label}-{i}",
-                    create_at=simulation.now,
-                )
+            core = vCPUCore(
+                self._ipc,
+                self._frequency,
+                label=f"{self.label}-{i}",
+                create_at=simulation.now,
             )
+            self.cores.append(core)
+            for listener in self._usage_listeners:
+                core.computational_power.add_listener(listener)
 
     def on_termination(self):
         # terminate cores
@@ -109,113 +117,125 @@ class vCPU(vHardwareComponent):
             core.power_on(at=simulation.now)
 
         # start process scheduling
-        @self.continuous_event(
-            at=simulation.now,
-            interval=self.instruction_cycle,
-            duration=inf,
-            label=f"{self} Scheduling process",
-        )
-        def _schedule_process():
-            # sort the process queue by priority
-            self.process_queue.sort(key=lambda process: process.priority, reverse=False)
-            for process in self.process_queue:
-                # calculate the number of schedulable instructions
-                if process.container is None:
-                    container_cpu_capacity = inf
-                else:
-                    container_cpu_capacity = round(
-                        ((process.container.cpu_limit - process.container.cpu_usage) / 1000)
-                        * (self.ipc * self.frequency)
-                    )
-                schedulable_instructions = min(
-                    [len(process.unscheduled_instructions), container_cpu_capacity]
-                )
-                if schedulable_instructions <= 0:
-                    continue
-                logger.debug(
-                    f"{simulation.now}:\t{self} is executing {schedulable_instructions} instructions of {process}."
+        self.trigger.enable()
+        self.trigger.notify()
+
+    def _schedule_process(self):
+        """Dispatch the instructions of the queued processes to the cores, woken up whenever a process arrives or a core frees capacity."""
+        # nothing can be dispatched if all the cores are saturated
+        if all(core.computational_power.amount <= 0 for core in self.cores):
+            return
+        # sort the process queue by priority
+        self.process_queue.sort(key=lambda process: process.priority, reverse=False)
+        for process in self.process_queue:
+            # calculate the number of schedulable instructions
+            if process.container is None or process.container.cpu_limit == inf:
+                container_cpu_capacity = inf
+            else:
+                container_cpu_capacity = round(
+                    ((process.container.cpu_limit - process.container.cpu_usage) / 1000)
+                    * (self.ipc * self.frequency)
                 )
-                try:
-                    while schedulable_instructions > 0:
-                        # get and sort available cores
-                        available_cores = [
-                            core
-                            for core in self.cores
-                            if core.computational_power.amount > 0
-                        ]
-                        if len(available_cores) == 0:
-                            break
-                        available_cores.sort(
-                            key=lambda core: core.computational_power.amount,
-                            reverse=True,
-                        )
-                        # mode 1: assign one instruction to one core, then move on to the next core
-                        if self.mode == 1:
-                            core = available_cores[0]
-                            # get the next instruction
-                            instruction = process.unscheduled_instructions.pop(0)
-                            # update the host ram usage
-                            if process.host is None:
-                                raise RuntimeError()
-                            # a value error exception will be raised if fail to distribute the ram space
-                            instruction.get(process.host.ram, instruction.length)
-                            # update the container's ram usage
-                            if process.container is not None:
-                                process.container._ram_usage += instruction.length
-                                # break the loop if container's ram usage exceeds the limit
-                                if (
-                                    process.container.ram_usage
-                                    > process.container.ram_limit
-                                ):
-                                    raise Exception()
-                                # update the container's cpu usage
-                                process.container._cpu_usage += (1 * 1000) / (
-                                    self.ipc * self.frequency
-                                )
-                            # cache the instruction to the core
-                            core.cache_instruction(instruction)
-                            schedulable_instructions -= 1
-                        # mode 2: assign as many instructions as possible to one core, then move on to the next core
-                        elif self.mode == 2:
-                            core = available_cores[0]
-                            for _ in range(
-                                round(
-                                    min(
-                                        [
-                                            schedulable_instructions,
-                                            core.computational_power.amount,
-                                        ]
-                                    )
-                                )
-                            ):
-                                # get the next instruction
-                                instruction = process.unscheduled_instructions.pop(0)
-                                # update the host ram usage
-                                if process.host is None:
-                                    raise RuntimeError()
-                                # a value error exception will be raised if fail to distribute the ram space
-                                instruction.get(process.host.ram, instruction.length)
-                                if process.container is not None:
-                                    # update the container's ram usage
-                                    process.container._ram_usage += instruction.length
-                                    # break the loop if container's ram usage exceeds the limit
-                                    if (
-                                        process.container.ram_usage
-                                        > process.container.ram_limit
-                                    ):
-                                        raise Exception()
-                                    # update the container's cpu usage
-                                    process.container._cpu_usage += (1 * 1000) / (
-                                        self.ipc * self.frequency
-                                    )
-                                # cache the instruction to the core
-                                core.cache_instruction(instruction)
-                                schedulable_instructions -= 1
-                except Exception:
-                    process.fail(simulation.now)
-                    if process.container is not None:
-                        process.container.fail(simulation.now)
-                    continue                   
+            schedulable_instructions = min(
+                [process.instructions.unscheduled, container_cpu_capacity]
+            )
+            if schedulable_instructions <= 0:
+                continue
+            logger.debug(
+                f"{simulation.now}:\t{self} is executing {schedulable_instructions} instructions of {process}."
+            )
+            if process.container is not None:
+                process.container.notify_observers()
+            try:
+                # get available cores
+                available_cores = [
+                    core for core in self.cores if core.computational_power.amount > 0
+                ]
+                # mode 1: assign one instruction to one core, then move on to the next core
+                if self.mode == 1:
+                    assignments = self._spread(available_cores, schedulable_instructions)
+                # mode 2: assign as many instructions as possible to one core, then move on to the next core
+                elif self.mode == 2:
+                    assignments = self._fill(available_cores, schedulable_instructions)
+                else:
+                    assignments = list()
+                for core, count in assignments:
+                    self._dispatch(process, core, count)
+            except Exception:
+                process.fail(simulation.now)
+                if process.container is not None:
+                    process.container.fail(simulation.now)
+                continue
+
+    @staticmethod
+    def _spread(cores: List[vCPUCore], instructions: int):
+        """Split the instructions among the cores as if they are assigned one at a time to the core with the most capacity, ties go to the first core."""
+        amounts = [round(core.computational_power.amount) for core in cores]
+        if len(amounts) == 0:
+            return list()
+
+        def assigned(level: int) -> int:
+            return sum(max(0, amount - level) for amount in amounts)
+
+        # find the lowest capacity level the cores are drained to
+        low, high = 0, max(amounts)
+        while low < high:
+            level = (low + high) // 2
+            if assigned(level) <= instructions:
+                high = level
+            else:
+                low = level + 1
+        counts = [max(0, amount - low) for amount in amounts]
+        # the remaining instructions drain the cores at the level one more each
+        remaining = instructions - sum(counts)
+        if low > 0:
+            for index, amount in enumerate(amounts):
+                if remaining == 0:
+                    break
+                if amount >= low:
+                    counts[index] += 1
+                    remaining -= 1
+        return [(core, count) for core, count in zip(cores, counts) if count > 0]
+
+    @staticmethod
+    def _fill(cores: List[vCPUCore], instructions: int):
+        """Split the instructions among the cores by filling up the core with the most capacity first."""
+        assignments = list()
+        for core in sorted(
+            cores, key=lambda core: core.computational_power.amount, reverse=True
+        ):
+            if instructions <= 0:
+                break
+            count = round(min([instructions, core.computational_power.amount]))
+            assignments.append((core, count))
+            instructions -= count
+        return assignments
+
+    def _dispatch(
+        self,
+        process: vProcess | vContainerProcess | vDeamon | vDecoder,
+        core: vCPUCore,
+        count: int,
+    ):
+        """Hand the next instructions of a process to a core, the process holds the RAM and the computational power until the instructions are retired."""
+        if process.host is None:
+            raise RuntimeError()
+        start = process.instructions.schedule(count)
+        ram = process.instructions.size(start, count)
+        # a value error exception will be raised if fail to distribute the ram space
+        process.get(process.host.ram, ram)
+        if process.container is not None:
+            # update the container's ram usage
+            process.container._ram_usage += ram
+            # break the loop if container's ram usage exceeds the limit
+            if process.container.ram_usage > process.container.ram_limit:
+                raise Exception()
+            # update the container's cpu usage
+            process.container._cpu_usage += (count * 1000) / (
+                self.ipc * self.frequency
+            )
+        # cache the instructions to the core
+        core.cache_instructions(process, start, count)
 
     def on_power_off(self) -> None:
         """Power off the CPU, also terminates all unfinished processes."""
@@ -227,10 +247,8 @@ class vCPU(vHardwareComponent):
         for core in self.cores:
             core.power_off(at=simulation.now)
 
-        # cancel process scheduling
-        for event in self.events:
-            if event.label == f"{self} Scheduling process":
-                event.cancel()
+        # stop process scheduling
+        self.trigger.disable()
 
     def on_fail(self) -> None:
         self.power_off(simulation.now)
@@ -270,6 +288,11 @@ class vCPU(vHardwareComponent):
         """Returns the cores of the CPU."""
         return self._cores
 
+    @property
+    def trigger(self):
+        """Returns the trigger that wakes up the process scheduling."""
+        return self._trigger
+
     @property
     def host(self):
         """Returns the host of the CPU."""
@@ -285,6 +308,14 @@ class vCPU(vHardwareComponent):
         """Returns the instruction cycle of the CPU."""
         return 1 / (self.ipc * self.frequency)
 
+    def add_usage_listener(
+        self, listener: Callable[[int | float, int | float, int | float], None]
+    ) -> None:
+        """Report the changes of the computational power used on the cores to the listener, including the cores created later."""
+        self._usage_listeners.append(listener)
+        for core in self.cores:
+            core.computational_power.add_listener(listener)
+
     def usage(self, duration: int | float | None = None):
         """Returns the CPU usage."""
         return sum([core.usage(duration) for core in self.cores])
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from math import inf
-from typing import Any, Callable, List
+from math import floor, inf
+from collections import deque
+from typing import Any, Callable, Deque, List, Tuple
 
-from Akatosh import Entity, EntityList, Event, Resource
+from Akatosh import Entity, Event, Resource, instant_event
 from Akatosh.entity import Entity
 
-from PyCloudSim import logger, simulation
+from PyCloudSim import TrackedResource, Trigger, logger, simulation
 
 from .v_hardware_component import vHardwareComponent
-from .v_process import vInstruction, vProcess
+from .v_process import vProcess
 
 
 class vCPUCore(vHardwareComponent):
@@ -44,54 +45,107 @@ class vCPUCore(vHardwareComponent):
         else:
             self._frequency = frequency
         self._instruction_cycle = 1 / (self._ipc * self._frequency)
-        self._computational_power = Resource(
+        self._computational_power = TrackedResource(
             capacity=self.ipc * self.frequency,
             label=f"{self} Computational Power",
         )
-        self._instructions_queue: List[vInstruction] = EntityList(
-            label=f"{self} InstructionsQueue"
+        # cached instructions as (process, start, count) ranges
+        self._instructions_queue: Deque[Tuple[vProcess, int, int]] = deque()
+        self._clock: Event | None = None
+        self._clock_process: vProcess | None = None
+        self._trigger = Trigger(
+            self,
+            self._execute_instructions,
+            label=f"{self.label} Execute Instructions",
+            enabled=False,
         )
-        self._clock: Event = None  # type: ignore
 
     def on_power_on(self):
-        """Create the execution clock of the CPU core."""
+        """Start executing the cached instructions."""
+        self.trigger.enable()
+        self.trigger.notify()
+
+    def _execute_instructions(self):
+        """Execute the next batch of cached instructions if the CPU core is idle. The leading instructions of the same process that can be retired within the batch window are executed together and retired by one clock event."""
+        if self._clock is not None or len(self.instructions_queue) == 0:
+            return
+        process, _, count = self.instructions_queue[0]
+        batch_size = min(
+            count, max(1, floor(simulation.batch_window / self.instruction_cycle))
+        )
 
-        @self.continuous_event(
-            at=simulation.now + self.instruction_cycle,
-            interval=self.instruction_cycle,
-            duration=inf,
+        @instant_event(
+            at=simulation.now + batch_size * self.instruction_cycle,
             label=f"{self.label} Clock",
         )
-        def _execute_instruction():
-            if len(self.instructions_queue) > 0:
-                instruction = self.instructions_queue[0]
-                instruction.terminate(at=simulation.now)
-                logger.debug(
-                    f"{simulation.now}:\t{self} executed {instruction}, current capacity: {self.computational_power.amount}, queue length: {len(self.instructions_queue)}."
+        def _retire_instructions():
+            self._clock = None
+            # more instructions of the process may have been merged into the range in the meantime
+            _, start, count = self.instructions_queue.popleft()
+            if count > batch_size:
+                self.instructions_queue.appendleft(
+                    (process, start + batch_size, count - batch_size)
                 )
-                if instruction.process.deamon:
-                    instruction = vInstruction(
-                        process=instruction.process,
-                        create_at=simulation.now,
-                    )
-
-    def cache_instruction(self, instruction: vInstruction) -> None:
-        """Cache instructions from a process to the CPU core."""
-        self.instructions_queue.append(instruction)
-        instruction.get(self.computational_power, 1)
+            self._retire(process, start, batch_size)
+            logger.debug(
+                f"{simulation.now}:\t{self} executed {batch_size} instructions of {process}, current capacity: {self.computational_power.amount}, queue length: {len(self.instructions_queue)}."
+            )
+            self._execute_instructions()
+
+        self._clock = _retire_instructions
+        self._clock_process = process
+
+    def _retire(self, process: vProcess, start: int, count: int) -> None:
+        """Retire the executed instructions, release the resources they held and clear out their usage of the container."""
+        ram = process.instructions.size(start, count)
+        process.put(process.host.ram, ram)
+        process.put(self.computational_power, count)
+        if process.container is not None:
+            process.container._cpu_usage -= (count * 1000) / (
+                process.container.host.cpu.ipc * process.container.host.cpu.frequency
+            )
+            process.container._ram_usage -= ram
+            process.container.notify_observers()
+        # the core and the container have capacity for the next instructions
+        process.host.cpu.trigger.notify()
+        process.retire_instructions(start, count)
+
+    def cache_instructions(self, process: vProcess, start: int, count: int) -> None:
+        """Cache a range of instructions from a process to the CPU core."""
+        if len(self.instructions_queue) > 0:
+            last_process, last_start, last_count = self.instructions_queue[-1]
+            if last_process is process and last_start + last_count == start:
+                self.instructions_queue[-1] = (process, last_start, last_count + count)
+            else:
+                self.instructions_queue.append((process, start, count))
+        else:
+            self.instructions_queue.append((process, start, count))
+        process.get(self.computational_power, count)
+        self.trigger.notify()
+
+    def evict(self, process: vProcess) -> None:
+        """Remove the cached instructions of a terminated process, the resources are released by the termination of the process."""
+        self._instructions_queue = deque(
+            cached for cached in self.instructions_queue if cached[0] is not process
+        )
+        if self._clock is not None and self._clock_process is process:
+            self._clock.cancel()
+            self._clock = None
+            self.trigger.notify()
 
     def on_power_off(self) -> None:
         """Power off the CPU core."""
-        # terminate the clock of the CPU core.
-        for event in self.events:
-            if event.label == f"{self.label} Clock":
-                event.cancel()
+        # stop the clock of the CPU core.
+        self.trigger.disable()
+        if self._clock is not None:
+            self._clock.cancel()
+            self._clock = None
 
         # find impacted process.
         impacted_process: List[vProcess] = []
-        for instruction in self.instructions_queue:
-            if instruction.process not in impacted_process:
-                impacted_process.append(instruction.process)
+        for process, _, _ in self.instructions_queue:
+            if process not in impacted_process:
+                impacted_process.append(process)
         # fail impacted process.
         for process in impacted_process:
             process.fail(simulation.now)
@@ -120,15 +174,20 @@ class vCPUCore(vHardwareComponent):
         return self._instructions_queue
 
     @property
-    def computational_power(self) -> Resource:
+    def computational_power(self) -> TrackedResource:
         """Returns the computational power of the CPU core."""
         return self._computational_power
 
     @property
     def clock(self):
-        """Returns the clock of the CPU core, which is the continuous event that consumes instructions."""
+        """Returns the clock of the CPU core, which is the pending event that retires the current batch of instructions."""
         return self._clock
 
+    @property
+    def trigger(self):
+        """Returns the trigger that wakes up the CPU core when instructions are cached."""
+        return self._trigger
+
     def usage(self, duration: int | float | None = None):
         """Returns the usage of the CPU core."""
         return self.computational_power.usage(duration)
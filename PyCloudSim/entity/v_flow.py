@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+from Akatosh import Entity
+from networkx import NetworkXNoPath, NodeNotFound
+
+from PyCloudSim import logger, simulation
+
+from .v_sofware_entity import vSoftwareEntity
+
+if TYPE_CHECKING:
+    from .v_container import vContainer
+    from .v_nic import vPort
+    from .v_user import vUser
+
+
+class vFlow(vSoftwareEntity):
+    def __init__(
+        self,
+        src: vContainer | vUser,
+        dst: vContainer | vUser,
+        size: int | Callable[..., int],
+        label: str | None = None,
+        create_at: int
+        | float
+        | Callable[..., int]
+        | Callable[..., float]
+        | None = None,
+        terminate_at: int
+        | float
+        | Callable[..., int]
+        | Callable[..., float]
+        | None = None,
+        precursor: Entity | List[Entity] | None = None,
+    ) -> None:
+        """Create a simulated flow, a fluid transfer of data between two hosts. Unlike packets, a flow is not decoded hop by hop, it is transferred at the max-min fair rate of its path, which is recomputed whenever a flow starts or finishes.
+
+        Args:
+            src (vContainer | vUser): the source of the flow.
+            dst (vContainer | vUser): the destination of the flow.
+            size (int | Callable[..., int]): the size of the flow, in bytes.
+            label (str | None, optional): short description of the flow. Defaults to None.
+            create_at (int | float | Callable[..., int] | Callable[..., float] | None, optional): when this flow should be created. Defaults to None.
+            terminate_at (int | float | Callable[..., int] | Callable[..., float] | None, optional): when this flow should be terminated. Defaults to None.
+            precursor (Entity | List[Entity] | None, optional): the entities that this flow must not be created before. Defaults to None.
+        """
+        super().__init__(label, create_at, terminate_at, precursor)
+        self._src = src
+        self._src_host = src.host
+        self._dst = dst
+        self._dst_host = dst.host
+        if callable(size):
+            self._size = size()
+        else:
+            self._size = size
+        self._remaining = self._size
+        self._rate = 0.0
+        self._ports: List[vPort] = list()
+        # the bandwidth held on each port at the current rate
+        self._holdings: Dict[vPort, float] = dict()
+
+    def on_creation(self):
+        """Creation procedure of the simulated flow."""
+        super().on_creation()
+        logger.info(f"{simulation.now}:\t{self} is created.")
+        self.initiate(simulation.now)
+
+    def on_initiate(self) -> None:
+        """The initiation procedure of the simulated flow, which finds the ports along its path and starts the transfer."""
+        super().on_initiate()
+        try:
+            path = simulation.network.route(self.src_host, self.dst_host)  # type: ignore
+        except (NetworkXNoPath, NodeNotFound):
+            logger.info(f"{simulation.now}:\t{self} can not reach {self.dst_host}.")
+            self.fail(simulation.now)
+            return
+        if len(path) == 1:
+            path = [path[0], path[0]]
+        for current_hop, next_hop in zip(path, path[1:]):
+            for port in (
+                current_hop.NIC.port_to(next_hop),
+                next_hop.NIC.port_to(current_hop),
+            ):
+                if port is None:
+                    logger.info(
+                        f"{simulation.now}:\t{self} can not find a port between {current_hop} and {next_hop}."
+                    )
+                    self.fail(simulation.now)
+                    return
+                if port not in self._ports:
+                    self._ports.append(port)
+        simulation.flow_model.add(self)
+        logger.info(f"{simulation.now}:\t{self} is initiated.")
+
+    def on_termination(self):
+        """Termination procedure of the simulated flow."""
+        super().on_termination()
+        simulation.flow_model.remove(self)
+        logger.info(f"{simulation.now}:\t{self} is terminated.")
+
+    def on_destruction(self):
+        """Destruction procedure of the simulated flow."""
+        super().on_destruction()
+        simulation.flow_model.remove(self)
+
+    def on_success(self):
+        super().on_success()
+        logger.info(f"{simulation.now}:\t{self} is transferred.")
+
+    def on_fail(self):
+        super().on_fail()
+        logger.info(f"{simulation.now}:\t{self} is failed.")
+
+    @property
+    def src(self):
+        """return the source of the flow, could be a simulated user or container."""
+        return self._src
+
+    @property
+    def src_host(self):
+        """return the source host of the flow, could be a simulated host or gateway."""
+        return self._src_host
+
+    @property
+    def dst(self):
+        """return the destination of the flow, could be a simulated user or container."""
+        return self._dst
+
+    @property
+    def dst_host(self):
+        """return the destination host of the flow, could be a simulated host or gateway."""
+        return self._dst_host
+
+    @property
+    def size(self) -> int:
+        """return the size of the flow."""
+        return self._size
+
+    @property
+    def remaining(self) -> float:
+        """return the bytes of the flow that have not been transferred."""
+        return self._remaining
+
+    @property
+    def rate(self) -> float:
+        """return the current transfer rate of the flow, in bytes per second."""
+        return self._rate
+
+    @property
+    def ports(self) -> List[vPort]:
+        """return the ports along the path of the flow."""
+        return self._ports
@@ -1,12 +1,11 @@
 from __future__ import annotations
 from math import inf
-from operator import indexOf
 from typing import TYPE_CHECKING, List
 
 from Akatosh import Entity, EntityList, Resource
 from Akatosh.entity import Entity
 
-from PyCloudSim import simulation, logger
+from PyCloudSim import TrackedResource, simulation, logger
 
 from .v_nic import vNIC
 from .constants import Constants
@@ -30,11 +29,11 @@ class vGateway(Entity):
 
         self._users: List[vUser] = EntityList()
         self._NIC = vNIC(host=self, label=f"{self}-NIC")
-        self._ram = Resource(capacity=inf, label=f"{self}-RAM")
+        self._ram = TrackedResource(capacity=inf, label=f"{self}-RAM")
         self._cpu = None
 
     def on_creation(self):
-        simulation.topology.add_node(self)
+        simulation.network.add_node(self)
         self.NIC.create(simulation.now)
         self.NIC.power_on(simulation.now)
 
@@ -51,14 +50,17 @@ class vGateway(Entity):
         if packet.in_transmission:
             packet.state.remove(Constants.INTRANSMISSION)
         try:
-            packet.get(self.ram, packet.size)
+            packet.get(self.ram, packet.total_size)
         except:
             packet.drop()
             return
         self.packet_queue.append(packet)
         packet._current_hop = self
         if packet.current_hop is not packet.dst_host:
-            packet._next_hop = packet.path[indexOf(packet.path, self) + 1]
+            packet._next_hop = simulation.network.next_hop(self, packet.dst_host)  # type: ignore
+            if packet.next_hop is None:
+                packet.drop()
+                return
         else:
             packet.success(simulation.now)
         logger.info(f"{simulation.now}:\t{self} receives {packet}.")
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 import warnings
+from heapq import heapify, heappop, heappush
 from ipaddress import IPv4Address
 from math import inf
-from operator import indexOf
-from typing import TYPE_CHECKING, Any, Callable, List
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple
 
-from Akatosh import Entity, Resource
+from Akatosh import Entity, Resource, instant_event
 from bitmath import GiB
 
-from PyCloudSim import logger, simulation
+from PyCloudSim import TrackedResource, logger, simulation
 
 from .constants import Constants
 from .v_cpu import vCPU
@@ -17,6 +17,7 @@ from .v_nic import vNIC
 from .v_process import vDecoder
 
 if TYPE_CHECKING:
+    from .v_cpu_core import vCPUCore
     from .v_packet import vPacket
 
 
@@ -64,17 +65,17 @@ class vHardwareEntity(Entity):
             ipc, frequency, num_cores, cpu_tdps, cpu_mode, self, label=f"{label}"
         )
         if callable(ram):
-            self._ram = Resource(
+            self._ram = TrackedResource(
                 capacity=GiB(round(ram())).bytes, label=f"{self.label}-RAM"
             )
         else:
-            self._ram = Resource(capacity=GiB(ram).bytes, label=f"{self.label}-RAM")
+            self._ram = TrackedResource(capacity=GiB(ram).bytes, label=f"{self.label}-RAM")
         if callable(rom):
-            self._rom = Resource(
+            self._rom = TrackedResource(
                 capacity=GiB(round(rom())).bytes, label=f"{self.label}-ROM"
             )
         else:
-            self._rom = Resource(capacity=GiB(rom).bytes, label=f"{self.label}-ROM")
+            self._rom = TrackedResource(capacity=GiB(rom).bytes, label=f"{self.label}-ROM")
 
         if architecture in [Constants.X86, Constants.ARM]:
             self._architecture = architecture
@@ -198,7 +199,7 @@ class vHardwareEntity(Entity):
         pass
 
     def receive_packet(self, packet: vPacket) -> None:
-        """Receive a packet from the NIC. A decoding virtual process will be created if the packet is successfully received. The decoding process simulates the processing delay."""
+        """Receive a packet from the NIC. The packet is decoded if it is successfully received, which simulates the processing delay."""
         if packet.decoded:
             packet.state.remove(Constants.DECODED)
 
@@ -206,23 +207,88 @@ class vHardwareEntity(Entity):
             packet.state.remove(Constants.INTRANSMISSION)
 
         try:
-            packet.get(self.ram, packet.size)
+            packet.get(self.ram, packet.total_size)
         except:
             packet.drop()
             return
         self.packet_queue.append(packet)
         packet._current_hop = self
         if packet.current_hop is not packet.dst_host:
-            packet._next_hop = packet.path[indexOf(packet.path, self) + 1]
-        decoder = vDecoder(
-            packet=packet,
-            length=packet.size,
-            host=self,
-            label=f"{packet} Decoder",
-            create_at=simulation.now,
-        )
+            packet._next_hop = simulation.network.next_hop(self, packet.dst_host)  # type: ignore
+            if packet.next_hop is None:
+                packet.drop()
+                return
+        # a decoder process would decode the packets of a train one after another
+        if simulation.analytic_decoding or packet.count > 1:
+            self.decode_packet(packet)
+        else:
+            decoder = vDecoder(
+                packet=packet,
+                length=packet.total_size,
+                host=self,
+                label=f"{packet} Decoder",
+                create_at=simulation.now,
+            )
         logger.info(f"{simulation.now}:\t{self} receives {packet}.")
 
+    def decode_packet(self, packet: vPacket) -> None:
+        """Decode a packet with one event instead of a decoder process. The packet holds the computational power of the least loaded CPU core while it is decoded, so the decoding shows in the CPU utilization and slows down the other processes. The decoding waits for the instructions already held on the core. The packets of a train are decoded in parallel, each one on the core that would finish it first, and the train is decoded when the last core finishes."""
+        reservations: List[Tuple[vCPUCore, int]] = list()
+        if len(self.cpu.cores) > 0:
+            cores = self.cpu.cores
+            queued = [
+                core.computational_power.capacity - core.computational_power.amount
+                for core in cores
+            ]
+            counts = [0] * len(cores)
+            # the time each core finishes its queued instructions, ties go to the first core
+            finish_times = [
+                (amount * core.instruction_cycle, index)
+                for index, (core, amount) in enumerate(zip(cores, queued))
+            ]
+            heapify(finish_times)
+            for _ in range(packet.count):
+                finish_time, index = heappop(finish_times)
+                counts[index] += 1
+                heappush(
+                    finish_times,
+                    (finish_time + packet.size * cores[index].instruction_cycle, index),
+                )
+            delay = 0
+            for core, amount, count in zip(cores, queued, counts):
+                if count == 0:
+                    continue
+                length = count * packet.size
+                delay = max(delay, (amount + length) * core.instruction_cycle)
+                reserved = min(length, round(core.computational_power.amount))
+                if reserved > 0:
+                    packet.get(core.computational_power, reserved)
+                    reservations.append((core, reserved))
+        else:
+            delay = packet.total_size / (self.cpu.ipc * self.cpu.frequency)
+
+        @instant_event(
+            at=simulation.now + max(delay, simulation.min_time_unit),
+            label=f"{packet} Decoding",
+        )
+        def _decoded():
+            if packet.terminated or packet.destroied:
+                # the reserved computational power was released with the packet
+                if len(reservations) > 0:
+                    self.cpu.trigger.notify()
+                return
+            for core, reserved in reservations:
+                packet.put(core.computational_power, reserved)
+            if len(reservations) > 0:
+                # the cores have capacity for the processes again
+                self.cpu.trigger.notify()
+            packet.state.append(Constants.DECODED)
+            logger.info(f"{simulation.now}:\t{packet} is decoded.")
+            if packet.current_hop is packet.dst_host:
+                packet.success(simulation.now)
+            else:
+                self.NIC.enqueue(packet)
+
     def drop_packet(self, packet: vPacket) -> None:
         """Drop a packet from the NIC. It should not be called manually."""
         packet.drop()
@@ -251,12 +317,12 @@ class vHardwareEntity(Entity):
         return self._cpu
 
     @property
-    def ram(self) -> Resource:
+    def ram(self) -> TrackedResource:
         """Return the RAM of the hardware entity"""
         return self._ram
 
     @property
-    def rom(self) -> Resource:
+    def rom(self) -> TrackedResource:
         """Return the ROM of the hardware entity"""
         return self._rom
 
@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, Any, Callable, List
 from Akatosh import Entity, EntityList, Resource
 from bitmath import GiB
 
-from PyCloudSim import logger, simulation
+from PyCloudSim import TrackedResource, logger, simulation
 
 from .constants import Constants
 from .v_hardware_entity import vHardwareEntity
@@ -75,20 +75,20 @@ class vHost(vHardwareEntity):
         )
 
         if callable(ram):
-            self._ram_reservoir = Resource(
+            self._ram_reservoir = TrackedResource(
                 capacity=GiB(round(ram())).bytes, label=f"{self} RAM Reservoir"
             )
         else:
-            self._ram_reservoir = Resource(
+            self._ram_reservoir = TrackedResource(
                 capacity=GiB(ram).bytes, label=f"{self} RAM Reservoir"
             )
 
         if callable(rom):
-            self._rom_reservoir = Resource(
+            self._rom_reservoir = TrackedResource(
                 capacity=GiB(round(rom())).bytes, label=f"{self} ROM Reservoir"
             )
         else:
-            self._rom_reservoir = Resource(
+            self._rom_reservoir = TrackedResource(
                 capacity=GiB(rom).bytes, label=f"{self} ROM Reservoir"
             )
 
@@ -97,16 +97,32 @@ class vHost(vHardwareEntity):
         )
         self._volume_queue: List[vVolume] = EntityList(label=f"{self} Volume Queue")
 
+    def on_creation(self):
+        super().on_creation()
+        # the hosts are searched in the order they join the network, not the order they are powered on
+        simulation.host_index.update(self, available=False)
+
+    def on_power_on(self) -> None:
+        super().on_power_on()
+        simulation.host_index.update(self, available=True)
+        simulation.notify_schedulers()
+
     def on_power_off(self) -> None:
+        simulation.host_index.update(self, available=False)
         for container in self.container_queue:
             container.terminate(at=simulation.now)
 
+    def on_termination(self):
+        super().on_termination()
+        simulation.host_index.update(self, available=False)
+
     def allocate_container(self, container: vContainer) -> None:
         """Allocate a container to the host. This will start the creation of the container."""
         self._container_queue.append(container)
         container.get(self.cpu_reservoir, container.cpu)
         container.get(self.ram_reservoir, container.ram)
         container.get(self.rom_reservoir, container.image_size)
+        simulation.host_index.update(self)
         container._host = self
         container.state.append(Constants.SCHEDULED)
         container.initiate(simulation.now)
@@ -117,8 +133,11 @@ class vHost(vHardwareEntity):
     def allocate_volume(self, volume: vVolume) -> None:
         self._volume_queue.append(volume)
         volume.get(self.rom_reservoir, volume.size)
+        simulation.host_index.update(self)
         volume._host = self
         volume.state.append(Constants.SCHEDULED)
+        if simulation._container_scheduler is not None:
+            simulation._container_scheduler.release(volume)
         logger.info(
             f"{simulation.now}:\t{volume} is allocated to {self}, available ROM {self.rom_reservoir.utilization():.2f}%."
         )
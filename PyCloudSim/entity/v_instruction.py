@@ -1,71 +1,113 @@
 from __future__ import annotations
 
-from random import randbytes, randint
-from typing import TYPE_CHECKING, Callable, List
+from random import getrandbits
 
-from Akatosh import Entity
-from Akatosh.entity import Entity
-
-from PyCloudSim import logger, simulation
+import numpy as np
 
 from .constants import Constants
 
-if TYPE_CHECKING:
-    from .v_process import vProcess, vContainerProcess, vDeamon, vDecoder
-
 
-class vInstruction(Entity):
-    """Base for simulated instructions."""
+class vInstructionSet:
+    """Compact storage for the simulated instructions of a process."""
 
-    def __init__(
-        self,
-        process: vProcess | vContainerProcess | vDeamon | vDecoder,
-        create_at: int | float | Callable[..., int] | Callable[..., float] | None,
-    ) -> None:
-        """Create a simulated instruction. It will be consumed by the simulated CPU core. Once all simulated instruction of a process is consumed, the process is considered to be successfully executed."""
-        super().__init__(f"{process.label}-{len(process.instructions)}", create_at)
-        self._process = process
-        self._instruction = bytes()
+    def __init__(self, length: int, architecture: str, deamon: bool = False) -> None:
+        """Create the instruction set of a process. Each instruction is a random number of bytes, the same as a real instruction of the architecture, and occupies 100000 times its size of RAM while it is being executed. Only the cumulative sizes are stored, the instructions are handed to the CPU cores as ranges through the scheduled and retired cursors.
 
-    def __str__(self) -> str:
-        return f"{self.__class__.__name__}-{self.label}"
+        Args:
+            length (int): the number of instructions.
+            architecture (str): the architecture of the host that executes the instructions.
+            deamon (bool, optional): true if the instructions are executed repeatedly. Defaults to False.
+        """
+        if architecture == Constants.X86:
+            rng = np.random.default_rng(getrandbits(64))
+            sizes = rng.integers(1, 17, size=length, dtype=np.int64)
+        elif architecture == Constants.ARM:
+            sizes = np.full(length, 4, dtype=np.int64)
+        else:
+            raise RuntimeError(f"{architecture} is an unknown architecture")
+        self._offsets = np.zeros(length + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self._offsets[1:])
+        self._length = length
+        self._deamon = deamon
+        self._scheduled = 0
+        self._retired = 0
+        self._in_flight_size = 0
 
-    def on_creation(self):
-        """Populate the instruction with random bytes to simulate RAM usage."""
-        if self.process.host is None:
-            raise RuntimeError(f"{self} is not associated a host")
+    def __len__(self) -> int:
+        return self._length
 
-        if self.process.host.architecture == Constants.X86:
-            self._instruction = randbytes(randint(1, 16))
-        elif self.process.host.architecture == Constants.ARM:
-            self._instruction = randbytes(4)
+    def size(self, start: int, count: int) -> int:
+        """Return the RAM occupied by count instructions from the start index. The indexes of a deamon wrap around."""
+        if count <= 0 or self._length == 0:
+            return 0
+        total = self._offsets[-1]
+        start %= self._length
+        cycles, count = divmod(count, self._length)
+        end = start + count
+        if end <= self._length:
+            size = cycles * total + self._offsets[end] - self._offsets[start]
         else:
-            raise RuntimeError(f"{self.process.host} has an unknown architecture")
-        self.process.instructions.append(self)
-        self.process.unscheduled_instructions.append(self)
-
-    def on_termination(self):
-        """Terminate the simulated instruction. Called when the instruction is consumed by the CPU core."""
-        # clear out the resource usage
-        if self.process.container is not None:
-            if self.process.container.host is not None:
-                self.process.container._cpu_usage -= (1 * 1000) / (
-                    self.process.container.host.cpu.ipc
-                    * self.process.container.host.cpu.frequency
-                )
-                self.process.container._ram_usage -= self.length
+            size = (
+                (cycles + 1) * total
+                - self._offsets[start]
+                + self._offsets[end - self._length]
+            )
+        return int(size) * 100000
+
+    def schedule(self, count: int) -> int:
+        """Hand the next count instructions to a CPU core and return the index of the first one."""
+        if count > self.unscheduled:
+            raise ValueError(f"Only {self.unscheduled} instructions can be scheduled.")
+        start = self._scheduled
+        self._scheduled += count
+        self._in_flight_size += self.size(start, count)
+        return start
+
+    def retire(self, start: int, count: int) -> None:
+        """Retire count executed instructions from the start index."""
+        if count > self.in_flight:
+            raise ValueError(f"Only {self.in_flight} instructions are in execution.")
+        self._retired += count
+        self._in_flight_size -= self.size(start, count)
+
+    def discard(self) -> None:
+        """Discard the instructions in execution, they are neither retired nor rescheduled."""
+        self._scheduled = self._retired
+        self._in_flight_size = 0
 
     @property
-    def process(self):
-        """Return the process that this instruction belongs to."""
-        return self._process
+    def length(self) -> int:
+        """The number of instructions"""
+        return self._length
 
     @property
-    def instruction(self) -> bytes:
-        """The instruction"""
-        return self._instruction
+    def deamon(self) -> bool:
+        """True if the instructions are executed repeatedly"""
+        return self._deamon
 
     @property
-    def length(self) -> int:
-        """The length of the instruction"""
-        return len(self.instruction) * 100000
+    def scheduled(self) -> int:
+        """The number of instructions handed to the CPU cores"""
+        return self._scheduled
+
+    @property
+    def retired(self) -> int:
+        """The number of executed instructions"""
+        return self._retired
+
+    @property
+    def in_flight(self) -> int:
+        """The number of instructions cached by the CPU cores"""
+        return self._scheduled - self._retired
+
+    @property
+    def in_flight_size(self) -> int:
+        """The RAM occupied by the instructions cached by the CPU cores"""
+        return self._in_flight_size
+
+    @property
+    def unscheduled(self) -> int:
+        """The number of instructions that has not been scheduled, a deamon reschedules its executed instructions"""
+        if self.deamon:
+            return self._length - self.in_flight
+        return self._length - self._scheduled
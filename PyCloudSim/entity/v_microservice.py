@@ -8,7 +8,7 @@ from typing import Callable, List, Tuple
 from Akatosh import Entity, EntityList
 from networkx import volume
 
-from PyCloudSim import logger, simulation
+from PyCloudSim import Trigger, logger, simulation
 from PyCloudSim.entity.constants import Constants
 
 from .v_container import vContainer
@@ -97,8 +97,13 @@ class vMicroservice(vSoftwareEntity, ABC):
         | Callable[..., float]
         | None = None,
         precursor: Entity | List[Entity] | None = None,
+        evaluation_interval: int
+        | float
+        | Callable[..., int]
+        | Callable[..., float]
+        | None = None,
     ) -> None:
-        """Base for simulated microservices. It includes the horizontal scaling functionality."""
+        """Base for simulated microservices. It includes the horizontal scaling functionality. The scaling is evaluated whenever a container instance changes, and every evaluation interval if it is given, since the utilization the scaling depends on changes without the containers changing."""
         super().__init__(label, create_at, terminate_at, precursor)
 
         self._cpu = cpu
@@ -123,22 +128,28 @@ class vMicroservice(vSoftwareEntity, ABC):
 
         self._containers: List[vContainer] = EntityList(label=f"{self} Containers")
 
+        if callable(evaluation_interval):
+            self._evaluation_interval = evaluation_interval()
+        else:
+            self._evaluation_interval = evaluation_interval
+
         self._loadbalancer = loadbalancer
+        self._trigger = Trigger(self, self.evaluate, label=f"{self} Evaluator")
 
         for _ in range(self._min_num_instances):
-            self.containers.append(
-                vContainer(
-                    self.cpu,
-                    self.ram,
-                    self.image_size,
-                    self.cpu_limit,
-                    self.ram_limit,
-                    self.volume_descriptions,
-                    self.priority,
-                    self.deamon,
-                    label=f"{self.label}-{len(self._containers)}",
-                )
+            container = vContainer(
+                self.cpu,
+                self.ram,
+                self.image_size,
+                self.cpu_limit,
+                self.ram_limit,
+                self.volume_descriptions,
+                self.priority,
+                self.deamon,
+                label=f"{self.label}-{len(self._containers)}",
             )
+            container.add_observer(self.trigger)
+            self.containers.append(container)
 
     def horizontal_scale_up(self, num_instances: int, at: int | float):
         """Horizontal scale up the microservice by adding new container instances."""
@@ -151,20 +162,20 @@ class vMicroservice(vSoftwareEntity, ABC):
         @self.instant_event(at, label=f"{self} Horizontal Scale Up", priority=-1)
         def _scale_up():
             for _ in range(num_instances):
-                self.containers.append(
-                    vContainer(
-                        self.cpu,
-                        self.ram,
-                        self.image_size,
-                        self.cpu_limit,
-                        self.ram_limit,
-                        self.volume_descriptions,
-                        self.priority,
-                        self.deamon,
-                        label=f"{self.label}-{len(self._containers)}",
-                        create_at=simulation.now,
-                    )
+                container = vContainer(
+                    self.cpu,
+                    self.ram,
+                    self.image_size,
+                    self.cpu_limit,
+                    self.ram_limit,
+                    self.volume_descriptions,
+                    self.priority,
+                    self.deamon,
+                    label=f"{self.label}-{len(self._containers)}",
+                    create_at=simulation.now,
                 )
+                container.add_observer(self.trigger)
+                self.containers.append(container)
             self._scaling = False
 
     def horizontal_scale_down(self, num_instances: int, at: int | float):
@@ -234,20 +245,20 @@ class vMicroservice(vSoftwareEntity, ABC):
                 container.terminate(simulation.now)
             # create new instances
             for _ in range(number_instance):
-                self.containers.append(
-                    vContainer(
-                        self.cpu,
-                        self.ram,
-                        self.image_size,
-                        self.cpu_limit,
-                        self.ram_limit,
-                        self.volume_descriptions,
-                        self.priority,
-                        self.deamon,
-                        label=f"{self.label}-{len(self._containers)}",
-                        create_at=simulation.now,
-                    )
+                container = vContainer(
+                    self.cpu,
+                    self.ram,
+                    self.image_size,
+                    self.cpu_limit,
+                    self.ram_limit,
+                    self.volume_descriptions,
+                    self.priority,
+                    self.deamon,
+                    label=f"{self.label}-{len(self._containers)}",
+                    create_at=simulation.now,
                 )
+                container.add_observer(self.trigger)
+                self.containers.append(container)
 
     @abstractmethod
     def horizontal_scale_up_triggered(self) -> bool:
@@ -268,63 +279,77 @@ class vMicroservice(vSoftwareEntity, ABC):
         for container in self._containers:
             container.create(simulation.now)
 
-        @self.continuous_event(
-            at=simulation.now,
-            interval=simulation.min_time_unit,
-            duration=inf,
-            label=f"{self} Evaluator",
-        )
-        def _evaluator():
-            initiated_containers = [
-                container for container in self._containers if container.initiated
-            ]
-            # check if the microservice is ready
-            if len(initiated_containers) < self.min_num_instances:
-                if self.ready:
-                    self.state.remove(Constants.READY)
-                    for _ in range(self.min_num_instances - len(initiated_containers)):
-                        self.containers.append(
-                            vContainer(
-                                self.cpu,
-                                self.ram,
-                                self.image_size,
-                                self.cpu_limit,
-                                self.ram_limit,
-                                self.volume_descriptions,
-                                self.priority,
-                                self.deamon,
-                                label=f"{self.label}-{len(self._containers)}",
-                                create_at=simulation.now,
-                            )
-                        )
-                    logger.info(f"{simulation.now}:\t{self} is not ready, recreating {self.min_num_instances - len(initiated_containers)} container instances")
-                return
-            else:
-                if not self.ready:
-                    self.state.append(Constants.READY)
-                    logger.info(f"{simulation.now}:\t{self} is ready")
+        self.trigger.notify()
 
-            # check if any container instance is pending:
-            if len(initiated_containers) != len(self.containers):
-                # if any instance is pending, skip the scaling evaluation
-                return
+        if self.evaluation_interval is not None:
+
+            @self.continuous_event(
+                at=simulation.now,
+                interval=self.evaluation_interval,
+                duration=inf,
+                label=f"{self} Periodic Evaluation",
+            )
+            def _evaluate():
+                self.trigger.notify()
+
+    def evaluate(self):
+        """Evaluate the readiness and the scaling of the microservice, woken up whenever one of its container instances changes and every evaluation interval."""
+        initiated_containers = [
+            container for container in self._containers if container.initiated
+        ]
+        # check if the microservice is ready
+        if len(initiated_containers) < self.min_num_instances:
+            if self.ready:
+                self.state.remove(Constants.READY)
+                for _ in range(self.min_num_instances - len(initiated_containers)):
+                    container = vContainer(
+                        self.cpu,
+                        self.ram,
+                        self.image_size,
+                        self.cpu_limit,
+                        self.ram_limit,
+                        self.volume_descriptions,
+                        self.priority,
+                        self.deamon,
+                        label=f"{self.label}-{len(self._containers)}",
+                        create_at=simulation.now,
+                    )
+                    container.add_observer(self.trigger)
+                    self.containers.append(container)
+                logger.info(f"{simulation.now}:\t{self} is not ready, recreating {self.min_num_instances - len(initiated_containers)} container instances")
+            return
+        else:
+            if not self.ready:
+                self.state.append(Constants.READY)
+                simulation.api_call_scheduler.release(self)
+                logger.info(f"{simulation.now}:\t{self} is ready")
+
+        # check if any container instance is pending:
+        if len(initiated_containers) != len(self.containers):
+            # if any instance is pending, skip the scaling evaluation
+            return
 
-            # check if the microservice should be scaled up
-            if len(self.containers) < self.max_num_instances:
-                if self.horizontal_scale_up_triggered():
-                    self.horizontal_scale_up(1, simulation.now)
-                    return
+        # check if the microservice should be scaled up
+        if len(self.containers) < self.max_num_instances:
+            if self.horizontal_scale_up_triggered():
+                self.horizontal_scale_up(1, simulation.now)
+                return
 
-            # check if the microservice should be scaled down
-            if len(self.containers) > self.min_num_instances:
-                if self.horizontal_scale_down_triggered():
-                    self.horizontal_scale_down(1, simulation.now)
-                    return
+        # check if the microservice should be scaled down
+        if len(self.containers) > self.min_num_instances:
+            if self.horizontal_scale_down_triggered():
+                self.horizontal_scale_down(1, simulation.now)
+                return
 
     def on_termination(self):
         for container in self._containers:
             container.terminate(simulation.now)
 
+    @property
+    def trigger(self):
+        """Return the trigger that wakes up the evaluator."""
+        return self._trigger
+
     @property
     def cpu(self):
         """Return the required CPU time for each container instance."""
@@ -423,6 +448,11 @@ class vMicroservice(vSoftwareEntity, ABC):
         """Return true if the microservice is ready."""
         return Constants.READY in self.state
 
+    @property
+    def evaluation_interval(self):
+        """Return the interval between the periodic evaluations of the scaling, None if the scaling is only evaluated when a container instance changes."""
+        return self._evaluation_interval
+
     @property
     def loadbalancer(self):
         """Return the loadbalancer of the microservice."""
@@ -486,6 +516,7 @@ class vDefaultMicroservice(vMicroservice):
             create_at,
             terminate_at,
             precursor,
+            evaluation_interval,
         )
 
         if callable(cpu_upper_threshold):
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+from heapq import heappop, heappush
 from ipaddress import IPv4Address
+from itertools import count
 from math import inf
-from typing import TYPE_CHECKING, Callable, List
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
 
 from Akatosh import Entity
 from Akatosh.entity import Entity, EntityList, Resource
 from bitmath import MiB
 
-from PyCloudSim import logger, simulation
+from PyCloudSim import TrackedResource, Trigger, logger, simulation
 
 from .constants import Constants
 from .v_hardware_component import vHardwareComponent
@@ -44,11 +46,11 @@ class vPort(vHardwareComponent):
         self._nic = nic
         self._endpoint = endpoint
         if callable(bandwidth):
-            self._bandwidth = Resource(
+            self._bandwidth = TrackedResource(
                 capacity=MiB(bandwidth()).bytes, label=f"{self} Bandwidth"
             )
         else:
-            self._bandwidth = Resource(
+            self._bandwidth = TrackedResource(
                 capacity=MiB(bandwidth).bytes, label=f"{self} Bandwidth"
             )
         self._ip_address = ip_address
@@ -59,6 +61,20 @@ class vPort(vHardwareComponent):
     def on_power_off(self) -> None:
         super().on_power_off()
 
+    def on_termination(self) -> None:
+        super().on_termination()
+        # the port no longer feeds its endpoint
+        self.endpoint.NIC._ingress_ports.pop(self, None)
+        # the terminated port is already removed from the ports of the NIC
+        if self.nic.port_to(self.endpoint) is self:
+            del self.nic._port_index[self.endpoint]
+            for port in self.nic.ports:
+                if port.endpoint is self.endpoint:
+                    self.nic._port_index[self.endpoint] = port
+                    break
+        # route the packets waiting on the port again
+        self.nic.trigger.notify()
+
     def transmit(self, packet: vPacket, transmission_time: int | float):
         """Transmit a packet to the next hop."""
         packet.get(self.bandwidth, packet.size)
@@ -73,6 +89,9 @@ class vPort(vHardwareComponent):
         def _transmit():
             packet.put(self.bandwidth, packet.size)
             self.nic.packet_queue.remove(packet)
+            self.nic._in_flight_packets.pop(packet, None)
+            self.nic.trigger.notify()
+            simulation.flow_model.notify(self)
             logger.debug(
                 f"{simulation.now}:\t{packet} returns bandwidth {packet.size}/{self.bandwidth.amount}/{self.bandwidth.capacity} from {self}"
             )
@@ -91,6 +110,9 @@ class vPort(vHardwareComponent):
         def _receive():
             packet.put(self.bandwidth, packet.size)
             self.host.receive_packet(packet)
+            # the returned bandwidth is used by the NIC on the other end of the link
+            self.endpoint.NIC.trigger.notify()
+            simulation.flow_model.notify(self)
             logger.debug(
                 f"{simulation.now}:\t{packet} returns bandwidth {packet.size}/{self.bandwidth.amount}/{self.bandwidth.capacity} from {self}"
             )
@@ -116,7 +138,7 @@ class vPort(vHardwareComponent):
         return self._ip_address
 
     @property
-    def bandwidth(self) -> Resource:
+    def bandwidth(self) -> TrackedResource:
         """Return the bandwidth of this port."""
         return self._bandwidth
 
@@ -150,7 +172,22 @@ class vNIC(vHardwareComponent):
         super().__init__(label, create_at, terminate_at, precursor)
         self._host = host
         self._ports: List[vPort] = EntityList(label=f"{self} Ports")
+        self._port_index: Dict[vHardwareEntity | vGateway, vPort] = dict()
+        # ports that transmit to this NIC, including its loopback port, dicts are used as ordered sets
+        self._ingress_ports: Dict[vPort, None] = dict()
+        self._egress_listeners: List[Callable[[int | float, int | float, int | float], None]] = list()
+        self._ingress_listeners: List[Callable[[int | float, int | float, int | float], None]] = list()
         self._packet_queue: List[vPacket] = EntityList(label=f"{self} Packet Queue")
+        # decoded packets waiting for bandwidth, a heap per egress port in the order of priority then arrival
+        self._ready_packets: Dict[vPort, List[Tuple[int, int, vPacket]]] = dict()
+        self._in_flight_packets: Dict[vPacket, None] = dict()
+        self._sequence = count()
+        self._trigger = Trigger(
+            self,
+            self._schedule_packets,
+            label=f"{self} Transmit Packets",
+            enabled=False,
+        )
 
     def on_power_on(self) -> None:
         """Power on the simulated NIC."""
@@ -158,79 +195,90 @@ class vNIC(vHardwareComponent):
         for port in self.ports:
             port.power_on(simulation.now)
 
-        @self.continuous_event(
-            at=simulation.now,
-            interval=simulation.min_time_unit,
-            duration=inf,
-            label=f"{self} Transmit Packets",
-        )
-        def _schedule_packets():
-            """A continous event to schedule packets in the queue."""
-            self.packet_queue.sort(key=lambda packet: packet.priority)
-            for packet in self.packet_queue:
-                # check if packet is decoded
-                if packet.decoded and not packet.in_transmission:
-                    logger.debug(f"{simulation.now}:\t{self} is scheduling {packet}.")
-                    # find the port to transmit the packet to the next hop
-                    try:
-                        src_port = [
-                            port
-                            for port in self.ports
-                            if port.endpoint is packet.next_hop
-                        ][0]
-                    except:
-                        raise RuntimeError(
-                            f"Can not find a port on {packet.path[0]} to transmit {packet}."
-                        )
-                    # find the port to receive the packet on the next hop
-                    try:
-                        dst_port = [
-                            port
-                            for port in packet.next_hop.NIC.ports
-                            if port.endpoint is packet.current_hop
-                        ][0]
-                    except:
-                        raise RuntimeError(
-                            f"Can not find a port on {packet.path[1]} to receive {packet}."
-                        )
-                    logger.debug(
-                        f"{simulation.now}:\t{self} found src port {src_port} and dst port {dst_port} for {packet}"
-                    )
-                    # calculate the available bandwidth and transmission time
-                    available_bandwidth = min(
-                        src_port.bandwidth.amount, dst_port.bandwidth.amount
-                    )
-                    logger.debug(
-                        f"{simulation.now}:\t{self} found available bandwidth {available_bandwidth} for {packet}"
+        self.trigger.enable()
+        self.trigger.notify()
+
+    def _schedule_packets(self):
+        """Transmit the packets at the head of each egress port while the link has bandwidth for them, woken up whenever a packet is ready or bandwidth is returned."""
+        for src_port in list(self._ready_packets):
+            ready_packets = self._ready_packets[src_port]
+            # the link is removed, route the packets again
+            if src_port.terminated or src_port.destroied:
+                del self._ready_packets[src_port]
+                for _, _, packet in ready_packets:
+                    if packet.terminated or packet.destroied:
+                        continue
+                    packet._next_hop = simulation.network.next_hop(self.host, packet.dst_host)  # type: ignore
+                    if packet.next_hop is None:
+                        packet.drop()
+                        continue
+                    self.enqueue(packet)
+                continue
+            while len(ready_packets) > 0:
+                packet = ready_packets[0][2]
+                # skip packets that are dropped in the meantime
+                if packet.terminated or packet.destroied:
+                    heappop(ready_packets)
+                    continue
+                logger.debug(f"{simulation.now}:\t{self} is scheduling {packet}.")
+                # find the port to receive the packet on the next hop
+                dst_port = packet.next_hop.NIC.port_to(packet.current_hop)
+                if dst_port is None:
+                    raise RuntimeError(
+                        f"Can not find a port on {packet.next_hop} to receive {packet}."
                     )
-                    # check if the packet can be transmitted
-                    if available_bandwidth > packet.size:
-                        packet.state.append(Constants.INTRANSMISSION)
-                        link_speed = min(
-                            src_port.bandwidth.capacity, dst_port.bandwidth.capacity
-                        )
-                        # calculate the transmission time
-                        transmission_time = packet.size / link_speed
-
-                        # packet consumes the bandwidth of the src port and returns the bandwidth in future
-                        src_port.transmit(packet, transmission_time)
-
-                        # packet consumes the bandwidth of the dst port and returns the bandwidth in future
-                        dst_port.receive(packet, transmission_time)
-
-                        logger.info(
-                            f"{simulation.now}:\t{packet} in transmission from {src_port.host} to {dst_port.host}"
-                        )
-                else:
-                    # pass packets that have not been decoded
-                    pass
+                logger.debug(
+                    f"{simulation.now}:\t{self} found src port {src_port} and dst port {dst_port} for {packet}"
+                )
+                # calculate the available bandwidth and transmission time
+                available_bandwidth = min(
+                    src_port.bandwidth.amount, dst_port.bandwidth.amount
+                )
+                logger.debug(
+                    f"{simulation.now}:\t{self} found available bandwidth {available_bandwidth} for {packet}"
+                )
+                # the packets behind wait until the head of the port can be transmitted
+                if available_bandwidth <= packet.size:
+                    break
+                heappop(ready_packets)
+                packet.state.append(Constants.INTRANSMISSION)
+                self._in_flight_packets[packet] = None
+                link_speed = min(
+                    src_port.bandwidth.capacity, dst_port.bandwidth.capacity
+                )
+                # calculate the transmission time, the packets of a train are sent back to back
+                transmission_time = packet.total_size / link_speed
+
+                # packet consumes the bandwidth of the src port and returns the bandwidth in future
+                src_port.transmit(packet, transmission_time)
+
+                # packet consumes the bandwidth of the dst port and returns the bandwidth in future
+                dst_port.receive(packet, transmission_time)
+
+                logger.info(
+                    f"{simulation.now}:\t{packet} in transmission from {src_port.host} to {dst_port.host}"
+                )
+            if len(ready_packets) == 0:
+                del self._ready_packets[src_port]
+
+    def enqueue(self, packet: vPacket) -> None:
+        """Queue a packet in the packet queue on the port to its next hop, called when the packet is decoded."""
+        # find the port to transmit the packet to the next hop
+        src_port = self.port_to(packet.next_hop)
+        if src_port is None:
+            raise RuntimeError(
+                f"Can not find a port on {packet.current_hop} to transmit {packet}."
+            )
+        heappush(
+            self._ready_packets.setdefault(src_port, list()),
+            (packet.priority, next(self._sequence), packet),
+        )
+        self.trigger.notify()
 
     def on_power_off(self) -> None:
         """Power off the simulated NIC."""
         super().on_power_off()
-        for event in self.events:
-            if event.label == f"{self} Transmit Packets":
-                event.cancel()
+        self.trigger.disable()
 
     def add_port(
         self,
@@ -252,6 +300,28 @@ class vNIC(vHardwareComponent):
                 create_at=simulation.now,
             )
             self.ports.append(port)
+            self._port_index.setdefault(endpoint, port)
+            endpoint.NIC._ingress_ports[port] = None
+            for listener in self._egress_listeners:
+                port.bandwidth.add_listener(listener)
+            for listener in endpoint.NIC._ingress_listeners:
+                port.bandwidth.add_listener(listener)
+
+    def add_egress_listener(
+        self, listener: Callable[[int | float, int | float, int | float], None]
+    ) -> None:
+        """Report the changes of the bandwidth used on the ports of this NIC to the listener, including the ports added later."""
+        self._egress_listeners.append(listener)
+        for port in self.ports:
+            port.bandwidth.add_listener(listener)
+
+    def add_ingress_listener(
+        self, listener: Callable[[int | float, int | float, int | float], None]
+    ) -> None:
+        """Report the changes of the bandwidth used on the ports that transmit to this NIC to the listener, including the ports added later."""
+        self._ingress_listeners.append(listener)
+        for port in self._ingress_ports:
+            port.bandwidth.add_listener(listener)
 
     def remove_port(self, endpoint: vHardwareEntity, at: int | float):
         """Remove a port from this virtual NIC."""
@@ -267,16 +337,47 @@ class vNIC(vHardwareComponent):
         """Return the host of this NIC."""
         return self._host
 
+    def port_to(self, endpoint: vHardwareEntity | vGateway) -> vPort | None:
+        """Return the port connected to the endpoint, None if there is no such port."""
+        return self._port_index.get(endpoint)
+
     @property
     def ports(self):
         """Return the ports of this NIC."""
         return self._ports
 
+    @property
+    def ingress_ports(self) -> List[vPort]:
+        """Return the ports that transmit to this NIC, including its loopback port."""
+        return list(self._ingress_ports)
+
     @property
     def packet_queue(self):
         """Return the packet queue of this NIC."""
         return self._packet_queue
 
+    @property
+    def ready_packets(self) -> List[vPacket]:
+        """Return the packets that are ready to be transmitted, in the order of priority."""
+        return [
+            entry[2]
+            for entry in sorted(
+                entry
+                for ready_packets in self._ready_packets.values()
+                for entry in ready_packets
+            )
+        ]
+
+    @property
+    def in_flight_packets(self) -> List[vPacket]:
+        """Return the packets that are being transmitted."""
+        return list(self._in_flight_packets)
+
+    @property
+    def trigger(self):
+        """Return the trigger that wakes up the packet scheduling."""
+        return self._trigger
+
     def egress_usage(self, duration: int | float | None = None):
         """Return the egress bandwidth usage of this NIC."""
         return sum([port.usage(duration) for port in self.ports])
@@ -288,25 +389,13 @@ class vNIC(vHardwareComponent):
         )
 
     def ingress_usage(self, duration: int | float | None = None):
-        """Return the ingress bandwidth usage of this NIC."""
-        connected_nodes = [
-            port.endpoint for port in self.ports
-        ]
-        ingress_usage = 0
-        for node in connected_nodes:
-            for port in node.NIC.ports:
-                if port.endpoint is self.host:
-                    ingress_usage += port.usage(duration)
-        return ingress_usage
+        """Return the ingress bandwidth usage of this NIC, the usage of the ports that transmit to it."""
+        return sum([port.usage(duration) for port in self._ingress_ports])
     
     def ingress_utilization(self, duration: int | float | None = None):
-        """Return the ingress bandwidth utilization of this NIC."""
-        connected_nodes = [
-            port.endpoint for port in self.ports
-        ]
-        ingress_utilization = 0
-        for node in connected_nodes:
-            for port in node.NIC.ports:
-                if port.endpoint is self.host:
-                    ingress_utilization += port.utilization(duration)
-        return ingress_utilization / len(connected_nodes)
\ No newline at end of file
+        """Return the ingress bandwidth utilization of this NIC, the average utilization of the ports that transmit to it."""
+        if len(self._ingress_ports) == 0:
+            return 0
+        return sum(
+            [port.utilization(duration) for port in self._ingress_ports]
+        ) / len(self._ingress_ports)
\ No newline at end of file
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from random import randbytes
 from typing import TYPE_CHECKING, Callable, List
 
 from Akatosh import Entity
@@ -36,8 +35,9 @@ class vPacket(vSoftwareEntity):
         | Callable[..., float]
         | None = None,
         precursor: Entity | List[Entity] | None = None,
+        count: int | Callable[..., int] = 1,
     ) -> None:
-        """Create a simulated packet."""
+        """Create a simulated packet. A packet with a count greater than one is a packet train, back-to-back packets of the same size that are buffered, transmitted and decoded as a unit."""
         super().__init__(label, create_at, terminate_at, precursor)
         self._src = src
         self._src_host = src.host
@@ -51,8 +51,11 @@ class vPacket(vSoftwareEntity):
             self._priority = priority()
         else:
             self._priority = priority
-        self._content = bytes()
-        self._path: List[vHardwareEntity | vGateway] = []
+        if callable(count):
+            self._count = round(count())
+        else:
+            self._count = count
+        self._content: bytes | memoryview = bytes()
         self._current_hop: vHardwareEntity | vGateway = None  # type: ignore
         self._next_hop: vHardwareEntity | vGateway = None  # type: ignore
 
@@ -65,23 +68,26 @@ class vPacket(vSoftwareEntity):
     def on_initiate(self) -> None:
         """The initiation procedure of the simulated packet."""
         super().on_initiate()
-        # generate the random bytes content
-        self._content = randbytes(self.size)
-        # find the shortest path from src to dst
-        self._path = simulation.network.route(self.src_host, self.dst_host)  # type: ignore
-        if len(self.path) == 1:
-            self._path = [self.path[0], self.path[0]]
-        self._current_hop = self.path[0]
-        self._next_hop = self.path[1]
+        # only refer to the shared payload buffer if the content is needed
+        if simulation.packet_payload:
+            self._content = simulation.payload(self.total_size)
+        # find the first hop towards dst
+        self._current_hop = self.src_host
+        self._next_hop = simulation.network.next_hop(self.src_host, self.dst_host)  # type: ignore
+        if self.next_hop is None:
+            # drop the packet if its dst can not be reached
+            self.drop()
+            return
         # inject the packet to its src
         try:
-            self.get(self.src_host.ram, self.size)
+            self.get(self.src_host.ram, self.total_size)
         except:
             # drop the packet if its src does not have enough ram
             self.drop()
             return
         self.state.append(Constants.DECODED)
         self.src_host.packet_queue.append(self)
+        self.src_host.NIC.enqueue(self)
         logger.info(f"{simulation.now}:\t{self} is initiated.")
 
     def on_termination(self):
@@ -118,19 +124,24 @@ class vPacket(vSoftwareEntity):
         """return the destination host of the packet, could be a simulated host or gateway."""
         return self._dst_host
 
-    @property
-    def path(self):
-        """return the path of the packet."""
-        return self._path
-
     @property
     def size(self) -> int:
         """return the size of the packet."""
         return self._size
 
     @property
-    def content(self) -> bytes:
-        """return the content of the packet."""
+    def count(self) -> int:
+        """return the number of packets in the packet train, one for a single packet."""
+        return self._count
+
+    @property
+    def total_size(self) -> int:
+        """return the size of all the packets in the packet train."""
+        return self._size * self._count
+
+    @property
+    def content(self) -> bytes | memoryview:
+        """return the content of the packet, empty unless packet payload is enabled for the simulation."""
         return self._content
 
     @property
@@ -8,7 +8,7 @@ from Akatosh import Entity, EntityList
 from PyCloudSim import logger, simulation
 
 from .constants import Constants
-from .v_instruction import vInstruction
+from .v_instruction import vInstructionSet
 from .v_sofware_entity import vSoftwareEntity
 
 if TYPE_CHECKING:
@@ -58,32 +58,29 @@ class vProcess(vSoftwareEntity):
         else:
             self._priority = priority
 
-        self._instructions: List[vInstruction] = list()
-        self._unscheduled_instructions: List[vInstruction] = EntityList(
-            label=f"{self} Unscheduled Instructions"
-        )
+        self._instructions: vInstructionSet | None = None
+        self._remaining_instructions = self._length
 
     def on_initiate(self):
         """Initiation procedure of the simulated process."""
         # initial instructions
         super().on_initiate()
-        for i in range(self.length):
-            vInstruction(
-                process=self,
-                create_at=simulation.now,
-            )
-
-        @self.continuous_event(
-            at=simulation.now,
-            interval=simulation.min_time_unit,
-            duration=inf,
-            label=f"{self.label} Monitor",
+        if self.host is None:
+            raise RuntimeError(f"{self} is not associated a host")
+        self._instructions = vInstructionSet(
+            self.length, self.host.architecture, self.deamon
         )
-        def monitoring():
-            if not self.deamon:
-                if all([i.terminated for i in self.instructions]):
-                    self.success(simulation.now)
-                    return
+        if not self.deamon and self.remaining_instructions == 0:
+            self.success(simulation.now)
+
+    def retire_instructions(self, start: int, count: int):
+        """Retire the executed instructions, the process succeeds once all of its instructions are retired."""
+        self.instructions.retire(start, count)
+        if self.deamon:
+            return
+        self._remaining_instructions -= count
+        if self.remaining_instructions == 0:
+            self.success(simulation.now)
 
     def on_creation(self):
         """Creation procedure of the simulated process."""
@@ -94,15 +91,30 @@ class vProcess(vSoftwareEntity):
     def on_termination(self):
         """Termination procedure of the simulated process."""
         super().on_termination()
-        for instruction in self.instructions:
-            instruction.terminate(at=simulation.now)
+        self._release_instructions()
         logger.info(f"{simulation.now}:\t{self} is terminated.")
 
     def on_destruction(self):
         """The destruction procedure of the simulated process."""
         super().on_destruction()
-        for instruction in self.instructions:
-            instruction.terminate(at=simulation.now)
+        self._release_instructions()
+
+    def _release_instructions(self):
+        """Remove the instructions in execution from the CPU cores and clear out their usage of the container. The resources held by the process are released by its termination."""
+        if self.instructions is None or self.instructions.in_flight == 0:
+            return
+        cpu = self.host.cpu
+        for core in cpu.cores:
+            core.evict(self)
+        if self.container is not None:
+            self.container._cpu_usage -= (self.instructions.in_flight * 1000) / (
+                cpu.ipc * cpu.frequency
+            )
+            self.container._ram_usage -= self.instructions.in_flight_size
+            self.container.notify_observers()
+        self.instructions.discard()
+        # the cores and the container have capacity for other processes
+        cpu.trigger.notify()
 
     def on_success(self) -> None:
         super().on_success()
@@ -124,13 +136,13 @@ class vProcess(vSoftwareEntity):
 
     @property
     def instructions(self):
-        """The instructions of the process"""
+        """The instructions of the process, generated when the process is initiated"""
         return self._instructions
 
     @property
-    def unscheduled_instructions(self):
-        """The instructions of the process that has not been scheduled"""
-        return self._unscheduled_instructions
+    def remaining_instructions(self) -> int:
+        """The number of instructions of the process that has not been executed"""
+        return self._remaining_instructions
 
     @property
     def host(self):
@@ -179,6 +191,7 @@ class vContainerProcess(vProcess):
 
         self.container.process_queue.append(self)
         self.container.host.cpu.process_queue.append(self)
+        self.container.host.cpu.trigger.notify()
 
     @property
     def container(self):
@@ -221,6 +234,7 @@ class vDeamon(vProcess):
 
         self.container.process_queue.append(self)
         self.container.host.cpu.process_queue.append(self)
+        self.container.host.cpu.trigger.notify()
 
     def on_fail(self) -> None:
         super().on_fail()
@@ -272,6 +286,7 @@ class vDecoder(vProcess):
         if self.host is None:
             raise ValueError(f"{self} is not assigned to a host.")
         self.host.process_queue.append(self)
+        self.host.cpu.trigger.notify()
 
     def on_success(self):
         super().on_success()
@@ -279,6 +294,8 @@ class vDecoder(vProcess):
         logger.info(f"{simulation.now}:\t{self.packet} is decoded.")
         if self.packet.current_hop is self.packet.dst_host:
             self.packet.success(simulation.now)
+        else:
+            self.host.NIC.enqueue(self.packet)
 
     def on_fail(self) -> None:
         super().on_fail()
@@ -6,6 +6,7 @@ from typing import Any, Callable, List
 from Akatosh import Entity
 from Akatosh.entity import Entity
 
+from PyCloudSim import simulation
 from PyCloudSim.entity.constants import Constants
 
 from .constants import Constants
@@ -51,3 +52,8 @@ class vRouter(vHardwareEntity):
             terminate_at,
             precursor,
         )
+
+    @property
+    def forwarding_table(self):
+        """Returns the forwarding table of the vRouter, mapping a destination to the next hop."""
+        return simulation.network.forwarding_table(self)
@@ -1,10 +1,12 @@
+from __future__ import annotations
+
 import warnings
 from abc import ABC, abstractmethod
 from typing import Any, Callable, List
 
 from Akatosh import Entity
 
-from PyCloudSim import simulation
+from PyCloudSim import Trigger, simulation
 
 from .constants import Constants
 
@@ -32,6 +34,30 @@ class vSoftwareEntity(Entity, ABC):
         precursor: Entity | List[Entity] | None = None,
     ) -> None:
         super().__init__(label, create_at, terminate_at, precursor)
+        self._observers: List[Trigger] = list()
+        self._parent: vSoftwareEntity | None = None
+
+    def add_observer(self, trigger: Trigger) -> None:
+        """Notify the trigger whenever the software entity is initiated, succeeds or fails."""
+        if trigger not in self._observers:
+            self._observers.append(trigger)
+
+    def notify_observers(self) -> None:
+        """Notify all the observing triggers that the software entity has changed."""
+        for trigger in self._observers:
+            trigger.notify()
+
+    def add_child(self, child: vSoftwareEntity) -> None:
+        """Make this software entity the parent of the child, the parent is notified when the child succeeds or fails."""
+        child._parent = self
+
+    def on_child_success(self, child: vSoftwareEntity) -> None:
+        """Called when a child of the software entity is terminated successfully"""
+        pass
+
+    def on_child_fail(self, child: vSoftwareEntity) -> None:
+        """Called when a child of the software entity is terminated unsuccessfully"""
+        pass
 
     def success(self, at: int | float) -> None:
         """Terminate the process and call on_success()"""
@@ -56,6 +82,9 @@ class vSoftwareEntity(Entity, ABC):
             # If the process is already terminated successfully, do nothing
             self.on_success()
             self.state.append(Constants.SUCCESS)
+            self.notify_observers()
+            if self.parent is not None:
+                self.parent.on_child_success(self)
             self.terminate(simulation.now)
 
     def on_success(self) -> None:
@@ -88,6 +117,9 @@ class vSoftwareEntity(Entity, ABC):
             # If the process is already terminated successfully, do nothing
             self.on_fail()
             self.state.append(Constants.FAIL)
+            self.notify_observers()
+            if self.parent is not None:
+                self.parent.on_child_fail(self)
             self.destory(simulation.now)
 
     def on_fail(self) -> None:
@@ -111,6 +143,7 @@ class vSoftwareEntity(Entity, ABC):
                 return
             self.on_initiate()
             self.state.append(Constants.INITIATED)
+            self.notify_observers()
 
     def on_initiate(self) -> None:
         """Called when the software entity is initiated"""
@@ -122,6 +155,11 @@ class vSoftwareEntity(Entity, ABC):
     def __str__(self) -> str:
         return f"{self.__class__.__name__}-{self.label}"
 
+    @property
+    def parent(self) -> vSoftwareEntity | None:
+        """Return the parent of the software entity"""
+        return self._parent
+
     @property
     def succeed(self) -> bool:
         """Return true if the software entity is terminated successfully"""
@@ -6,6 +6,7 @@ from typing import Any, Callable, List
 from Akatosh import Entity
 from Akatosh.entity import Entity
 
+from PyCloudSim import simulation
 from PyCloudSim.entity.constants import Constants
 
 from .constants import Constants
@@ -63,3 +64,8 @@ class vSwitch(vHardwareEntity):
     def available_ip_addresses(self) -> list[IPv4Address]:
         """Returns a list of available IP addresses in the subnet."""
         return self._available_ip_addresses
+
+    @property
+    def forwarding_table(self):
+        """Returns the forwarding table of the vSwitch, mapping a destination to the next hop."""
+        return simulation.network.forwarding_table(self)
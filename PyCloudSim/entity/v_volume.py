@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, Any, Callable, List
 from Akatosh import Entity, Resource
 from bitmath import MiB
 
-from PyCloudSim import logger, simulation
+from PyCloudSim import TrackedResource, logger, simulation
 
 from .constants import Constants
 from .v_sofware_entity import vSoftwareEntity
@@ -35,9 +35,9 @@ class vVolume(vSoftwareEntity):
         super().__init__(label, create_at, terminate_at, precursor)
 
         if callable(size):
-            self._store = Resource(MiB(round(size())).bytes)
+            self._store = TrackedResource(MiB(round(size())).bytes)
         else:
-            self._store = Resource(MiB(size).bytes)
+            self._store = TrackedResource(MiB(size).bytes)
 
         self._path = path
 
@@ -46,9 +46,13 @@ class vVolume(vSoftwareEntity):
         simulation.volumes.append(self)
 
     def on_creation(self):
+        simulation.notify_schedulers()
         logger.info(f"{simulation.now}:\t{self} is created.")
 
     def on_termination(self):
+        if self._host is not None:
+            simulation.host_index.update(self._host)
+        simulation.notify_schedulers()
         logger.info(f"{simulation.now}:\t{self} is terminated.")
 
     @property
@@ -1,13 +1,154 @@
 from __future__ import annotations
 
+import os
 from abc import ABC, abstractmethod
 from math import inf
-from typing import Callable
+from typing import Any, Callable, Dict, List
 
+import numpy as np
+import pandas as pd
 from Akatosh import Entity
 
 from PyCloudSim import logger, simulation
 
+try:
+    import pyarrow  # noqa: F401
+
+    PARQUET = True
+except ImportError:
+    PARQUET = False
+
+
+class ColumnBuffer:
+    """Growable columns that the samples of a monitor are appended to. Numeric columns are NumPy arrays, the others hold objects. The dataframe is only built when it is requested. With a spill directory the rows are written out in chunks, so the memory stays bounded and the written chunks survive a crash."""
+
+    def __init__(
+        self,
+        columns: Dict[str, str],
+        capacity: int = 1024,
+        spill_to: str | None = None,
+        chunk_size: int = 10000,
+    ) -> None:
+        """Create the column buffer.
+
+        Args:
+            columns (Dict[str, str]): the names of the columns and their pandas dtypes, in order.
+            capacity (int, optional): the number of rows allocated up front. Defaults to 1024.
+            spill_to (str | None, optional): the directory the chunks are written to, as Parquet files if pyarrow is installed, otherwise as CSV files. Defaults to None, all the rows are kept in memory.
+            chunk_size (int, optional): the number of rows in each chunk written to the spill directory. Defaults to 10000.
+        """
+        self._spill_to = spill_to
+        self._chunk_size = chunk_size
+        self._chunks: List[str] = list()
+        if spill_to is not None:
+            os.makedirs(spill_to, exist_ok=True)
+            capacity = chunk_size
+        self._dtypes = columns
+        self._columns = {
+            name: np.empty(capacity, dtype=self._storage_dtype(dtype))
+            for name, dtype in columns.items()
+        }
+        self._length = 0
+        self._capacity = capacity
+        self._dataframe: pd.DataFrame | None = None
+
+    @staticmethod
+    def _storage_dtype(dtype: str):
+        """Store the numeric columns in typed arrays, the rest as objects which are converted when the dataframe is built."""
+        if dtype in ("float", "float64"):
+            return np.float64
+        if dtype in ("int", "int64"):
+            return np.int64
+        return object
+
+    def _grow(self) -> None:
+        """Double the allocated rows."""
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(self._capacity, dtype=column.dtype)
+            grown[: self._length] = column[: self._length]
+            self._columns[name] = grown
+
+    def extend(self, *columns: Any) -> None:
+        """Append the rows of whole columns at once, the columns are in the order of the columns of the buffer."""
+        total = len(columns[0])
+        written = 0
+        while written < total:
+            if self._length == self._capacity:
+                self._grow()
+            count = min(total - written, self._capacity - self._length)
+            for column, values in zip(self._columns.values(), columns):
+                column[self._length : self._length + count] = values[
+                    written : written + count
+                ]
+            self._length += count
+            written += count
+            self._dataframe = None
+            if self._spill_to is not None and self._length == self._chunk_size:
+                self.flush()
+
+    def append(self, *values: Any) -> None:
+        """Append one row, the values are in the order of the columns."""
+        if self._length == self._capacity:
+            self._grow()
+        for column, value in zip(self._columns.values(), values):
+            column[self._length] = value
+        self._length += 1
+        self._dataframe = None
+        if self._spill_to is not None and self._length == self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the rows in memory to a new chunk in the spill directory and clear them."""
+        if self._spill_to is None or self._length == 0:
+            return
+        chunk = self._build()
+        if PARQUET:
+            path = os.path.join(self._spill_to, f"part-{len(self._chunks):05d}.parquet")
+            chunk.to_parquet(path, index=False)
+        else:
+            path = os.path.join(self._spill_to, f"part-{len(self._chunks):05d}.csv")
+            chunk.to_csv(path, index=False)
+        self._chunks.append(path)
+        self._length = 0
+        logger.debug(f"{simulation.now}:\t{len(chunk)} rows are written to {path}.")
+
+    def _build(self) -> pd.DataFrame:
+        """Build a dataframe from the rows in memory."""
+        return pd.DataFrame(
+            {
+                name: pd.Series(self._columns[name][: self._length].copy(), dtype=dtype)
+                for name, dtype in self._dtypes.items()
+            }
+        )
+
+    def _read(self, path: str) -> pd.DataFrame:
+        """Read a chunk back from the spill directory."""
+        if path.endswith(".parquet"):
+            return pd.read_parquet(path)
+        return pd.read_csv(path, dtype=self._dtypes)  # type: ignore
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def chunks(self) -> List[str]:
+        """Return the paths of the chunks written to the spill directory."""
+        return self._chunks
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """Return the rows as a dataframe, it is built once and reused until more rows are appended. The written chunks are read back in front of the rows in memory."""
+        if self._dataframe is None:
+            if len(self._chunks) == 0:
+                self._dataframe = self._build()
+            else:
+                self._dataframe = pd.concat(
+                    [self._read(path) for path in self._chunks] + [self._build()],
+                    ignore_index=True,
+                )
+        return self._dataframe
+
 
 class Monitor(Entity, ABC):
     def __init__(
@@ -27,6 +168,9 @@ class Monitor(Entity, ABC):
             self._sample_period = sample_period()
         else:
             self._sample_period = sample_period
+        # the resources keep their usage records over a sample period
+        if self._sample_period > simulation.usage_history:
+            simulation.set_usage_history(self._sample_period)
 
     def on_creation(self):
         @self.continuous_event(
@@ -4,9 +4,7 @@ from typing import TYPE_CHECKING, Callable, List
 
 from PyCloudSim import logger, simulation
 
-from ..monitor import Monitor
-
-import pandas as pd
+from ..monitor import ColumnBuffer, Monitor
 
 if TYPE_CHECKING:
     from ..entity import vContainer
@@ -56,6 +54,8 @@ class DataframeContainerMonitor(Monitor):
         label: str,
         target_containers: List[vContainer] | None = None,
         sample_period: int | float | Callable[..., int] | Callable[..., float] = 0.1,
+        spill_to: str | None = None,
+        chunk_size: int = 10000,
     ) -> None:
         """Initialize the LoggingContainerMonitor.
 
@@ -63,6 +63,8 @@ class DataframeContainerMonitor(Monitor):
             label (str): short name of the monitor.
             target_containers (List[vContainer] | None, optional): the container to be monitored. Defaults to None then all containers will be monitored.
             sample_period (int | float | Callable[..., int] | Callable[..., float], optional): the sampling period. Defaults to 0.1.
+            spill_to (str | None, optional): the directory the collected data is written to in chunks, as Parquet files if pyarrow is installed, otherwise as CSV files. Defaults to None, all the data is kept in memory.
+            chunk_size (int, optional): the number of rows in each chunk written to the spill directory. Defaults to 10000.
         """
         super().__init__(label, sample_period)
 
@@ -71,32 +73,29 @@ class DataframeContainerMonitor(Monitor):
         else:
             self._target_containers = target_containers
             
-        self._dataframe = pd.DataFrame({
-            "time": pd.Series([], dtype="str"),
-            "container_label": pd.Series([], dtype="str"),
-            "cpu_usage": pd.Series([], dtype="float"),
-            "cpu_usage_percent": pd.Series([], dtype="float"),
-            "ram_usage": pd.Series([], dtype="float"),
-            "ram_usage_percent": pd.Series([], dtype="float"),
-            "num_of_process": pd.Series([], dtype="int"),
-        })
+        self._buffer = ColumnBuffer({
+            "time": "str",
+            "container_label": "str",
+            "cpu_usage": "float",
+            "cpu_usage_percent": "float",
+            "ram_usage": "float",
+            "ram_usage_percent": "float",
+            "num_of_process": "int",
+        }, spill_to=spill_to, chunk_size=chunk_size)
 
     def on_observation(self, *arg, **kwargs):
-        """Collect the data from the containers and append it to the dataframe."""
+        """Collect the data from the containers and append it to the buffer."""
         for container in self.target_containers:
             if container.initiated:
-                container_telemetries = pd.DataFrame(
-                    {
-                        "time": pd.Series([simulation.now], dtype="str"),
-                        "container_label": pd.Series([container.label], dtype="str"),
-                        "cpu_usage": pd.Series([container.cpu_usage], dtype="float"),
-                        "cpu_usage_percent": pd.Series([container.cpu_usage/container.cpu_limit*100], dtype="float"),
-                        "ram_usage": pd.Series([container.ram_usage], dtype="float"),
-                        "ram_usage_percent": pd.Series([container.ram_usage/container.ram_limit*100], dtype="float"),
-                        "num_of_process": pd.Series([len(container.process_queue)], dtype="int"),
-                    }
+                self._buffer.append(
+                    simulation.now,
+                    container.label,
+                    container.cpu_usage,
+                    container.cpu_usage/container.cpu_limit*100,
+                    container.ram_usage,
+                    container.ram_usage/container.ram_limit*100,
+                    len(container.process_queue),
                 )
-                self._dataframe = pd.concat([self._dataframe, container_telemetries], ignore_index=True)
 
 
     @property
@@ -104,8 +103,12 @@ class DataframeContainerMonitor(Monitor):
         """Return the target containers of the monitor."""
         return self._target_containers
     
+    def flush(self):
+        """Write the collected data in memory to the spill directory."""
+        self._buffer.flush()
+
     @property
     def dataframe(self):
-        """Return the dataframe of the monitor."""
-        return self._dataframe
+        """Return the dataframe of the monitor, built from the collected data when it is accessed."""
+        return self._buffer.dataframe
 
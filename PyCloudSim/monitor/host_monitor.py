@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, List
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
 
 from PyCloudSim import logger, simulation
 
-from ..monitor import Monitor
-import pandas as pd
+from ..monitor import ColumnBuffer, Monitor
 
 if TYPE_CHECKING:
     from ..entity import vHost
@@ -29,10 +30,7 @@ class LoggingHostMonitor(Monitor):
         """
         super().__init__(label, sample_period)
 
-        if target_hosts is None:
-            self._target_hosts = simulation.hosts
-        else:
-            self._target_hosts = target_hosts
+        self._target_hosts = target_hosts
 
     def on_observation(self, *arg, **kwargs):
         """Collect the data from the hosts and log it."""
@@ -44,7 +42,9 @@ class LoggingHostMonitor(Monitor):
 
     @property
     def target_hosts(self):
-        """The target hosts of the monitor."""
+        """The target hosts of the monitor, all the hosts in the network if not specified."""
+        if self._target_hosts is None:
+            return simulation.hosts
         return self._target_hosts
 
 
@@ -54,6 +54,8 @@ class DataframeHostMonitor(Monitor):
         label: str,
         target_hosts: List[vHost] | None = None,
         sample_period: int | float | Callable[..., int] | Callable[..., float] = 0.1,
+        spill_to: str | None = None,
+        chunk_size: int = 10000,
     ) -> None:
         """Initialize the LoggingHostMonitor.
 
@@ -61,86 +63,289 @@ class DataframeHostMonitor(Monitor):
             label (str): short name of the monitor.
             target_hosts (List[vHost] | None, optional): the hosts to be monitored. Defaults to None then all hosts will be monitored.
             sample_period (int | float | Callable[..., int] | Callable[..., float], optional): the sampling frequency. Defaults to 0.1.
+            spill_to (str | None, optional): the directory the collected data is written to in chunks, as Parquet files if pyarrow is installed, otherwise as CSV files. Defaults to None, all the data is kept in memory.
+            chunk_size (int, optional): the number of rows in each chunk written to the spill directory. Defaults to 10000.
         """
         super().__init__(label, sample_period)
 
-        if target_hosts is None:
-            self._target_hosts = simulation.hosts
-        else:
-            self._target_hosts = target_hosts
+        self._target_hosts = target_hosts
 
-        self._dataframe = pd.DataFrame(
+        self._buffer = ColumnBuffer(
             {
-                "time": pd.Series([], dtype="str"),
-                "host_label": pd.Series([], dtype="str"),
-                "cpu_usage": pd.Series([], dtype="float"),
-                "cpu_usage_percent": pd.Series([], dtype="float"),
-                "ram_usage": pd.Series([], dtype="float"),
-                "ram_usage_percent": pd.Series([], dtype="float"),
-                "rom_usage": pd.Series([], dtype="float"),
-                "rom_usage_percent": pd.Series([], dtype="float"),
-                "bandwidth_usage": pd.Series([], dtype="float"),
-                "ingress_usage": pd.Series([], dtype="float"),
-                "ingress_usage_percent": pd.Series([], dtype="float"),
-                "egress_usage": pd.Series([], dtype="float"),
-                "egress_usage_percent": pd.Series([], dtype="float"),
-            }
+                "time": "str",
+                "host_label": "str",
+                "cpu_usage": "float",
+                "cpu_usage_percent": "float",
+                "ram_usage": "float",
+                "ram_usage_percent": "float",
+                "rom_usage": "float",
+                "rom_usage_percent": "float",
+                "bandwidth_usage": "float",
+                "ingress_usage": "float",
+                "ingress_usage_percent": "float",
+                "egress_usage": "float",
+                "egress_usage_percent": "float",
+            },
+            spill_to=spill_to,
+            chunk_size=chunk_size,
         )
 
     def on_observation(self, *arg, **kwargs):
-        """Collect the data from the hosts and append it to the dataframe."""
+        """Collect the data from the hosts and append it to the buffer."""
         for host in self.target_hosts:
-            host_telemetries = pd.DataFrame(
-                {
-                    "time": pd.Series([simulation.now], dtype="str"),
-                    "host_label": pd.Series([host.label], dtype="str"),
-                    "cpu_usage": pd.Series(
-                        [host.cpu_usage(self.sample_period)], dtype="float"
-                    ),
-                    "cpu_usage_percent": pd.Series(
-                        [host.cpu_utilization(self.sample_period) * 100], dtype="float"
-                    ),
-                    "ram_usage": pd.Series(
-                        [host.ram_usage(self.sample_period)], dtype="float"
-                    ),
-                    "ram_usage_percent": pd.Series(
-                        [host.ram_utilization(self.sample_period) * 100], dtype="float"
-                    ),
-                    "rom_usage": pd.Series(
-                        [host.rom.usage(self.sample_period)], dtype="float"
-                    ),
-                    "rom_usage_percent": pd.Series(
-                        [host.rom.utilization(self.sample_period) * 100], dtype="float"
-                    ),
-                    "bandwidth_usage": pd.Series(
-                        [host.NIC.egress_usage(self.sample_period)], dtype="float"
-                    ),
-                    "ingress_usage": pd.Series(
-                        [host.NIC.ingress_usage(self.sample_period)], dtype="float"
-                    ),
-                    "ingress_usage_percent": pd.Series(
-                        [host.NIC.ingress_utilization(self.sample_period) * 100],
-                        dtype="float",
-                    ),
-                    "egress_usage": pd.Series(
-                        [host.NIC.egress_usage(self.sample_period)], dtype="float"
-                    ),
-                    "egress_usage_percent": pd.Series(
-                        [host.NIC.egress_utilization(self.sample_period) * 100],
-                        dtype="float",
-                    ),
-                }
+            self._buffer.append(
+                simulation.now,
+                host.label,
+                host.cpu_usage(self.sample_period),
+                host.cpu_utilization(self.sample_period) * 100,
+                host.ram_usage(self.sample_period),
+                host.ram_utilization(self.sample_period) * 100,
+                host.rom.usage(self.sample_period),
+                host.rom.utilization(self.sample_period) * 100,
+                host.NIC.egress_usage(self.sample_period),
+                host.NIC.ingress_usage(self.sample_period),
+                host.NIC.ingress_utilization(self.sample_period) * 100,
+                host.NIC.egress_usage(self.sample_period),
+                host.NIC.egress_utilization(self.sample_period) * 100,
             )
-            self._dataframe = pd.concat(
-                [self._dataframe, host_telemetries], ignore_index=True
+
+    @property
+    def target_hosts(self):
+        """The target hosts of the monitor, all the hosts in the network if not specified."""
+        if self._target_hosts is None:
+            return simulation.hosts
+        return self._target_hosts
+
+    def flush(self):
+        """Write the collected data in memory to the spill directory."""
+        self._buffer.flush()
+
+    @property
+    def dataframe(self):
+        """Return the dataframe of the monitor, built from the collected data when it is accessed."""
+        return self._buffer.dataframe
+
+
+class FleetHostMonitor(Monitor):
+    """A host monitor for large fleets. The resources of the hosts report their changes to the monitor, which integrates them in NumPy arrays indexed by host, so each sample is one array snapshot instead of a call per host and metric. The percentiles across the hosts are recorded with every sample."""
+
+    # rows of the metric arrays, the relative rows sum the occupied fraction of each core or port
+    CPU, CPU_RELATIVE, RAM, ROM, EGRESS, EGRESS_RELATIVE, INGRESS, INGRESS_RELATIVE = range(8)
+    METRICS = [
+        "cpu_usage",
+        "cpu_usage_percent",
+        "ram_usage",
+        "ram_usage_percent",
+        "rom_usage",
+        "rom_usage_percent",
+        "bandwidth_usage",
+        "ingress_usage",
+        "ingress_usage_percent",
+        "egress_usage",
+        "egress_usage_percent",
+    ]
+
+    def __init__(
+        self,
+        label: str,
+        target_hosts: List[vHost] | None = None,
+        sample_period: int | float | Callable[..., int] | Callable[..., float] = 0.1,
+        percentiles: Sequence[float] = (50, 90, 99),
+        spill_to: str | None = None,
+        chunk_size: int = 10000,
+    ) -> None:
+        """Initialize the FleetHostMonitor.
+
+        Args:
+            label (str): short name of the monitor.
+            target_hosts (List[vHost] | None, optional): the hosts to be monitored. Defaults to None then all hosts will be monitored.
+            sample_period (int | float | Callable[..., int] | Callable[..., float], optional): the sampling period, the metrics are averaged over it. Defaults to 0.1.
+            percentiles (Sequence[float], optional): the percentiles of the metrics across the hosts recorded with every sample. Defaults to (50, 90, 99).
+            spill_to (str | None, optional): the directory the collected data is written to in chunks, as Parquet files if pyarrow is installed, otherwise as CSV files. Defaults to None, all the data is kept in memory.
+            chunk_size (int, optional): the number of rows in each chunk written to the spill directory. Defaults to 10000.
+        """
+        super().__init__(label, sample_period)
+
+        self._target_hosts = target_hosts
+        self._percentiles = list(percentiles)
+
+        self._host_ids: Dict[vHost, int] = dict()
+        self._hosts: List[vHost] = list()
+        self._labels = np.empty(0, dtype=object)
+        self._num_cores = np.zeros(0, dtype=np.float64)
+        self._ram_capacity = np.zeros(0, dtype=np.float64)
+        self._rom_capacity = np.zeros(0, dtype=np.float64)
+        # current occupied amounts, their integrals and the time the integrals are updated to
+        self._values = np.zeros((0, 8), dtype=np.float64)
+        self._integrals = np.zeros((0, 8), dtype=np.float64)
+        self._updated_at = np.zeros(0, dtype=np.float64)
+        # the integrals at the previous sample
+        self._sampled_integrals = np.zeros((0, 8), dtype=np.float64)
+        self._sampled_at: int | float | None = None
+        self._active = np.zeros(0, dtype=np.int64)
+        self._synced_hosts: Tuple[vHost, ...] = tuple()
+
+        self._buffer = ColumnBuffer(
+            {
+                "time": "str",
+                "host_label": "str",
+                **{metric: "float" for metric in self.METRICS},
+            },
+            spill_to=spill_to,
+            chunk_size=chunk_size,
+        )
+        self._aggregates = ColumnBuffer(
+            {
+                "time": "float64",
+                **{
+                    f"{metric}_p{percentile:g}": "float64"
+                    for metric in self.METRICS
+                    for percentile in self._percentiles
+                },
+            }
+        )
+
+    def _register(self, host: vHost) -> int:
+        """Give the host an index in the arrays and subscribe to the changes of its resources."""
+        index = len(self._hosts)
+        self._host_ids[host] = index
+        self._hosts.append(host)
+        if index == len(self._labels):
+            size = max(16, 2 * index)
+            self._labels = np.resize(self._labels, size)
+            for name in ("_num_cores", "_ram_capacity", "_rom_capacity", "_updated_at"):
+                setattr(self, name, np.resize(getattr(self, name), size))
+            for name in ("_values", "_integrals", "_sampled_integrals"):
+                grown = np.zeros((size, 8), dtype=np.float64)
+                grown[:index] = getattr(self, name)[:index]
+                setattr(self, name, grown)
+        self._labels[index] = host.label
+        self._num_cores[index] = host.cpu.num_cores
+        self._ram_capacity[index] = host.ram.capacity
+        self._rom_capacity[index] = host.rom.capacity
+        self._values[index] = 0
+        self._integrals[index] = 0
+        self._sampled_integrals[index] = 0
+        self._updated_at[index] = simulation.now
+        host.cpu.add_usage_listener(self._listener(index, self.CPU, self.CPU_RELATIVE))
+        host.ram.add_listener(self._listener(index, self.RAM))
+        host.rom.add_listener(self._listener(index, self.ROM))
+        host.NIC.add_egress_listener(
+            self._listener(index, self.EGRESS, self.EGRESS_RELATIVE)
+        )
+        host.NIC.add_ingress_listener(
+            self._listener(index, self.INGRESS, self.INGRESS_RELATIVE)
+        )
+        return index
+
+    def _listener(self, index: int, row: int, relative_row: int | None = None):
+        """Return the listener that adds the changes of a resource to the rows of the host."""
+
+        def _update(time: int | float, change: int | float, capacity: int | float):
+            self._integrals[index] += self._values[index] * (
+                time - self._updated_at[index]
+            )
+            self._updated_at[index] = time
+            self._values[index, row] += change
+            if relative_row is not None:
+                self._values[index, relative_row] += change / capacity
+
+        return _update
+
+    def _sync(self) -> None:
+        """Register the new target hosts and find the hosts to be sampled, only when the target hosts have changed since the previous sample."""
+        hosts = tuple(self.target_hosts)
+        if hosts == self._synced_hosts:
+            return
+        self._synced_hosts = hosts
+        active = list()
+        for host in hosts:
+            index = self._host_ids.get(host)
+            if index is None:
+                index = self._register(host)
+            active.append(index)
+        self._active = np.array(active, dtype=np.int64)
+
+    def on_observation(self, *arg, **kwargs):
+        """Take a snapshot of all the hosts, averaged over the time since the previous sample."""
+        self._sync()
+        size = len(self._hosts)
+        now = simulation.now
+        integrals = self._integrals[:size] + self._values[:size] * (
+            now - self._updated_at[:size]
+        )[:, None]
+        if self._sampled_at is None or now <= self._sampled_at:
+            averages = self._values[:size].copy()
+        else:
+            averages = (integrals - self._sampled_integrals[:size]) / (
+                now - self._sampled_at
             )
+        self._sampled_integrals[:size] = integrals
+        self._sampled_at = now
+        if len(self._active) == 0:
+            return
+
+        active = self._active
+        averages = averages[active]
+        num_egress_ports = np.fromiter(
+            (len(self._hosts[index].NIC.ports) for index in active),
+            dtype=np.float64,
+            count=len(active),
+        )
+        num_ingress_ports = np.fromiter(
+            (len(self._hosts[index].NIC.ingress_ports) for index in active),
+            dtype=np.float64,
+            count=len(active),
+        )
+        # the relative usage is 0 without ports
+        num_egress_ports[num_egress_ports == 0] = 1
+        num_ingress_ports[num_ingress_ports == 0] = 1
+        snapshot = np.column_stack(
+            [
+                averages[:, self.CPU],
+                averages[:, self.CPU_RELATIVE] / self._num_cores[active] * 100,
+                averages[:, self.RAM],
+                averages[:, self.RAM] / self._ram_capacity[active] * 100,
+                averages[:, self.ROM],
+                averages[:, self.ROM] / self._rom_capacity[active] * 100,
+                averages[:, self.EGRESS],
+                averages[:, self.INGRESS],
+                averages[:, self.INGRESS_RELATIVE] / num_ingress_ports * 100,
+                averages[:, self.EGRESS],
+                averages[:, self.EGRESS_RELATIVE] / num_egress_ports * 100,
+            ]
+        )
+        self._buffer.extend(
+            np.full(len(active), now, dtype=object),
+            self._labels[active],
+            *snapshot.T,
+        )
+        # percentiles of every metric across the hosts, one row of metrics per percentile
+        aggregates = np.percentile(snapshot, self._percentiles, axis=0)
+        self._aggregates.append(now, *aggregates.T.ravel())
+
+    def flush(self):
+        """Write the collected data in memory to the spill directory."""
+        self._buffer.flush()
 
     @property
     def target_hosts(self):
-        """The target hosts of the monitor."""
+        """The target hosts of the monitor, all the hosts in the network if not specified."""
+        if self._target_hosts is None:
+            return simulation.hosts
         return self._target_hosts
 
+    @property
+    def percentiles(self) -> List[float]:
+        """Return the percentiles recorded across the hosts."""
+        return self._percentiles
+
     @property
     def dataframe(self):
-        """Return the dataframe of the monitor."""
-        return self._dataframe
+        """Return the dataframe of the monitor with a row per host and sample, in the same columns as DataframeHostMonitor."""
+        return self._buffer.dataframe
+
+    @property
+    def aggregates(self):
+        """Return the dataframe of the percentiles of the metrics across the hosts, with a row per sample."""
+        return self._aggregates.dataframe
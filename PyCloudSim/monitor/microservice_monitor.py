@@ -4,9 +4,7 @@ from typing import TYPE_CHECKING, Callable, List
 
 from PyCloudSim import logger, simulation
 
-from ..monitor import Monitor
-
-import pandas as pd
+from ..monitor import ColumnBuffer, Monitor
 
 if TYPE_CHECKING:
     from ..entity import vMicroservice
@@ -44,6 +42,8 @@ class DataframeMicroserviceMonitor(Monitor):
         label: str,
         targeted_microservices: List[vMicroservice] | None = None,
         sample_period: int | float | Callable[..., int] | Callable[..., float] = 0.1,
+        spill_to: str | None = None,
+        chunk_size: int = 10000,
     ) -> None:
         super().__init__(label, sample_period)
         if targeted_microservices is None:
@@ -51,29 +51,33 @@ class DataframeMicroserviceMonitor(Monitor):
         else:
             self._targeted_microservices = targeted_microservices
 
-        self._dataframe = pd.DataFrame({
-            "time": pd.Series(dtype="float64"),
-            "microservice": pd.Series(dtype="string"),
-            "cpu_usage": pd.Series(dtype="float64"),
-            "ram_usage": pd.Series(dtype="float64"),
-            "num_containers": pd.Series(dtype="int64"),
-        })
+        self._buffer = ColumnBuffer({
+            "time": "float64",
+            "microservice": "string",
+            "cpu_usage": "float64",
+            "ram_usage": "float64",
+            "num_containers": "int64",
+        }, spill_to=spill_to, chunk_size=chunk_size)
         
     def on_observation(self, *arg, **kwargs):
         """Simply log the CPU and RAM usage of the containers."""
         for microservice in self.targeted_microservices:
-            microservice_telemetries = pd.DataFrame({
-                "time": pd.Series([simulation.now], dtype="float64"),
-                "microservice": pd.Series([microservice.label], dtype="string"),
-                "cpu_usage": pd.Series([microservice.cpu_utilization], dtype="float64"),
-                "ram_usage": pd.Series([microservice.ram_utilization], dtype="float64"),
-                "num_containers": pd.Series([microservice.num_active_containers], dtype="int64"),
-            })
-            self._dataframe = pd.concat([self._dataframe, microservice_telemetries], ignore_index=True)
+            self._buffer.append(
+                simulation.now,
+                microservice.label,
+                microservice.cpu_utilization,
+                microservice.ram_utilization,
+                microservice.num_active_containers,
+            )
                 
+    def flush(self):
+        """Write the collected data in memory to the spill directory."""
+        self._buffer.flush()
+
     @property
     def dataframe(self):
-        return self._dataframe
+        """Return the dataframe of the monitor, built from the collected data when it is accessed."""
+        return self._buffer.dataframe
     
     @property
     def targeted_microservices(self):
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from heapq import heappop, heappush
+from itertools import count
+from typing import TYPE_CHECKING, Dict, List, Tuple
 from math import inf
 
 from Akatosh import Entity
 
-from PyCloudSim import simulation, logger
+from PyCloudSim import Trigger, simulation, logger
 
 if TYPE_CHECKING:
-    from ..entity import vContainer, vHost
+    from ..entity import vContainer, vHost, vVolume
 
 
 class ContainerScheduler(ABC, Entity):
@@ -18,37 +20,83 @@ class ContainerScheduler(ABC, Entity):
     def __init__(self) -> None:
         super().__init__(label="Container Scheduler", create_at=0)
         simulation._container_scheduler = self
+        self._trigger = Trigger(
+            self, self._scheduling, label="Scheduling Containers", priority=inf
+        )
+        # unscheduled containers whose volumes are scheduled, in the order of priority
+        self._queue: List[Tuple[int, int, vContainer]] = list()
+        self._sequence = count()
+        # unscheduled containers waiting on their volumes
+        self._gates: Dict[vContainer, int] = dict()
+        self._gated_volumes: Dict[vVolume, vContainer] = dict()
 
     def on_creation(self):
         super().on_creation()
-
-        @self.continuous_event(
-            at=simulation.now,
-            interval=simulation.min_time_unit,
-            duration=inf,
-            label="Scheduling Containers",
-            priority=inf,
-        )
-        def _scheduling():
-            simulation.containers.sort(key=lambda container: container.priority)
-            for container in simulation.containers:
-                # skip if container is already scheduled
-                if container.scheduled:
-                    continue
-                
-                # skip if not all volumes are scheduled
-                if not all([volume.scheduled for volume in container.volumes]):
-                    continue
-
-                # find a host for the container
-                host = self.find_host(container)
-                # if a host is found, allocate the container to the host
-                if host:
-                    host.allocate_container(container)
-                else:
-                    logger.debug(
-                        f"{simulation.now}:\tContainer {container.label} cannot be scheduled."
-                    )
+        # pick up the containers created before the scheduler
+        submitted = [entry[2] for entry in self._queue] + list(self._gates)
+        for container in simulation.containers:
+            if (
+                container.created
+                and not container.scheduled
+                and not (container.terminated or container.destroied)
+                and container not in submitted
+            ):
+                self.submit(container)
+        self.trigger.notify()
+
+    def submit(self, container: vContainer):
+        """Queue a created container for scheduling, it is held back until all its volumes are scheduled."""
+        unscheduled_volumes = [
+            volume for volume in container.volumes if not volume.scheduled
+        ]
+        if len(unscheduled_volumes) > 0:
+            self._gates[container] = len(unscheduled_volumes)
+            for volume in unscheduled_volumes:
+                self._gated_volumes[volume] = container
+            return
+        heappush(self._queue, (container.priority, next(self._sequence), container))
+        self.trigger.notify()
+
+    def release(self, volume: vVolume):
+        """Open the gate of the container that waits on the volume, called when the volume is scheduled."""
+        container = self._gated_volumes.pop(volume, None)
+        if container is None:
+            return
+        self._gates[container] -= 1
+        if self._gates[container] == 0:
+            del self._gates[container]
+            self.submit(container)
+
+    def withdraw(self, container: vContainer):
+        """Forget the gate of a container that waits on its volumes, called when the container is terminated or destroied."""
+        if self._gates.pop(container, None) is None:
+            return
+        for volume in container.volumes:
+            if self._gated_volumes.get(volume) is container:
+                del self._gated_volumes[volume]
+
+    def _scheduling(self):
+        """Allocate the queued containers to hosts, in the order of their priority. The containers that cannot be allocated stay in the queue until a host releases capacity."""
+        blocked: List[Tuple[int, int, vContainer]] = list()
+        while len(self._queue) > 0:
+            entry = heappop(self._queue)
+            container = entry[2]
+            # skip if container is already scheduled or terminated
+            if container.scheduled or container.terminated or container.destroied:
+                continue
+
+            # find a host for the container
+            host = self.find_host(container)
+            # if a host is found, allocate the container to the host
+            if host:
+                host.allocate_container(container)
+            else:
+                blocked.append(entry)
+                logger.debug(
+                    f"{simulation.now}:\tContainer {container.label} cannot be scheduled."
+                )
+        for entry in blocked:
+            heappush(self._queue, entry)
 
     def on_termination(self):
         return super().on_termination()
@@ -56,6 +104,16 @@ class ContainerScheduler(ABC, Entity):
     def on_destruction(self):
         return super().on_destruction()
 
+    @property
+    def trigger(self):
+        """Return the trigger that wakes up the scheduling."""
+        return self._trigger
+
+    @property
+    def queue(self):
+        """Return the unscheduled containers that are ready to be scheduled, in the order of priority."""
+        return [entry[2] for entry in sorted(self._queue)]
+
     @abstractmethod
     def find_host(self, container: vContainer) -> vHost | None:
         pass
@@ -68,14 +126,9 @@ class DefaultContainerScheduler(ContainerScheduler):
         super().__init__()
 
     def find_host(self, container: vContainer) -> vHost | None:
-        for host in simulation.hosts:
-            if (
-                host.powered_on
-                and host.ram_reservoir.amount >= container.ram
-                and host.cpu_reservoir.amount >= container.cpu
-                and host.rom_reservoir.amount >= container.image_size
-            ):
-                return host
+        return simulation.host_index.first_fit(
+            container.cpu, container.ram, container.image_size
+        )
 
 
 class BestfitContainerScheduler(ContainerScheduler):
@@ -85,17 +138,9 @@ class BestfitContainerScheduler(ContainerScheduler):
         super().__init__()
 
     def find_host(self, container: vContainer) -> vHost | None:
-        simulation.hosts.sort(key=lambda host: host.rom_reservoir.amount)
-        simulation.hosts.sort(key=lambda host: host.ram_reservoir.amount)
-        simulation.hosts.sort(key=lambda host: host.cpu_reservoir.amount)
-        for host in simulation.hosts:
-            if (
-                host.powered_on
-                and host.ram_reservoir.amount >= container.ram
-                and host.cpu_reservoir.amount >= container.cpu
-                and host.rom_reservoir.amount >= container.image_size
-            ):
-                return host
+        return simulation.host_index.best_fit(
+            container.cpu, container.ram, container.image_size
+        )
 
 
 class WorstfitContainerScheduler(ContainerScheduler):
@@ -105,14 +150,6 @@ class WorstfitContainerScheduler(ContainerScheduler):
         super().__init__()
 
     def find_host(self, container: vContainer) -> vHost | None:
-        simulation.hosts.sort(key=lambda host: host.rom_reservoir.amount, reverse=True)
-        simulation.hosts.sort(key=lambda host: host.ram_reservoir.amount, reverse=True)
-        simulation.hosts.sort(key=lambda host: host.cpu_reservoir.amount, reverse=True)
-        for host in simulation.hosts:
-            if (
-                host.powered_on
-                and host.ram_reservoir.amount >= container.ram
-                and host.cpu_reservoir.amount >= container.cpu
-                and host.rom_reservoir.amount >= container.image_size
-            ):
-                return host
+        return simulation.host_index.worst_fit(
+            container.cpu, container.ram, container.image_size
+        )
@@ -6,7 +6,7 @@ from math import inf
 
 from Akatosh import Entity
 
-from PyCloudSim import simulation, logger
+from PyCloudSim import Trigger, simulation, logger
 
 if TYPE_CHECKING:
     from ..entity import vVolume, vHost
@@ -18,30 +18,28 @@ class VolumeScheduler(ABC, Entity):
     def __init__(self) -> None:
         super().__init__(label="Volume Scheduler", create_at=0, precursor=None)
         simulation._volume_scheduler = self
+        self._trigger = Trigger(
+            self, self.scheduling, label="Scheduling Volumes", priority=inf
+        )
 
     def on_creation(self):
         super().on_creation()
-
-        @self.continuous_event(
-            at=simulation.now,
-            interval=simulation.min_time_unit,
-            duration=inf,
-            label="Scheduling Volumes",
-            priority=inf,
-        )
-        def scheduling():
-            for volume in simulation.volumes:
-                # skip if container is already scheduled
-                if volume.scheduled:
-                    continue
-
-                # find a host for the container
-                host = self.find_host(volume)
-                # if a host is found, allocate the container to the host
-                if host:
-                    host.allocate_volume(volume)
-                else:
-                    logger.debug(f"{simulation.now}:\t{volume} cannot be scheduled.")
+        self.trigger.notify()
+
+    def scheduling(self):
+        """Allocate the unscheduled volumes to hosts."""
+        for volume in simulation.volumes:
+            # skip if container is already scheduled
+            if volume.scheduled:
+                continue
+
+            # find a host for the container
+            host = self.find_host(volume)
+            # if a host is found, allocate the container to the host
+            if host:
+                host.allocate_volume(volume)
+            else:
+                logger.debug(f"{simulation.now}:\t{volume} cannot be scheduled.")
 
     def on_termination(self):
         return super().on_termination()
@@ -49,6 +47,11 @@ class VolumeScheduler(ABC, Entity):
     def on_destruction(self):
         return super().on_destruction()
 
+    @property
+    def trigger(self):
+        """Return the trigger that wakes up the scheduling."""
+        return self._trigger
+
     @abstractmethod
     def find_host(self, volume: vVolume) -> vHost | None:
         pass
@@ -73,8 +76,9 @@ class BestfitVolumeScheduler(VolumeScheduler):
         super().__init__()
 
     def find_host(self, volume: vVolume) -> vHost | None:
-        simulation.hosts.sort(key=lambda host: host.rom_reservoir.amount)
-        for host in simulation.hosts:
+        for host in sorted(
+            simulation.hosts, key=lambda host: host.rom_reservoir.amount
+        ):
             if host.powered_on and host.rom_reservoir.amount >= volume.size:
                 return host
 
@@ -86,7 +90,8 @@ class WorstfitVolumeScheduler(VolumeScheduler):
         super().__init__()
 
     def find_host(self, volume: vVolume) -> vHost | None:
-        simulation.hosts.sort(key=lambda host: host.rom_reservoir.amount, reverse=True)
-        for host in simulation.hosts:
+        for host in sorted(
+            simulation.hosts, key=lambda host: host.rom_reservoir.amount, reverse=True
+        ):
             if host.powered_on and host.rom_reservoir.amount >= volume.size:
                 return host
@@ -0,0 +1,124 @@
+import logging
+from ipaddress import IPv4Network
+from types import SimpleNamespace
+
+import pytest
+from Akatosh import Mundus
+
+from PyCloudSim import logger, simulation
+from PyCloudSim.entity import (
+    vAPICall,
+    vDefaultMicroservice,
+    vGateway,
+    vHost,
+    vPacket,
+    vSwitch,
+    vUser,
+)
+from PyCloudSim.scheduler import DefaultContainerScheduler
+
+
+@pytest.fixture
+def sim():
+    """A fresh simulation, the universe and the simulation singleton are reset in place so the modules keep their references."""
+    logger.setLevel(logging.WARNING)
+    Mundus.__init__()
+    simulation.__init__()
+    yield simulation
+    Mundus.__init__()
+    simulation.__init__()
+
+
+@pytest.fixture
+def cluster(sim):
+    """A user behind a gateway, a core switch and two hosts, with one microservice of one container."""
+    DefaultContainerScheduler()
+    switch = vSwitch(
+        ipc=1,
+        frequency=5000,
+        num_cores=4,
+        cpu_tdps=150,
+        cpu_mode=1,
+        ram=8,
+        rom=16,
+        subnet=IPv4Network("192.168.0.0/24"),
+        label="Core",
+        create_at=0,
+    )
+    switch.power_on(0)
+    gateway = vGateway()
+    user = vUser(gateway)
+    sim.network.add_link(switch, gateway, 1, 0)
+    hosts = list()
+    for i in range(2):
+        host = vHost(
+            ipc=1,
+            frequency=5000,
+            num_cores=4,
+            cpu_tdps=150,
+            cpu_mode=2,
+            ram=8,
+            rom=16,
+            label=str(i),
+            create_at=0,
+        )
+        host.power_on(0)
+        sim.network.add_link(host, switch, 1, 0)
+        hosts.append(host)
+    microservice = vDefaultMicroservice(
+        cpu=100,
+        cpu_limit=500,
+        ram=500,
+        ram_limit=1000,
+        label="ms",
+        image_size=100,
+        create_at=0,
+        deamon=True,
+        min_num_instances=1,
+        max_num_instances=1,
+    )
+    return SimpleNamespace(
+        switch=switch,
+        gateway=gateway,
+        user=user,
+        hosts=hosts,
+        microservice=microservice,
+    )
+
+
+def _api_call(src, dst, label, **kwargs):
+    arguments = dict(
+        src_process_length=10,
+        dst_process_length=10,
+        ack_process_length=10,
+        num_src_packets=10,
+        num_ret_packets=10,
+        num_ack_packets=10,
+        src_packet_size=100,
+        ret_packet_size=100,
+        ack_packet_size=100,
+        priority=1,
+        create_at=0.11,
+        label=label,
+    )
+    arguments.update(kwargs)
+    return vAPICall(src=src, dst=dst, **arguments)
+
+
+@pytest.fixture
+def api_call():
+    """Create an API call with small defaults, the keyword arguments override them."""
+    return _api_call
+
+
+class HeldPacket(vPacket):
+    """A packet that is not sent, it stays at its destination to be decoded directly."""
+
+    def on_initiate(self) -> None:
+        self._current_hop = self.dst_host
+
+
+@pytest.fixture
+def held_packet():
+    """The packet class that is not sent, so the nodes can decode it directly."""
+    return HeldPacket
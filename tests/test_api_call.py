@@ -0,0 +1,35 @@
+import pytest
+from Akatosh import instant_event
+
+
+@pytest.mark.parametrize(
+    "src, dst",
+    [
+        ("user", "microservice"),
+        ("microservice", "user"),
+        ("microservice", "microservice"),
+    ],
+)
+def test_an_api_call_succeeds_with_its_last_child(sim, cluster, api_call, src, dst):
+    call = api_call(getattr(cluster, src), getattr(cluster, dst), "Call")
+    sim.simulate(1)
+
+    children = call.processes + call.packets
+    assert len(children) > 0
+    assert all(child.succeed for child in children)
+    assert call.succeed
+    assert call.outstanding_children == 0
+    assert call.terminated_at == max(child.terminated_at for child in children)
+
+
+def test_an_api_call_fails_with_its_first_failed_child(sim, cluster, api_call):
+    call = api_call(cluster.user, cluster.microservice, "Call")
+
+    @instant_event(at=0.12)
+    def _drop():
+        call.packets[0].drop()
+
+    sim.simulate(1)
+
+    assert call.failed
+    assert call.terminated_at == pytest.approx(0.12)
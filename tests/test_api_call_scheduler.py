@@ -0,0 +1,36 @@
+from Akatosh import instant_event
+
+from PyCloudSim.entity import vDefaultMicroservice
+
+
+def test_api_calls_wait_on_the_microservice_that_is_not_ready(sim, cluster, api_call):
+    late = vDefaultMicroservice(
+        cpu=100,
+        cpu_limit=500,
+        ram=500,
+        ram_limit=1000,
+        label="late",
+        image_size=100,
+        create_at=0.3,
+        deamon=True,
+        min_num_instances=1,
+        max_num_instances=1,
+    )
+    ready_call = api_call(cluster.user, cluster.microservice, "Ready")
+    late_call = api_call(cluster.user, late, "Late")
+    chained_call = api_call(cluster.microservice, late, "Chained")
+
+    @instant_event(at=0.2)
+    def _check():
+        assert ready_call.initiated
+        assert not late_call.initiated
+        assert not chained_call.initiated
+        assert sim.api_call_scheduler.pending == {late: [late_call, chained_call]}
+
+    sim.simulate(2)
+
+    assert sim.api_call_scheduler.pending == {}
+    for call in [ready_call, late_call, chained_call]:
+        assert call.succeed
+    # the waiting calls are initiated once the microservice is ready
+    assert late_call.terminated_at > 0.3
@@ -0,0 +1,92 @@
+from Akatosh import instant_event
+
+from PyCloudSim.entity import vContainer, vHost
+from PyCloudSim.scheduler import DefaultContainerScheduler, DefaultVolumeScheduler
+
+
+def host(label, rom=16, power_on_at=0):
+    host = vHost(
+        ipc=1,
+        frequency=5000,
+        num_cores=4,
+        cpu_tdps=150,
+        cpu_mode=2,
+        ram=8,
+        rom=rom,
+        label=label,
+        create_at=0,
+    )
+    host.power_on(power_on_at)
+    return host
+
+
+def container(label, create_at, priority=0, **kwargs):
+    return vContainer(
+        cpu=100,
+        ram=5000,
+        image_size=100,
+        priority=priority,
+        label=label,
+        create_at=create_at,
+        **kwargs,
+    )
+
+
+def test_containers_wait_for_capacity_in_the_order_of_priority(sim):
+    scheduler = DefaultContainerScheduler()
+    node = host("Host")
+    first = container("First", 0.1, terminate_at=0.3)
+    low = container("Low", 0.2, priority=2)
+    high = container("High", 0.2, priority=1)
+
+    @instant_event(at=0.25)
+    def _check():
+        assert first.host is node
+        # only the containers that do not fit are queued
+        assert scheduler.queue == [high, low]
+
+    sim.simulate(0.4)
+
+    # the capacity released by the first container goes to the higher priority
+    assert high.host is node
+    assert not low.scheduled
+    assert scheduler.queue == [low]
+
+
+def test_containers_wait_for_their_volumes(sim):
+    scheduler = DefaultContainerScheduler()
+    DefaultVolumeScheduler()
+    small = host("Small")
+    large = host("Large", rom=64, power_on_at=0.3)
+    waiting = container("Waiting", 0.1, volumes=[(20000, "/data", "Data")])
+
+    @instant_event(at=0.25)
+    def _check():
+        # the small host has room for the container but not for its volume
+        assert not waiting.scheduled
+        assert scheduler.queue == []
+
+    sim.simulate(0.4)
+
+    assert waiting.volumes[0] in large.volume_queue
+    assert waiting.scheduled
+
+
+def test_a_terminated_container_stops_waiting_for_its_volumes(sim):
+    scheduler = DefaultContainerScheduler()
+    DefaultVolumeScheduler()
+    host("Small")
+    waiting = container(
+        "Waiting", 0.1, terminate_at=0.2, volumes=[(20000, "/data", "Data")]
+    )
+
+    @instant_event(at=0.15)
+    def _check():
+        assert list(scheduler._gates) == [waiting]
+        assert list(scheduler._gated_volumes) == list(waiting.volumes)
+
+    sim.simulate(0.3)
+
+    assert scheduler._gates == {}
+    assert scheduler._gated_volumes == {}
+    assert scheduler.queue == []
@@ -0,0 +1,130 @@
+from random import Random
+from types import SimpleNamespace
+
+import pytest
+
+from PyCloudSim.entity import vHost
+from PyCloudSim.entity.v_cpu import vCPU
+from PyCloudSim.entity.v_process import vProcess
+
+
+class HostProcess(vProcess):
+    """A process that runs on a host without a container."""
+
+    def __init__(self, host, length, **kwargs):
+        super().__init__(length, **kwargs)
+        self._host = host
+
+    def on_initiate(self):
+        super().on_initiate()
+        self.host.process_queue.append(self)
+        self.host.cpu.trigger.notify()
+
+    @property
+    def host(self):
+        return self._host
+
+
+def cores(amounts):
+    return [
+        SimpleNamespace(computational_power=SimpleNamespace(amount=amount))
+        for amount in amounts
+    ]
+
+
+def one_at_a_time(amounts, instructions):
+    """The instructions given one at a time to the core with the most capacity, ties go to the first core."""
+    amounts, counts = list(amounts), [0] * len(amounts)
+    for _ in range(instructions):
+        if max(amounts) <= 0:
+            break
+        index = amounts.index(max(amounts))
+        amounts[index] -= 1
+        counts[index] += 1
+    return counts
+
+
+def core_by_core(amounts, instructions):
+    """The instructions given to the core with the most capacity until it is full, then to the next one."""
+    amounts, counts = list(amounts), [0] * len(amounts)
+    while instructions > 0 and max(amounts) > 0:
+        index = amounts.index(max(amounts))
+        count = min(instructions, amounts[index])
+        amounts[index] -= count
+        counts[index] += count
+        instructions -= count
+    return counts
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_the_instructions_are_split_among_the_cores_like_before(seed):
+    random = Random(seed)
+    for _ in range(200):
+        amounts = [random.randint(1, 20) for _ in range(random.randint(1, 6))]
+        instructions = random.randint(1, 130)
+        available = cores(amounts)
+        for split, reference in [
+            (vCPU._spread, one_at_a_time),
+            (vCPU._fill, core_by_core),
+        ]:
+            counts = {id(core): 0 for core in available}
+            for core, count in split(available, instructions):
+                counts[id(core)] += count
+            assert list(counts.values()) == reference(amounts, instructions)
+
+
+def host(cpu_mode, num_cores=4):
+    host = vHost(
+        ipc=1,
+        frequency=1000,
+        num_cores=num_cores,
+        cpu_tdps=150,
+        cpu_mode=cpu_mode,
+        ram=8,
+        rom=16,
+        label="Host",
+        create_at=0,
+    )
+    host.power_on(0)
+    return host
+
+
+@pytest.mark.parametrize("cpu_mode", [1, 2])
+@pytest.mark.parametrize("batch_window", [None, 0.01, 1])
+def test_a_process_runs_as_soon_as_it_arrives(sim, cpu_mode, batch_window):
+    sim.set_batch_window(batch_window)
+    node = host(cpu_mode)
+    # the cores take 1000 instructions each, one every millisecond
+    spread = HostProcess(node, 400, label="Spread", create_at=0.1)
+    filled = HostProcess(node, 1500, label="Filled", create_at=0.2)
+    sim.simulate(2)
+
+    assert spread.succeed and filled.succeed
+    if cpu_mode == 1:
+        assert spread.terminated_at == pytest.approx(0.1 + 0.1)
+        assert filled.terminated_at == pytest.approx(0.2 + 0.375)
+    else:
+        assert spread.terminated_at == pytest.approx(0.1 + 0.4)
+        assert filled.terminated_at == pytest.approx(0.2 + 1)
+
+
+def test_a_process_succeeds_once_its_last_instruction_is_retired(sim):
+    node = host(cpu_mode=1, num_cores=1)
+    process = HostProcess(node, 50, label="Process", create_at=0.1)
+    empty = HostProcess(node, 0, label="Empty", create_at=0.1)
+    samples = list()
+
+    def sample():
+        samples.append((process.remaining_instructions, process.succeed))
+
+    for at in [0.12, 0.1495, 0.1505]:
+        sim.simulate(at)
+        sample()
+
+    assert empty.succeed
+    assert empty.terminated_at == pytest.approx(0.1)
+    assert samples[0] == (30, False)
+    assert samples[1] == (1, False)
+    assert samples[2] == (0, True)
+    assert process.terminated_at == pytest.approx(0.15)
+    assert node.cpu.cores[0].computational_power.amount == 1000
@@ -0,0 +1,33 @@
+from Akatosh import instant_event
+
+from PyCloudSim.entity.v_process import vDecoder
+
+
+def test_packets_are_decoded_by_processes_by_default(sim):
+    assert not sim.analytic_decoding
+
+
+def test_a_dropped_packet_wakes_up_the_cpu(sim, cluster, held_packet):
+    sim.set_analytic_decoding()
+    switch = cluster.switch
+    # the train holds all the computational power of the switch for a second
+    train = held_packet(cluster.user, cluster.user, 500, 1, create_at=0.2, count=40)
+    packet = held_packet(cluster.user, cluster.user, 100, 1, create_at=0.2)
+
+    @instant_event(at=0.3)
+    def _receive():
+        switch.decode_packet(train)
+        assert all(core.computational_power.amount == 0 for core in switch.cpu.cores)
+
+    decoder = vDecoder(packet, switch, 100, label="Decoder", create_at=0.35)
+
+    @instant_event(at=0.4)
+    def _drop():
+        train.drop()
+
+    sim.simulate(2)
+
+    assert train.failed
+    # the decoder waiting for the cores runs once the train would have been decoded
+    assert decoder.succeed
+    assert packet.succeed
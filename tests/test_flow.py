@@ -0,0 +1,63 @@
+from PyCloudSim.entity.constants import Constants
+
+
+def flow_and_packet_calls(cluster, api_call):
+    """A large flow call and a small packet call sent on the same ports at the same time."""
+    flow_call = api_call(
+        cluster.user,
+        cluster.microservice,
+        "Flow",
+        num_src_packets=1000,
+        src_packet_size=1000,
+        network_mode=Constants.FLOW,
+    )
+    packet_call = api_call(cluster.user, cluster.microservice, "Packet")
+    return flow_call, packet_call
+
+
+def test_packets_are_sent_while_a_flow_is_active(sim, cluster, api_call):
+    flow_call, packet_call = flow_and_packet_calls(cluster, api_call)
+    sim.simulate(2)
+
+    assert packet_call.succeed
+    assert flow_call.succeed
+    # the packets use the headroom left by the flow instead of waiting for it
+    assert packet_call.terminated_at < flow_call.terminated_at
+
+
+def test_packets_resume_when_a_flow_returns_the_bandwidth(sim, cluster, api_call):
+    # without headroom the flow takes the ports and the packets must wait for it
+    sim.set_flow_headroom(0)
+    flow_call, packet_call = flow_and_packet_calls(cluster, api_call)
+    sim.simulate(2.5)
+
+    assert flow_call.succeed
+    assert packet_call.succeed
+    for node in [cluster.switch, cluster.gateway, *cluster.hosts]:
+        assert node.NIC.ready_packets == []
+
+
+def test_flows_share_a_port_max_min_fairly(sim, cluster, api_call):
+    calls = [
+        api_call(
+            cluster.user,
+            cluster.microservice,
+            f"Flow {i}",
+            num_src_packets=1000,
+            src_packet_size=1000,
+            network_mode=Constants.FLOW,
+        )
+        for i in range(2)
+    ]
+    sim.simulate(0.5)
+
+    flows = sim.flow_model.flows
+    assert len(flows) == 2
+    assert flows[0].rate == flows[1].rate > 0
+    # the flows share the gateway link and leave the headroom to the packets
+    port = cluster.gateway.NIC.port_to(cluster.switch)
+    limit = port.bandwidth.capacity * (1 - sim.flow_headroom)
+    assert sum(flow.rate for flow in flows) <= limit + 1e-6
+    sim.simulate(3)
+    assert all(call.succeed for call in calls)
+    assert sim.flow_model.flows == []
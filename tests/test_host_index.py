@@ -0,0 +1,147 @@
+from random import Random
+from types import SimpleNamespace
+
+import pytest
+
+from PyCloudSim import HostCapacityIndex
+from PyCloudSim.entity import vContainer, vHost
+from PyCloudSim.scheduler import (
+    BestfitContainerScheduler,
+    DefaultContainerScheduler,
+    WorstfitContainerScheduler,
+)
+
+
+class Host:
+    """A host with only the reservoirs the index reads."""
+
+    def __init__(self, label, cpu, ram, rom):
+        self.label = label
+        self.cpu_reservoir = SimpleNamespace(amount=cpu)
+        self.ram_reservoir = SimpleNamespace(amount=ram)
+        self.rom_reservoir = SimpleNamespace(amount=rom)
+        self.powered_on = False
+
+    def capacity(self):
+        return (
+            self.cpu_reservoir.amount,
+            self.ram_reservoir.amount,
+            self.rom_reservoir.amount,
+        )
+
+
+def fits(host, demand):
+    return host.powered_on and all(a >= b for a, b in zip(host.capacity(), demand))
+
+
+def linear_first_fit(hosts, demand):
+    for host in hosts:
+        if fits(host, demand):
+            return host
+
+
+def linear_best_fit(hosts, demand):
+    # the hosts sorted by CPU, then RAM, then ROM, ties keep their order
+    for host in sorted(hosts, key=Host.capacity):
+        if fits(host, demand):
+            return host
+
+
+def linear_worst_fit(hosts, demand):
+    for host in sorted(hosts, key=Host.capacity, reverse=True):
+        if fits(host, demand):
+            return host
+
+
+def test_a_search_bound_by_one_resource_visits_a_path(monkeypatch):
+    random = Random(0)
+    index = HostCapacityIndex()
+    hosts = [
+        Host(str(i), random.randint(0, 1000), random.randint(0, 1000), 0)
+        for i in range(1024)
+    ]
+    for host in hosts:
+        host.powered_on = True
+        index.update(host, available=True)
+    visits = list()
+    fits = HostCapacityIndex._fits
+
+    def count(self, node, demand):
+        visits.append(node)
+        return fits(self, node, demand)
+
+    monkeypatch.setattr(HostCapacityIndex, "_fits", count)
+    for cpu in range(0, 1001, 50):
+        visits.clear()
+        demand = (cpu, 0, 0)
+        assert index.first_fit(*demand) is linear_first_fit(hosts, demand)
+        # at most both children of each node on the path to the leaf
+        assert len(visits) <= 2 * 10 + 1
+    # a demand above every host is rejected at the root
+    visits.clear()
+    assert index.first_fit(1001, 0, 0) is None
+    assert len(visits) == 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_the_index_finds_the_hosts_of_a_linear_scan(seed):
+    random = Random(seed)
+    index = HostCapacityIndex()
+    hosts = list()
+    for step in range(400):
+        action = random.random()
+        if action < 0.1 or len(hosts) == 0:
+            # small ranges make ties and hosts that fit in one resource only
+            host = Host(str(step), *(random.randint(0, 8) for _ in range(3)))
+            hosts.append(host)
+            index.update(host, available=False)
+        elif action < 0.3:
+            host = random.choice(hosts)
+            host.powered_on = not host.powered_on
+            index.update(host, available=host.powered_on)
+        elif action < 0.6:
+            host = random.choice(hosts)
+            host.cpu_reservoir.amount = random.randint(0, 8)
+            host.ram_reservoir.amount = random.randint(0, 8)
+            host.rom_reservoir.amount = random.randint(0, 8)
+            index.update(host)
+        else:
+            demand = tuple(random.randint(0, 8) for _ in range(3))
+            assert index.first_fit(*demand) is linear_first_fit(hosts, demand)
+            assert index.best_fit(*demand) is linear_best_fit(hosts, demand)
+            assert index.worst_fit(*demand) is linear_worst_fit(hosts, demand)
+
+
+@pytest.mark.parametrize(
+    "scheduler, expected",
+    [
+        (DefaultContainerScheduler, "0"),
+        (BestfitContainerScheduler, "1"),
+        (WorstfitContainerScheduler, "2"),
+    ],
+)
+def test_the_schedulers_place_containers_like_a_linear_scan(sim, scheduler, expected):
+    scheduler()
+    # the hosts are powered on in reverse, the search follows the order they are created in
+    hosts = [
+        vHost(
+            ipc=1,
+            frequency=5000,
+            num_cores=4,
+            cpu_tdps=150,
+            cpu_mode=2,
+            ram=ram,
+            rom=16,
+            label=str(i),
+            create_at=0,
+        )
+        for i, ram in enumerate([4, 2, 8])
+    ]
+    for i, host in enumerate(hosts):
+        host.power_on(0.1 - i * 0.01)
+    container = vContainer(
+        cpu=100, cpu_limit=100, ram=500, ram_limit=500, image_size=100, create_at=0.2
+    )
+    sim.simulate(0.3)
+
+    assert container.host.label == expected
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from Akatosh import instant_event
+
+from PyCloudSim.entity import vHost
+from PyCloudSim.monitor.host_monitor import DataframeHostMonitor, FleetHostMonitor
+
+
+def add_host(sim, cluster, label):
+    host = vHost(
+        ipc=1,
+        frequency=5000,
+        num_cores=4,
+        cpu_tdps=150,
+        cpu_mode=2,
+        ram=8,
+        rom=16,
+        label=label,
+        create_at=sim.now,
+    )
+    host.power_on(sim.now)
+    sim.network.add_link(host, cluster.switch, 1, sim.now)
+    return host
+
+
+def test_the_fleet_monitor_matches_the_dataframe_monitor(sim, cluster, api_call):
+    api_call(cluster.user, cluster.microservice, "Call")
+    reference = DataframeHostMonitor("Reference", sample_period=0.01)
+    fleet = FleetHostMonitor("Fleet", sample_period=0.01)
+
+    @instant_event(at=0.155)
+    def _add_host():
+        add_host(sim, cluster, "late")
+
+    sim.simulate(0.5)
+
+    expected = reference.dataframe.sort_values(["time", "host_label"])
+    actual = fleet.dataframe.sort_values(["time", "host_label"])
+    assert list(actual.columns) == list(expected.columns)
+    assert actual["host_label"].tolist() == expected["host_label"].tolist()
+    assert "late" in actual["host_label"].tolist()
+    for column in FleetHostMonitor.METRICS:
+        np.testing.assert_allclose(
+            actual[column].to_numpy(), expected[column].to_numpy(), atol=1e-6
+        )
+    # the switch forwards the call, the hosts run the microservice
+    assert actual["cpu_usage"].max() > 0
+    assert actual["ingress_usage"].max() > 0
+
+
+def test_the_fleet_monitor_follows_its_target_hosts(sim, cluster):
+    targets = [cluster.hosts[0]]
+    fleet = FleetHostMonitor("Fleet", target_hosts=targets, sample_period=0.1)
+
+    @instant_event(at=0.25)
+    def _replace():
+        targets[0] = cluster.hosts[1]
+
+    sim.simulate(0.45)
+
+    labels = fleet.dataframe.groupby("time")["host_label"].first()
+    assert labels.tolist()[:3] == ["0"] * 3
+    assert labels.tolist()[3:] == ["1"] * 2
+
+
+def test_the_fleet_monitor_records_percentiles(sim, cluster, api_call):
+    api_call(cluster.user, cluster.microservice, "Call")
+    fleet = FleetHostMonitor("Fleet", sample_period=0.05, percentiles=(50, 100))
+    sim.simulate(0.3)
+
+    aggregates = fleet.aggregates
+    assert len(aggregates) == fleet.dataframe["time"].nunique()
+    for time, samples in fleet.dataframe.groupby("time"):
+        row = aggregates[aggregates["time"] == float(time)].iloc[0]
+        for metric in FleetHostMonitor.METRICS:
+            assert row[f"{metric}_p50"] == pytest.approx(samples[metric].median())
+            assert row[f"{metric}_p100"] == pytest.approx(samples[metric].max())
@@ -0,0 +1,62 @@
+from random import Random
+
+import pytest
+
+from PyCloudSim.entity.constants import Constants
+from PyCloudSim.entity.v_instruction import vInstructionSet
+
+
+def test_instructions_are_as_long_as_the_instructions_of_the_architecture():
+    x86 = vInstructionSet(1000, Constants.X86)
+    arm = vInstructionSet(1000, Constants.ARM)
+
+    # an instruction occupies 100000 times its size of RAM
+    assert all(100000 <= x86.size(i, 1) <= 16 * 100000 for i in range(1000))
+    assert all(arm.size(i, 1) == 4 * 100000 for i in range(1000))
+    with pytest.raises(RuntimeError):
+        vInstructionSet(10, "RISC-V")
+
+
+@pytest.mark.parametrize("deamon", [False, True])
+def test_ranges_are_as_large_as_their_instructions(deamon):
+    random = Random(0)
+    instructions = vInstructionSet(50, Constants.X86, deamon=deamon)
+    sizes = [instructions.size(i, 1) for i in range(50)]
+
+    for _ in range(200):
+        start = random.randint(0, 200)
+        count = random.randint(0, 200 if deamon else 50 - start % 50)
+        # the indexes of a deamon wrap around
+        expected = sum(sizes[(start + i) % 50] for i in range(count))
+        assert instructions.size(start, count) == expected
+
+
+def test_the_cursors_account_for_the_instructions_in_execution():
+    instructions = vInstructionSet(10, Constants.X86)
+    first = instructions.schedule(4)
+    second = instructions.schedule(3)
+
+    assert (first, second) == (0, 4)
+    assert instructions.in_flight == 7
+    assert instructions.unscheduled == 3
+    assert instructions.in_flight_size == instructions.size(0, 7)
+    instructions.retire(first, 4)
+    assert instructions.retired == 4
+    assert instructions.in_flight_size == instructions.size(4, 3)
+    with pytest.raises(ValueError):
+        instructions.schedule(4)
+    # the discarded instructions are neither retired nor in execution
+    instructions.discard()
+    assert instructions.retired == 4
+    assert instructions.in_flight == 0
+    assert instructions.in_flight_size == 0
+    assert instructions.unscheduled == 6
+
+
+def test_a_deamon_reschedules_its_executed_instructions():
+    instructions = vInstructionSet(10, Constants.ARM, deamon=True)
+    instructions.retire(instructions.schedule(10), 10)
+
+    assert instructions.unscheduled == 10
+    assert instructions.schedule(5) == 10
+    assert instructions.unscheduled == 5
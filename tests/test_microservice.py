@@ -0,0 +1,43 @@
+import pytest
+from Akatosh import instant_event
+
+from PyCloudSim.entity import vDefaultMicroservice
+
+
+class Flagged(vDefaultMicroservice):
+    """A microservice that scales up once a flag is raised, without any of its containers changing."""
+
+    flagged = False
+
+    def horizontal_scale_up_triggered(self) -> bool:
+        return self.flagged
+
+    def horizontal_scale_down_triggered(self) -> bool:
+        return False
+
+
+@pytest.mark.parametrize("evaluation_interval", [None, 0.1])
+def test_the_scaling_is_evaluated_every_interval(sim, cluster, evaluation_interval):
+    microservice = Flagged(
+        cpu=100,
+        ram=500,
+        image_size=100,
+        min_num_instances=1,
+        max_num_instances=2,
+        evaluation_interval=evaluation_interval,
+        label="Flagged",
+        create_at=0,
+    )
+
+    @instant_event(at=0.25)
+    def _flag():
+        microservice.flagged = True
+
+    sim.simulate(0.5)
+
+    if evaluation_interval is None:
+        # nothing wakes the evaluator up once the containers are running
+        assert len(microservice.containers) == 1
+    else:
+        assert len(microservice.containers) == 2
+        assert microservice.containers[1].created_at == pytest.approx(0.3)
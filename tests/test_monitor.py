@@ -0,0 +1,97 @@
+from random import Random
+
+import pandas as pd
+import pytest
+
+from PyCloudSim.monitor import ColumnBuffer
+from PyCloudSim.monitor.host_monitor import DataframeHostMonitor
+
+COLUMNS = {"time": "str", "label": "str", "usage": "float", "count": "int"}
+
+
+def rows(seed, number):
+    random = Random(seed)
+    return [
+        (round(i * 0.1, 1), f"Host-{random.randint(0, 3)}", random.random(), i)
+        for i in range(number)
+    ]
+
+
+def concatenated(rows):
+    """The dataframe built by concatenating a one-row dataframe per sample."""
+    dataframe = pd.DataFrame(
+        {name: pd.Series([], dtype=dtype) for name, dtype in COLUMNS.items()}
+    )
+    for row in rows:
+        sample = pd.DataFrame(
+            {
+                name: pd.Series([value], dtype=dtype)
+                for (name, dtype), value in zip(COLUMNS.items(), row)
+            }
+        )
+        dataframe = pd.concat([dataframe, sample], ignore_index=True)
+    return dataframe
+
+
+def test_the_buffer_builds_the_dataframe_of_concatenated_samples():
+    samples = rows(0, 50)
+    buffer = ColumnBuffer(COLUMNS, capacity=4)
+    for row in samples[:20]:
+        buffer.append(*row)
+    pd.testing.assert_frame_equal(buffer.dataframe, concatenated(samples[:20]))
+    # the columns grow past the allocated rows, the dataframe is built again
+    buffer.extend(*(list(column) for column in zip(*samples[20:])))
+
+    assert len(buffer) == 50
+    pd.testing.assert_frame_equal(buffer.dataframe, concatenated(samples))
+    assert buffer.dataframe is buffer.dataframe
+
+
+def test_an_empty_buffer_has_typed_columns():
+    pd.testing.assert_frame_equal(ColumnBuffer(COLUMNS).dataframe, concatenated([]))
+
+
+def spill(path, samples):
+    buffer = ColumnBuffer(COLUMNS, spill_to=str(path), chunk_size=8)
+    for row in samples[:30]:
+        buffer.append(*row)
+    buffer.extend(*(list(column) for column in zip(*samples[30:])))
+    return buffer
+
+
+def test_spilled_chunks_are_read_back_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr("PyCloudSim.monitor.PARQUET", False)
+    samples = rows(1, 45)
+    buffer = spill(tmp_path, samples)
+
+    # only the rows of the last chunk are kept in memory
+    assert len(buffer.chunks) == 5
+    assert len(buffer) == 5
+    assert all(path.endswith(".csv") for path in buffer.chunks)
+    pd.testing.assert_frame_equal(buffer.dataframe, concatenated(samples))
+    buffer.flush()
+    assert len(buffer.chunks) == 6
+    assert len(buffer) == 0
+    pd.testing.assert_frame_equal(buffer.dataframe, concatenated(samples))
+
+
+def test_spilled_chunks_are_parquet_files_with_pyarrow(tmp_path):
+    pytest.importorskip("pyarrow")
+    samples = rows(2, 20)
+    buffer = spill(tmp_path, samples)
+
+    assert all(path.endswith(".parquet") for path in buffer.chunks)
+    pd.testing.assert_frame_equal(buffer.dataframe, concatenated(samples))
+
+
+def test_a_monitor_spills_its_samples(sim, cluster, api_call, tmp_path):
+    api_call(cluster.user, cluster.microservice, "Call")
+    kept = DataframeHostMonitor("Kept", sample_period=0.01)
+    spilled = DataframeHostMonitor(
+        "Spilled", sample_period=0.01, spill_to=str(tmp_path), chunk_size=7
+    )
+    sim.simulate(0.3)
+    spilled.flush()
+
+    assert len(list(tmp_path.iterdir())) > 1
+    pd.testing.assert_frame_equal(spilled.dataframe, kept.dataframe)
@@ -0,0 +1,203 @@
+from random import Random
+
+import networkx as nx
+import pytest
+
+from PyCloudSim import vNetwork
+from PyCloudSim.entity import vGateway, vHost
+from PyCloudSim.entity.v_hardware_entity import vHardwareEntity
+
+
+def test_hosts_is_a_list_of_the_hosts(sim, cluster):
+    sim.simulate(0.1)
+
+    hosts = sim.hosts
+    assert isinstance(hosts, list)
+    assert hosts == cluster.hosts
+    assert hosts[0] is cluster.hosts[0]
+    # sorting the list does not reorder the hosts of the simulation
+    hosts.sort(key=lambda host: host.label, reverse=True)
+    assert sim.hosts == cluster.hosts
+
+
+def test_the_registries_follow_the_nodes(sim, cluster):
+    late = vHost(
+        ipc=1,
+        frequency=5000,
+        num_cores=4,
+        cpu_tdps=150,
+        cpu_mode=2,
+        ram=8,
+        rom=16,
+        label="late",
+        create_at=0.1,
+        terminate_at=0.3,
+    )
+    sim.simulate(0.2)
+
+    assert sim.hosts == [*cluster.hosts, late]
+    assert list(sim.network.switches) == [cluster.switch]
+    assert list(sim.network.gateways) == [cluster.gateway]
+    assert list(sim.network.routers) == []
+    sim.simulate(0.4)
+    assert sim.hosts == cluster.hosts
+    assert late not in sim.network.nodes
+
+
+class NIC:
+    def add_port(self, *args, **kwargs):
+        pass
+
+    def remove_port(self, *args, **kwargs):
+        pass
+
+
+class Node:
+    """A node with only what the network reads, its NIC ignores the links."""
+
+    def __init__(self, label):
+        self.label = label
+        self.NIC = NIC()
+        self.available_ip_addresses = [None] * 1000
+        self.registered_lists = list()
+
+    def __repr__(self):
+        return self.label
+
+
+def reference_next_hops(topology, dst):
+    """The next hops towards the destination, a breadth-first search from it over the incoming links in the order they were added."""
+    next_hops = {dst: dst}
+    frontier = [dst]
+    while frontier:
+        next_frontier = list()
+        for node in frontier:
+            for neighbour in topology.pred[node]:
+                if neighbour not in next_hops:
+                    next_hops[neighbour] = node
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return next_hops
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_next_hops_match_a_breadth_first_search(seed):
+    random = Random(seed)
+    network = vNetwork()
+    nodes = [Node(str(i)) for i in range(30)]
+    for node in nodes:
+        network.add_node(node)
+    for step in range(60):
+        action = random.random()
+        present = [node for node in nodes if node in network.topology]
+        if action < 0.6:
+            s, d = random.sample(present, 2)
+            network.add_link(s, d, 1)
+        elif action < 0.8:
+            links = [(s, d) for s, d in network.topology.edges if s.label < d.label]
+            if len(links) > 0:
+                network.remove_link(*random.choice(links))
+        elif action < 0.9:
+            network.del_node(random.choice(present))
+        else:
+            # the ids of the removed nodes are reused
+            absent = [node for node in nodes if node not in network.topology]
+            if len(absent) > 0:
+                network.add_node(random.choice(absent))
+        topology = network.topology
+        for dst in random.sample(list(topology.nodes), 5):
+            expected = reference_next_hops(topology, dst)
+            for node in topology.nodes:
+                assert network.next_hop(node, dst) is expected.get(node)
+                if node in expected:
+                    route = network.route(node, dst)
+                    assert len(route) - 1 == nx.shortest_path_length(topology, node, dst)
+                else:
+                    with pytest.raises(nx.NetworkXNoPath):
+                        network.route(node, dst)
+
+
+def test_routes_are_cached_until_the_topology_changes():
+    network = vNetwork()
+    a, b, c, d = nodes = [Node(label) for label in "abcd"]
+    for node in nodes:
+        network.add_node(node)
+    network.add_link(a, b, 1)
+    network.add_link(b, c, 1)
+    network.add_link(c, d, 1)
+
+    route = network.route(a, d)
+    assert route == [a, b, c, d]
+    assert network.route(a, d) is route
+    network.add_link(a, c, 1)
+    assert network.route(a, d) == [a, c, d]
+    network.remove_link(c, d)
+    with pytest.raises(nx.NetworkXNoPath):
+        network.route(a, d)
+    network.add_link(b, d, 1)
+    assert network.route(a, d) == [a, b, d]
+    network.del_node(b)
+    with pytest.raises(nx.NodeNotFound):
+        network.route(a, b)
+
+
+def test_packets_are_forwarded_along_the_route(sim, cluster, api_call, monkeypatch):
+    hops = dict()
+    for cls in (vHardwareEntity, vGateway):
+        receive_packet = cls.receive_packet
+
+        def record(self, packet, receive_packet=receive_packet):
+            hops.setdefault(packet, [packet.src_host]).append(self)
+            receive_packet(self, packet)
+
+        monkeypatch.setattr(cls, "receive_packet", record)
+    call = api_call(cluster.user, cluster.microservice, "Call")
+    sim.simulate(1)
+
+    assert call.succeed
+    assert len(hops) == len(call.packets)
+    for packet, visited in hops.items():
+        assert visited == sim.network.route(packet.src_host, packet.dst_host)
+
+
+def test_the_forwarding_tables_are_filled_in_bulk(sim, cluster):
+    sim.simulate(0.1)
+    network = sim.network
+    network.build_forwarding_tables()
+
+    destinations = [*network.hosts, *network.gateways]
+    expected = {dst: reference_next_hops(network.topology, dst) for dst in destinations}
+    for node in network.nodes:
+        assert network.forwarding_table(node) == {
+            dst: expected[dst][node] for dst in destinations if node in expected[dst]
+        }
+
+
+def test_a_topology_change_keeps_the_tables_it_does_not_reroute():
+    network = vNetwork()
+    a, b, c, d = nodes = [Node(label) for label in "abcd"]
+    for node in nodes:
+        network.add_node(node)
+    for s, d_ in [(a, b), (b, c), (c, d), (d, a)]:
+        network.add_link(s, d_, 1)
+
+    def check(destinations):
+        topology = network.topology
+        for node in nodes:
+            assert set(network.forwarding_table(node)) == destinations
+        for dst in nodes:
+            expected = reference_next_hops(topology, dst)
+            for node in nodes:
+                assert network.next_hop(node, dst) is expected[node]
+
+    check(set())
+    # the diagonal is a shorter path only towards its ends
+    network.add_link(b, d, 1)
+    check({a, c})
+    # the routes towards a and b do not take the link
+    network.remove_link(c, d)
+    check({a, b})
+    # only the routes from d itself go through d
+    network.del_node(d)
+    nodes.remove(d)
+    check({a, b, c})
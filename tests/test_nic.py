@@ -0,0 +1,260 @@
+import pytest
+from Akatosh import instant_event
+
+from PyCloudSim.entity import vPacket
+from PyCloudSim.entity.v_nic import vNIC, vPort
+
+
+def neighbour_ports(nic):
+    """The ports that transmit to the NIC, found by walking its neighbours."""
+    return [
+        port
+        for node in [port.endpoint for port in nic.ports]
+        for port in node.NIC.ports
+        if port.endpoint is nic.host
+    ]
+
+
+def test_ingress_ports_are_the_ports_of_the_neighbours(sim, cluster, api_call):
+    api_call(cluster.user, cluster.microservice, "Call")
+    nodes = [cluster.switch, cluster.gateway, *cluster.hosts]
+    samples = list()
+
+    @instant_event(at=0.15)
+    def _sample():
+        for node in nodes:
+            ports = neighbour_ports(node.NIC)
+            assert set(node.NIC.ingress_ports) == set(ports)
+            usage = sum(port.usage(0.05) for port in ports)
+            utilization = sum(port.utilization(0.05) for port in ports) / len(ports)
+            samples.append(usage)
+            assert node.NIC.ingress_usage(0.05) == pytest.approx(usage)
+            assert node.NIC.ingress_utilization(0.05) == pytest.approx(utilization)
+
+    sim.simulate(0.2)
+    # the switch forwards the call
+    assert max(samples) > 0
+
+
+def test_removed_ports_stop_feeding_the_nic(sim, cluster):
+    host = cluster.hosts[0]
+    sim.network.remove_link(host, cluster.switch, at=0.1)
+    sim.simulate(0.2)
+
+    # only the loopback port is left
+    assert host.NIC.ingress_ports == [host.NIC.port_to(host)]
+    assert host.NIC.ingress_usage() == 0
+    assert all(port.endpoint is not host for port in cluster.switch.NIC.ingress_ports)
+    assert set(cluster.switch.NIC.ingress_ports) == set(
+        neighbour_ports(cluster.switch.NIC)
+    )
+
+
+def test_ingress_utilization_averages_the_ports_that_transmit_to_the_nic(sim, cluster):
+    gateway = cluster.gateway
+    # a one-way port feeds the gateway without a port back
+    cluster.hosts[0].NIC.add_port(gateway, 1, None, 0)
+    sim.simulate(0.1)
+
+    assert len(gateway.NIC.ports) == 1
+    assert len(gateway.NIC.ingress_ports) == 2
+    port = cluster.switch.NIC.port_to(gateway)
+    port.bandwidth.distribute(port, port.bandwidth.capacity / 2)
+    assert gateway.NIC.ingress_utilization() == pytest.approx(0.25)
+
+
+def scanned_port_to(nic, endpoint):
+    """The first port connected to the endpoint, found by scanning the ports."""
+    for port in nic.ports:
+        if port.endpoint is endpoint:
+            return port
+
+
+def test_port_to_finds_the_port_of_a_scan(sim, cluster):
+    host = cluster.hosts[0]
+    nodes = [cluster.switch, cluster.gateway, *cluster.hosts]
+    # a second link between the host and the switch
+    host.NIC.add_port(cluster.switch, 1, None, 0.05)
+
+    def check():
+        for node in nodes:
+            for endpoint in nodes:
+                assert node.NIC.port_to(endpoint) is scanned_port_to(node.NIC, endpoint)
+
+    sim.simulate(0.1)
+    check()
+    first = host.NIC.port_to(cluster.switch)
+    first.terminate(0.15)
+    sim.simulate(0.2)
+    check()
+    # the index falls back to the remaining port
+    assert host.NIC.port_to(cluster.switch) is not None
+    assert host.NIC.port_to(cluster.switch) is not first
+    sim.network.remove_link(host, cluster.switch, at=0.25)
+    sim.simulate(0.3)
+    check()
+    assert host.NIC.port_to(cluster.switch) is None
+    assert cluster.switch.NIC.port_to(host) is None
+
+
+def test_ready_packets_leave_each_port_in_the_order_of_priority(sim, cluster, monkeypatch):
+    host = cluster.hosts[0]
+    transmitted = list()
+    transmit = vPort.transmit
+
+    def record(self, packet, transmission_time):
+        if self is host.NIC.port_to(cluster.switch):
+            transmitted.append(packet)
+        transmit(self, packet, transmission_time)
+
+    monkeypatch.setattr(vPort, "transmit", record)
+
+    @instant_event(at=0.15)
+    def _block():
+        port = host.NIC.port_to(cluster.switch)
+        port.bandwidth.distribute(port, port.bandwidth.amount)
+
+    packets = list()
+
+    @instant_event(at=0.2)
+    def _send():
+        container = cluster.microservice.containers[0]
+        for priority in [3, 1, 2, 1, 0]:
+            packets.append(
+                vPacket(container, cluster.user, 100, priority, create_at=sim.now)
+            )
+
+    @instant_event(at=0.25)
+    def _release():
+        assert host.NIC.ready_packets == [packets[i] for i in [4, 1, 3, 2, 0]]
+        port = host.NIC.port_to(cluster.switch)
+        port.bandwidth.collect(port)
+        host.NIC.trigger.notify()
+
+    sim.simulate(0.3)
+
+    # priority first, then arrival
+    assert transmitted == [packets[i] for i in [4, 1, 3, 2, 0]]
+
+
+def test_a_blocked_port_holds_only_its_own_packets(sim, cluster, monkeypatch):
+    host = cluster.hosts[0]
+    transmitted = list()
+    transmit = vPort.transmit
+
+    def record(self, packet, transmission_time):
+        if self.nic is host.NIC:
+            transmitted.append(packet)
+        transmit(self, packet, transmission_time)
+
+    monkeypatch.setattr(vPort, "transmit", record)
+    packets = list()
+
+    @instant_event(at=0.2)
+    def _send():
+        port = host.NIC.port_to(cluster.switch)
+        # only a small packet fits on the link to the switch
+        port.bandwidth.distribute(port, port.bandwidth.amount - 150)
+        container = cluster.microservice.containers[0]
+        packets.append(vPacket(container, cluster.user, 1000, 0, create_at=sim.now))
+        packets.append(vPacket(container, cluster.user, 100, 1, create_at=sim.now))
+        # the loopback port is free
+        packets.append(vPacket(container, container, 100, 2, create_at=sim.now))
+
+    @instant_event(at=0.25)
+    def _release():
+        # the small packet does not overtake the blocked one on the same port
+        assert host.NIC.ready_packets == packets[:2]
+        assert transmitted == packets[2:]
+        port = host.NIC.port_to(cluster.switch)
+        port.bandwidth.collect(port)
+        host.NIC.trigger.notify()
+
+    sim.simulate(0.3)
+
+    assert transmitted == [packets[2], packets[0], packets[1]]
+
+
+def test_packets_waiting_on_a_removed_link_are_routed_again(sim, cluster):
+    host = cluster.hosts[0]
+    packets = list()
+
+    @instant_event(at=0.2)
+    def _send():
+        port = host.NIC.port_to(cluster.switch)
+        port.bandwidth.distribute(port, port.bandwidth.amount)
+        container = cluster.microservice.containers[0]
+        for priority in range(3):
+            packets.append(
+                vPacket(container, cluster.user, 100, priority, create_at=sim.now)
+            )
+
+    @instant_event(at=0.25)
+    def _check():
+        assert host.NIC.ready_packets == packets
+
+    @instant_event(at=0.3)
+    def _remove():
+        sim.network.remove_link(host, cluster.switch, at=sim.now)
+
+    sim.simulate(0.4)
+
+    # the host has no other route to the user
+    assert all(packet.failed for packet in packets)
+    assert all(packet.terminated_at == pytest.approx(0.3) for packet in packets)
+    assert host.NIC.ready_packets == []
+
+
+@pytest.fixture
+def nic_samples(monkeypatch):
+    """Check the packets of a NIC before and after every scheduling pass and record how many are ready and in flight."""
+    samples = list()
+
+    def check(nic):
+        ready = nic.ready_packets
+        in_flight = nic.in_flight_packets
+        assert all(packet.decoded and not packet.in_transmission for packet in ready)
+        assert all(packet.in_transmission for packet in in_flight)
+        for packet in nic.packet_queue:
+            # the other packets are decoding or have arrived
+            if packet not in ready and packet not in in_flight:
+                assert not packet.decoded or packet.current_hop is packet.dst_host
+        samples.append((len(ready), len(in_flight)))
+
+    schedule_packets = vNIC._schedule_packets
+
+    def checked(self):
+        check(self)
+        schedule_packets(self)
+        check(self)
+
+    # the NICs created afterwards schedule their packets through the check
+    monkeypatch.setattr(vNIC, "_schedule_packets", checked)
+    return samples
+
+
+def test_only_decoded_packets_wait_for_bandwidth(sim, nic_samples, cluster, api_call):
+    calls = [
+        api_call(cluster.user, cluster.microservice, f"Call {i}") for i in range(3)
+    ]
+
+    # the packets of the calls wait at the gateway until the link is free
+    @instant_event(at=0.105)
+    def _block():
+        port = cluster.gateway.NIC.port_to(cluster.switch)
+        port.bandwidth.distribute(port, port.bandwidth.amount)
+
+    @instant_event(at=0.2)
+    def _release():
+        port = cluster.gateway.NIC.port_to(cluster.switch)
+        port.bandwidth.collect(port)
+        cluster.gateway.NIC.trigger.notify()
+
+    sim.simulate(1)
+
+    assert all(call.succeed for call in calls)
+    assert max(ready for ready, _ in nic_samples) == 30
+    assert max(in_flight for _, in_flight in nic_samples) > 0
+    for node in [cluster.switch, cluster.gateway, *cluster.hosts]:
+        assert node.NIC.ready_packets == []
+        assert node.NIC.in_flight_packets == []
@@ -0,0 +1,21 @@
+def test_packets_are_size_only_by_default(sim, cluster, api_call):
+    call = api_call(cluster.user, cluster.microservice, "Call")
+    sim.simulate(1)
+
+    assert call.succeed
+    assert not sim.packet_payload
+    assert all(len(packet.content) == 0 for packet in call.packets)
+
+
+def test_packet_payloads_are_slices_of_one_buffer(sim, cluster, api_call):
+    sim.set_packet_payload()
+    call = api_call(cluster.user, cluster.microservice, "Call", ret_packet_size=300)
+    sim.simulate(1)
+
+    assert call.succeed
+    for packet in call.packets:
+        assert isinstance(packet.content, memoryview)
+        assert len(packet.content) == packet.total_size
+    # the buffer only grows for the larger packets
+    assert len({id(packet.content.obj) for packet in call.packets}) == 2
+    assert max(len(packet.content.obj) for packet in call.packets) == 300
@@ -0,0 +1,75 @@
+import pytest
+from Akatosh import instant_event
+
+from PyCloudSim.entity.constants import Constants
+
+
+def decode(cluster, held_packet, at, size, counts):
+    """Decode packets of the size and counts on the core switch at the same time, return the packets."""
+    packets = [
+        held_packet(cluster.user, cluster.user, size, 1, create_at=at, count=count)
+        for count in counts
+    ]
+
+    @instant_event(at=at + 0.1)
+    def _receive():
+        for packet in packets:
+            cluster.switch.decode_packet(packet)
+
+    return packets
+
+
+def decoding_time(packets, at):
+    assert all(packet.succeed for packet in packets)
+    return max(packet.terminated_at for packet in packets) - (at + 0.1)
+
+
+def test_a_train_decodes_as_fast_as_its_packets(sim, cluster, held_packet):
+    packets = decode(cluster, held_packet, 0.2, 500, [1] * 10)
+    train = decode(cluster, held_packet, 1.2, 500, [10])
+    sim.simulate(2)
+
+    assert decoding_time(train, 1.2) == pytest.approx(
+        decoding_time(packets, 0.2), abs=sim.min_time_unit
+    )
+
+
+@pytest.mark.parametrize("count", [1, 3, 4, 10])
+def test_a_train_is_decoded_in_parallel_on_the_cores(
+    sim, cluster, held_packet, count
+):
+    train = decode(cluster, held_packet, 0.2, 500, [count])
+    sim.simulate(2)
+
+    cores = cluster.switch.cpu.cores
+    # the packets are shared evenly by the idle cores
+    rounds = -(-count // len(cores))
+    assert decoding_time(train, 0.2) == pytest.approx(
+        rounds * 500 * cores[0].instruction_cycle, abs=sim.min_time_unit
+    )
+    assert all(
+        core.computational_power.amount == core.computational_power.capacity
+        for core in cores
+    )
+
+
+@pytest.mark.parametrize("analytic_decoding", [True, False])
+def test_a_train_call_takes_as_long_as_a_packet_call(
+    sim, cluster, api_call, analytic_decoding
+):
+    sim.set_analytic_decoding(analytic_decoding)
+    packet_call = api_call(cluster.user, cluster.microservice, "Packet")
+    train_call = api_call(
+        cluster.user,
+        cluster.microservice,
+        "Train",
+        create_at=1.11,
+        network_mode=Constants.TRAIN,
+    )
+    sim.simulate(2)
+
+    assert packet_call.succeed and train_call.succeed
+    packet_time = packet_call.terminated_at - 0.11
+    train_time = train_call.terminated_at - 1.11
+    # the train is stored and forwarded whole at every hop, which costs a little
+    assert packet_time * 0.9 <= train_time <= packet_time * 1.2
@@ -0,0 +1,55 @@
+from Akatosh import Entity, instant_event
+
+from PyCloudSim import Trigger
+
+
+def test_notifications_at_one_time_perform_the_action_once(sim):
+    performed = list()
+    owner = Entity(label="Owner", create_at=0)
+    trigger = Trigger(owner, lambda: performed.append(sim.now), label="Wake Up")
+
+    for at in [0.1, 0.1, 0.1, 0.2]:
+        instant_event(at=at)(trigger.notify)
+    sim.simulate(0.3)
+
+    assert performed == [0.1, 0.2]
+    assert not trigger.pending
+
+
+def test_a_disabled_trigger_ignores_notifications(sim):
+    performed = list()
+    owner = Entity(label="Owner", create_at=0)
+    trigger = Trigger(
+        owner, lambda: performed.append(sim.now), label="Wake Up", enabled=False
+    )
+
+    @instant_event(at=0.1)
+    def _notify():
+        trigger.notify()
+        trigger.enable()
+        trigger.notify()
+        assert trigger.pending
+        # disabling cancels the pending wake-up
+        trigger.disable()
+        assert not trigger.pending
+
+    @instant_event(at=0.2)
+    def _enable():
+        trigger.enable()
+        trigger.notify()
+
+    sim.simulate(0.3)
+
+    assert performed == [0.2]
+
+
+def test_a_terminated_entity_is_not_woken_up(sim):
+    performed = list()
+    owner = Entity(label="Owner", create_at=0, terminate_at=0.15)
+    trigger = Trigger(owner, lambda: performed.append(sim.now), label="Wake Up")
+
+    for at in [0.1, 0.2]:
+        instant_event(at=at)(trigger.notify)
+    sim.simulate(0.3)
+
+    assert performed == [0.1]
@@ -0,0 +1,140 @@
+from random import Random
+
+import pytest
+from Akatosh import instant_event
+
+from PyCloudSim import TrackedResource
+from PyCloudSim.monitor.host_monitor import DataframeHostMonitor
+
+
+def average_occupied(records, start, end, duration):
+    """The time-weighted occupied amount over [start, end] divided by the duration, integrated from every (time, occupied) record."""
+    total = 0.0
+    for (time, occupied), (next_time, _) in zip(records, records[1:] + [(end, 0)]):
+        total += occupied * max(min(next_time, end) - max(time, start), 0)
+    return total / duration
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_windows_aligned_to_the_time_unit_are_exact(sim, seed):
+    random = Random(seed)
+    unit = sim.min_time_unit
+    resource = TrackedResource(capacity=100, label="Resource")
+    records = [(0, 0)]
+    checked = list()
+
+    def change(amount):
+        if amount > 0:
+            resource.get(min(amount, resource.amount))
+        else:
+            resource.put(min(-amount, resource.occupied))
+        records.append((sim.now, resource.occupied))
+
+    def query(duration):
+        now = sim.now
+        expected = average_occupied(records, max(now - duration, 0), now, duration)
+        assert resource.utilization(duration) * 100 == pytest.approx(expected)
+        checked.append(duration)
+
+    for _ in range(200):
+        at = random.randint(1, 500) * unit
+        amount = random.randint(-60, 60)
+        instant_event(at=at)(lambda amount=amount: change(amount))
+    for _ in range(50):
+        at = random.randint(1, 600) * unit
+        duration = random.randint(1, 700) * unit
+        instant_event(at=at)(lambda duration=duration: query(duration))
+    sim.simulate(0.07)
+
+    assert len(checked) == 50
+
+
+def test_a_window_within_the_history_is_exact(sim):
+    sim.set_usage_history(1)
+    resource = TrackedResource(capacity=100, label="Resource")
+    instant_event(at=0.1)(lambda: resource.get(100))
+    instant_event(at=0.5)(lambda: resource.put(100))
+    utilizations = list()
+    instant_event(at=1)(
+        lambda: utilizations.extend(resource.utilization(d) for d in [1, 0.6, 0.4])
+    )
+    sim.simulate(1)
+
+    assert utilizations == pytest.approx([0.4, 0.1 / 0.6, 0.0])
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_windows_longer_than_the_default_history_are_exact(sim, seed):
+    sim.set_usage_history(0.5)
+    random = Random(seed)
+    resource = TrackedResource(capacity=100, label="Resource")
+    records = [(0, 0)]
+    checked = list()
+
+    def change(amount):
+        if amount > 0:
+            resource.get(min(amount, resource.amount))
+        else:
+            resource.put(min(-amount, resource.occupied))
+        records.append((sim.now, resource.occupied))
+
+    def query():
+        now = sim.now
+        expected = average_occupied(records, now - 0.5, now, 0.5)
+        assert resource.utilization(0.5) * 100 == pytest.approx(expected)
+        checked.append(now)
+
+    for _ in range(3000):
+        at = random.randint(1, 20000) * sim.min_time_unit
+        amount = random.randint(-60, 60)
+        instant_event(at=at)(lambda amount=amount: change(amount))
+    for _ in range(30):
+        at = random.randint(5000, 20000) * sim.min_time_unit
+        instant_event(at=at)(query)
+    sim.simulate(2)
+
+    assert len(checked) == 30
+    # only the records of the last half a time unit are kept
+    assert len(resource.usage_records) < 1000
+
+
+def test_the_history_grows_to_the_longest_window_queried(sim):
+    unit = sim.min_time_unit
+    resource = TrackedResource(capacity=100, label="Resource")
+    records = [(0, 0)]
+
+    def change(amount):
+        if amount > 0:
+            resource.get(amount)
+        else:
+            resource.put(-amount)
+        records.append((sim.now, resource.occupied))
+
+    for i in range(1, 4000):
+        # get an amount on odd steps and put it back on the next step
+        amount = (i - 1 + i % 2) % 7 * 10 + 10
+        amount = amount if i % 2 else -amount
+        instant_event(at=i * unit)(lambda amount=amount: change(amount))
+    sim.simulate(0.2)
+
+    # a window reaching before the history is cut at the oldest record kept
+    now = sim.now
+    kept = len(resource.usage_records)
+    assert kept <= 1002
+    oldest = records[-kept][0]
+    assert resource.utilization(0.15) * 100 == pytest.approx(
+        average_occupied(records, oldest, now, now - oldest)
+    )
+    # the records of the window are kept from then on
+    sim.simulate(0.4)
+    now = sim.now
+    assert resource.utilization(0.15) * 100 == pytest.approx(
+        average_occupied(records, now - 0.15, now, 0.15)
+    )
+
+
+def test_a_monitor_extends_the_usage_history(sim):
+    DataframeHostMonitor("Monitor", sample_period=0.5)
+    assert sim.usage_history == 0.5
+    with pytest.raises(ValueError):
+        sim.set_usage_history(0)